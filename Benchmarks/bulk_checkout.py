@@ -0,0 +1,88 @@
+#Benchmark for the bulk order operations in Models/OrderBatch.py
+#Times a happy-hour discount and an end-of-night close-out over many orders, once as a single batch and once
+#order by order the way the bartender view does it, and checks that both give the same orders.
+#With NumPy installed it also checks that the NumPy and the pure Python path give the same prices.
+#Uses NumPy when it is installed. Run from the repository root: python Benchmarks/bulk_checkout.py [number of orders]
+
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Models import OrderBatch
+from Models.Money import discounted, to_minor
+from Models.OrderBatch import checkout_orders, discount_orders
+
+ORDERS = 10_000
+LINES_PER_ORDER = 4
+HAPPY_HOUR_PRODUCTS = [str(product_id) for product_id in range(100, 200)]
+# rates as the discount entry produces them (float(entry) / 100), plus ones that are not short decimals
+CHECK_RATES = [float("12.3") / 100, float("33.3") / 100, 1 - 0.7, 1 / 3, 0.15, 0.005, 1.0]
+
+
+def make_orders(count):
+    rng = random.Random(1)
+    return [{
+        "transaction_id": str(i),
+        "table_id": str(rng.randint(1, 40)),
+        "breakdown": [{
+            "product_id": rng.randint(100, 500),
+            "price": rng.choice([32.0, 45.5, 60, 62.5, 98.0, 145.0]),
+            "amount": rng.randint(1, 5),
+            "is_paid": rng.random() < 0.2,
+        } for _ in range(LINES_PER_ORDER)],
+    } for i in range(count)]
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def check_paths(orders):
+    #The NumPy and the pure Python path have to give the same prices, and the same as Money.discounted()
+    for rate in CHECK_RATES:
+        results = []
+        for numpy_module in (OrderBatch.np, None):
+            saved, OrderBatch.np = OrderBatch.np, numpy_module
+            try:
+                discounted_orders = copy.deepcopy(orders)
+                discount_orders(discounted_orders, rate)
+            finally:
+                OrderBatch.np = saved
+            results.append(discounted_orders)
+        assert results[0] == results[1], f"NumPy and pure Python disagree for rate {rate!r}"
+        for order in results[0]:
+            for item in order["breakdown"]:
+                assert to_minor(item["price"]) == discounted(to_minor(item["original_price"]), rate), rate
+    print(f"NumPy and pure Python agree on {len(CHECK_RATES)} rates\n")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else ORDERS
+    print(f"{count} orders, {count * LINES_PER_ORDER} lines, NumPy: {'yes' if OrderBatch.np is not None else 'no'}\n")
+
+    if OrderBatch.np is not None:
+        check_paths(make_orders(1000))
+
+    batch_orders = make_orders(count)
+    single_orders = copy.deepcopy(batch_orders)
+
+    _, batch_ms = timed(lambda: discount_orders(batch_orders, 0.25, HAPPY_HOUR_PRODUCTS))
+    _, single_ms = timed(lambda: [discount_orders([order], 0.25, HAPPY_HOUR_PRODUCTS) for order in single_orders])
+    print(f"discount   batch: {batch_ms:8.1f} ms   order by order: {single_ms:8.1f} ms")
+
+    batch_paid, batch_ms = timed(lambda: checkout_orders(batch_orders))
+    single_paid, single_ms = timed(lambda: [checkout_orders([order]) for order in single_orders])
+    print(f"close-out  batch: {batch_ms:8.1f} ms   order by order: {single_ms:8.1f} ms")
+
+    assert batch_orders == single_orders
+    assert batch_paid == {key: value for paid in single_paid for key, value in paid.items()}
+
+
+if __name__ == "__main__":
+    main()
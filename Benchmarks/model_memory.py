@@ -0,0 +1,108 @@
+#Memory benchmark for the model records
+#Compares the per-record footprint of the __slots__ records with plain __dict__ records,
+#and of orders with their line items as nested dicts with the PackedOrders struct-of-arrays form.
+#Run from the repository root: python Benchmarks/model_memory.py [number of orders]
+
+import gc
+import os
+import random
+import sys
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Models.MenuModel import MenuItem
+from Models.OrderLines import PackedOrders
+from Models.TableModel import Table
+from Models.UserModel import UserList
+
+ORDERS = 100_000
+LINES_PER_ORDER = 3
+SPECIFICATIONS = ["", "can (cold)", "bottle", "glass", "no ice"]
+
+
+def _with_dict(cls):
+    #The same record class with a per-instance __dict__, as it was before __slots__
+    return type("Dict" + cls.__name__, (), {"__init__": cls.__init__})
+
+
+DictMenuItem = _with_dict(MenuItem)
+DictUserList = _with_dict(UserList)
+DictTable = _with_dict(Table)
+
+
+def measure(build):
+    #Bytes still allocated after build() returns, the result is kept alive while measuring
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def make_menu_items(cls, count):
+    return [cls(f"Item {i}", "60 SEK", i % 50, {"en": "glass"}, "NO", "wine", "Images/red_wine.jpeg", item_id=i)
+            for i in range(count)]
+
+
+def make_users(cls, count):
+    return [cls(f"User {i}", "password123", "customer", 0.0, f"user{i}@mail.com", user_id=1000 + i)
+            for i in range(count)]
+
+
+def make_tables(cls, count):
+    return [cls(i, 4, "free") for i in range(count)]
+
+
+def make_orders(count):
+    rng = random.Random(1)
+    orders = []
+    for _ in range(count):
+        orders.append({
+            "transaction_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "table_id": str(rng.randint(1, 6)),
+            "transaction_time": "2025-03-11 01:47:02",
+            "breakdown": [{
+                "product_id": rng.randint(100, 500),
+                "price": float(rng.randint(15, 250)),
+                "amount": rng.randint(1, 5),
+                "specification": rng.choice(SPECIFICATIONS),
+                "is_paid": rng.random() < 0.5,
+            } for _ in range(LINES_PER_ORDER)],
+        })
+    return orders
+
+
+def report(name, count, slotted, plain, slotted_label="__slots__", plain_label="__dict__"):
+    print(f"{name:<14} {plain_label:>10}: {plain / count:8.1f} B/record   "
+          f"{slotted_label:>10}: {slotted / count:8.1f} B/record   ({plain / slotted:4.1f}x smaller)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else ORDERS
+    print(f"{count} records each\n")
+
+    report("MenuItem", count, measure(lambda: make_menu_items(MenuItem, count)),
+           measure(lambda: make_menu_items(DictMenuItem, count)))
+    report("UserList", count, measure(lambda: make_users(UserList, count)),
+           measure(lambda: make_users(DictUserList, count)))
+    report("Table", count, measure(lambda: make_tables(Table, count)),
+           measure(lambda: make_tables(DictTable, count)))
+
+    # whole orders: header fields plus LINES_PER_ORDER line items each
+    orders = make_orders(count)
+    plain = measure(lambda: [dict(order, breakdown=[dict(line) for line in order["breakdown"]]) for order in orders])
+    packed = measure(lambda: PackedOrders(orders))
+    report("Order", count, packed, plain, "packed", "dicts")
+
+    # the round trip has to give the stored data back unchanged
+    assert PackedOrders(orders[:1000]).to_dicts() == orders[:1000]
+
+
+if __name__ == "__main__":
+    main()
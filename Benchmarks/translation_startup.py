@@ -0,0 +1,54 @@
+#Startup benchmark for the translation catalogs in Models/TranslationCatalog.py
+#Times loading every Assets/*Translation.json the two ways TranslationController can: parsing and flattening
+#the JSON, or mapping the compiled .catalog file. The compiled files are built into a temporary copy of Assets,
+#so the repository is not touched.
+#Run from the repository root: python Benchmarks/translation_startup.py [rounds]
+
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Models.TranslationCatalog import ASSETS_DIR, LanguageCatalog, compile_all
+
+ROUNDS = 200
+
+
+def load_all(paths, load):
+    return [load(path) for path in paths]
+
+
+def timed(paths, load, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        catalogs = load_all(paths, load)
+    return (time.perf_counter() - start) / rounds * 1000, catalogs
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else ROUNDS
+    with tempfile.TemporaryDirectory() as assets_dir:
+        for path in glob.glob(os.path.join(ASSETS_DIR, "*Translation.json")):
+            shutil.copy2(path, assets_dir)
+        paths = sorted(glob.glob(os.path.join(assets_dir, "*Translation.json")))
+        compile_all(assets_dir)
+
+        json_ms, from_json = timed(paths, LanguageCatalog.from_json, rounds)
+        compiled_ms, from_compiled = timed(paths, LanguageCatalog.from_compiled, rounds)
+
+        print(f"{len(paths)} catalogs, {rounds} rounds\n")
+        print(f"JSON      {json_ms:8.3f} ms per startup")
+        print(f"compiled  {compiled_ms:8.3f} ms per startup   ({json_ms / compiled_ms:4.1f}x faster)")
+
+        # both paths have to give the same catalogs
+        for a, b in zip(from_json, from_compiled):
+            assert a.translations == b.translations and dict(a.texts) == dict(b.texts)
+            assert a.templates == b.templates
+
+
+if __name__ == "__main__":
+    main()
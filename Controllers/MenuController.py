@@ -14,7 +14,7 @@ class MenuController:
 
     def get_items_by_category(self, category):
         # Show all items in the selected category without filtering by VIP status
-        return [item for item in self.model.menu if item.category.lower() == category.lower()]
+        return self.model.get_items_by_category(category)
 
 
     def get_vip_items(self):
@@ -22,3 +22,6 @@ class MenuController:
 
     def get_item_by_id(self, item_id):
         return self.model.get_item_by_id(item_id)
+
+    def get_item_by_exact_name(self, name):
+        return self.model.get_item_by_exact_name(name)
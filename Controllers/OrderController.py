@@ -6,33 +6,40 @@
 # 2. in order page click 1) + to plus 1, 2) - to minus 1, 3) "edit" to show submenu(pop-up) 4)show price at bottom
 #logic: controller: 1. get product info from menudb 2. record new order items 3. adjust ordered items info
 from Models.Order_Payment_Model import OrderModel, PaymentModel
+from Models.MenuModel import MenuModel
 from Views.OrderViewClass import OrderViewClass
 import tkinter as tk
 from tkinter import messagebox
 import os
-import json
 
 class OrderController:
 
-    def __init__(self, view,  table_id, user_id=1 ):#user_id defaulted 1 as regular customer
+    def __init__(self, view,  table_id, user_id=1, menu_model=None):#user_id defaulted 1 as regular customer
 
         self.view = view #call view to receive input from window
         self.user_id = user_id
         self.table_id = table_id
         self.order = OrderModel(table_id, user_id) #call model_layer to deal with data
         self.payment = PaymentModel(self.order)
+        self.menu_model = menu_model if menu_model is not None else MenuModel() #prices come from the loaded menu
 
 
     def add_item(self, product_index): #get new item from menu
 
-        with open("Database/MenuDB.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-            for item in data:
-                if item["name"] == product_index:
-                    item_id = product_index
-                    price = int(item["price"].split()[0])
-                    break
-        self.order.add_item(item_id, price)
+        # in-memory lookup, the price was parsed once when the menu was loaded
+        product = self.menu_model.get_item_by_exact_name(product_index)
+        if product is None:
+            print(f"Product {product_index} not found in menu")
+            return
+        self.order.add_item(product_index, product.unit_price)
+        self.view.update_items()
+
+    def add_item_by_id(self, item_id): #get new item from menu by its id, whatever language the menu shows
+        product = self.menu_model.get_item_by_id(item_id)
+        if product is None:
+            print(f"Product {item_id} not found in menu")
+            return
+        self.order.add_item(product.name, product.unit_price)
         self.view.update_items()
 
     def minus1_item(self, item_id):
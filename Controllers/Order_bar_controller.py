@@ -1,4 +1,4 @@
-import json
+import copy
 import os
 from tkinter import messagebox
 from datetime import datetime
@@ -10,6 +10,9 @@ models_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 if models_path not in sys.path:
     sys.path.append(models_path)
 from Models.BarModel import BarModel
+from Models.Money import to_major
+from Models.OrderBatch import checkout_orders, discount_orders
+from Models.Repository import create_repository
 
 
 # Order controller class
@@ -23,143 +26,167 @@ class EnhancedOrderController:
         if not os.path.exists(os.path.dirname(self.ORDER_FILE)):
             os.makedirs(os.path.dirname(self.ORDER_FILE), exist_ok=True)
 
+        # 打开订单存储（JSON模式下为快照+追加日志）/ Open the order store (snapshot + journal in JSON mode)
+        self.repository = None
+        try:
+            self.repository = create_repository("orders", self.ORDER_FILE)
+            # 合并前先把上次运行的日志折叠进快照 / Fold last session's journal into the snapshot before merging
+            self.repository.checkpoint()
+        except Exception as e:
+            messagebox.showerror("数据错误", f"读取订单文件失败: {str(e)}")
+
+        # 订单缓存：按交易ID索引，另有活跃/历史两个集合 / Order cache: by transaction_id plus active/history sets
+        # 调用方只拿到副本，未保存的修改不会影响缓存 / Callers only get copies, so unsaved edits never reach the cache
+        self._orders = None
+        self._active_ids = {}  # 用dict保持原有顺序的集合 / dicts used as insertion-ordered sets
+        self._history_ids = {}
+        self._cache_stamp = None
+
         # 初始化并运行数据库合并
         try:
-            # 创建BarModel实例进行数据库合并
+            # 创建BarModel实例进行数据库合并，合并结果直接写入订单存储
             self.model = BarModel(
                 source_path=os.path.join(root_dir, "Database", "OrderDB.json"),
-                target_path=self.ORDER_FILE
+                target_path=self.ORDER_FILE,
+                target_repository=self.repository
             )
             # 自动合并在BarModel初始化时已执行
         except Exception as e:
             messagebox.showwarning("数据库合并警告", f"数据库合并过程中发生错误: {str(e)}\n应用程序将继续使用现有数据。")
 
-    # 加载所有订单数据
-    def load_orders(self):
+    # 校验缓存：只有存储文件的修改时间或大小变化时才重新加载 / Reload only when the store's mtime or size changed
+    def _refresh_cache(self):
+        if self.repository is None:
+            self._orders = {}
+            return
+
+        stamp = self.repository.stamp()
+        if self._orders is not None and stamp == self._cache_stamp:
+            return
+
         try:
-            if os.path.exists(self.ORDER_FILE):
-                file = open(self.ORDER_FILE, "r", encoding="utf-8")
-                data = json.load(file)
-                file.close()
-
-                # 确保返回值是列表
-                if isinstance(data, list):
-                    return data
-                else:
-                    messagebox.showerror("数据错误", "订单数据格式不正确，初始化新数据")
-                    return []
-            return []
+            # 缓存已存在说明文件被其他程序改过 / A cache already exists, so someone else changed the files
+            if self._orders is not None:
+                self.repository.refresh()
+            orders = self.repository.load_all()
         except Exception as e:
             messagebox.showerror("数据错误", f"读取订单文件失败: {str(e)}")
-            return []
+            orders = []
+
+        self._orders = {}
+        self._active_ids = {}
+        self._history_ids = {}
+        for order in orders:
+            if isinstance(order, dict):
+                self._index_order(order)
+        self._cache_stamp = stamp
+
+    # 更新单个订单的索引 / Update the index entries of one order
+    def _index_order(self, order):
+        transaction_id = str(order.get("transaction_id", ""))
+        self._orders[transaction_id] = order
+
+        if "breakdown" not in order:
+            self._active_ids.pop(transaction_id, None)
+            self._history_ids.pop(transaction_id, None)
+            return
+
+        all_paid = all(item.get("is_paid", False) for item in order["breakdown"])
+        target, other = (self._history_ids, self._active_ids) if all_paid else (self._active_ids, self._history_ids)
+        other.pop(transaction_id, None)
+        if transaction_id not in target:
+            target[transaction_id] = None
+
+    # 加载所有订单数据
+    def load_orders(self):
+        self._refresh_cache()
+        return copy.deepcopy(list(self._orders.values()))
 
     # 根据交易ID获取订单
     def get_order_by_transaction(self, transaction_id):
-        orders = self.load_orders()
-        transaction_id_str = str(transaction_id)
+        self._refresh_cache()
+        order = self._orders.get(str(transaction_id))
+        return copy.deepcopy(order) if order is not None else None
 
-        # 搜索匹配的交易
-        for order in orders:
-            if str(order.get("transaction_id", "")) == transaction_id_str:
-                return order
-        return None
-
-    # 将订单数据保存到文件
+    # 将订单数据保存到存储（JSON模式下只追加一条日志记录）/ Save an order (a single journal append in JSON mode)
     def save_order(self, order_data):
-        orders = self.load_orders()
+        if self.repository is None:
+            messagebox.showerror("保存错误", "订单数据库不可用")
+            return
 
         # 确保ID是字符串格式
         order_data["transaction_id"] = str(order_data["transaction_id"])
 
-        # 搜索具有相同ID的现有订单
-        existing_index = -1
-        for i in range(len(orders)):
-            order = orders[i]
-            if isinstance(order, dict):
-                if str(order.get("transaction_id", "")) == order_data["transaction_id"]:
-                    existing_index = i
-                    break
+        self._refresh_cache()
+        try:
+            self.repository.save(order_data)
+        except Exception as e:
+            messagebox.showerror("保存错误", f"保存订单数据失败: {str(e)}")
+            return
 
-        # 更新或添加订单
-        if existing_index != -1:
-            orders[existing_index] = order_data
-        else:
-            orders.append(order_data)
+        # 自己的写入直接更新缓存，不触发重新加载 / Our own write updates the cache without a reload
+        self._index_order(copy.deepcopy(order_data))
+        self._cache_stamp = self.repository.stamp()
 
-        # 保存到文件
+    # 一次写入保存多个订单 / Save several orders with a single write
+    def save_orders(self, orders):
+        if self.repository is None:
+            messagebox.showerror("保存错误", "订单数据库不可用")
+            return False
+        if not orders:
+            return True
+
+        self._refresh_cache()
         try:
-            file = open(self.ORDER_FILE, "w", encoding="utf-8")
-            json.dump(orders, file, indent=4, ensure_ascii=False)
-            file.close()
+            self.repository.save_many(orders)
         except Exception as e:
             messagebox.showerror("保存错误", f"保存订单数据失败: {str(e)}")
+            return False
+
+        for order in orders:
+            self._index_order(copy.deepcopy(order))
+        self._cache_stamp = self.repository.stamp()
+        return True
 
     # 应用折扣到商品
     def apply_discount(self, order, discount_rate, product_ids=None):
-        for item in order["breakdown"]:
-            # 检查此商品是否应该应用折扣
-            if product_ids is None or str(item["product_id"]) in product_ids:
-                # 保存原始价格
-                if "original_price" not in item:
-                    item["original_price"] = item["price"]
-
-                # 计算折扣
-                original_price = item["original_price"]
-                new_price = round(original_price * (1 - discount_rate), 2)
-                discount_amount = round(original_price - new_price, 2)
-                discount_percentage = round(discount_rate * 100, 1)
-
-                # 更新商品信息
-                item["price"] = new_price
-                item["discount_percentage"] = discount_percentage
-                item["discount_amount"] = discount_amount
+        # 以最小货币单位计算并只舍入一次 / Discount in minor units, rounded once
+        discount_orders([order], discount_rate, product_ids)
         return order
 
     # 处理部分结账
     def partial_checkout(self, order, selected_ids):
-        total_paid = 0
-        # 处理选中的商品
-        for item in order["breakdown"]:
-            if str(item["product_id"]) in selected_ids and not item.get("is_paid", False):
-                item["is_paid"] = True
-                total_paid += item["price"] * item["amount"]
-        return order, total_paid
+        paid = checkout_orders([order], selected_ids)
+        return order, float(to_major(sum(paid.values())))
+
+    # 批量折扣：一条规则作用于多个订单，只写入一次 / Bulk discount: one rule over many orders, one write
+    def apply_discount_to_orders(self, orders, discount_rate, product_ids=None):
+        changed = discount_orders(orders, discount_rate, product_ids)
+        self.save_orders(changed)
+        return changed
+
+    # 批量结账：返回每个交易本次支付的金额 / Bulk checkout: amount paid now per transaction
+    def checkout_orders(self, orders, selected_ids=None):
+        paid = checkout_orders(orders, selected_ids)
+        if paid:
+            self.save_orders([order for order in orders if str(order.get("transaction_id", "")) in paid])
+        return {transaction_id: float(to_major(total)) for transaction_id, total in paid.items()}
+
+    # 按桌结清所有活跃订单（如打烊时）/ Settle every active order of the given tables, e.g. at closing time
+    def close_tables(self, table_ids):
+        tables = {str(table_id) for table_id in table_ids}
+        orders = [order for order in self.get_active_orders() if str(order.get("table_id")) in tables]
+        return self.checkout_orders(orders)
 
     # 获取活跃订单（未完全付款）
     def get_active_orders(self):
-        orders = self.load_orders()
-        active_orders = []
-
-        # 筛选未完全付款的订单
-        for o in orders:
-            if isinstance(o, dict) and "breakdown" in o:
-                all_paid = True
-                for item in o["breakdown"]:
-                    if not item.get("is_paid", False):
-                        all_paid = False
-                        break
-                if not all_paid:
-                    active_orders.append(o)
-
-        return active_orders
+        self._refresh_cache()
+        return copy.deepcopy([self._orders[transaction_id] for transaction_id in self._active_ids])
 
     # 获取历史订单（已完全付款）
     def get_history_orders(self):
-        orders = self.load_orders()
-        history_orders = []
-
-        # 筛选已完全付款的订单
-        for o in orders:
-            if isinstance(o, dict) and "breakdown" in o:
-                all_paid = True
-                for item in o["breakdown"]:
-                    if not item.get("is_paid", False):
-                        all_paid = False
-                        break
-                if all_paid:
-                    history_orders.append(o)
-
-        return history_orders
+        self._refresh_cache()
+        return copy.deepcopy([self._orders[transaction_id] for transaction_id in self._history_ids])
 
 
 # 初始化测试数据
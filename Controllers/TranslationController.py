@@ -1,20 +1,27 @@
 # Controllers/TranslationController.py
 import os
-import json
+import threading
+import weakref
 import tkinter as tk
 from tkinter import ttk
 from typing import Dict, Any
 
+from Models.TranslationCatalog import LanguageCatalog
+
+FORMAT_CACHE_SIZE = 4096  # 格式化结果缓存的上限 / limit of the formatted text cache
+_MISSING = object()
+
 
 class TranslationController:
     """多语言翻译控制器，负责管理翻译资源和语言切换"""
 
-    def __init__(self, assets_dir="Assets"):
+    def __init__(self, assets_dir="Assets", preload=True):
         """
         初始化翻译控制器
 
         Args:
             assets_dir: 存储翻译文件的目录
+            preload: 是否在后台线程中预先加载其余语言 / load the other languages in a background thread
         """
         self.assets_dir = assets_dir
         self.languages = {
@@ -24,6 +31,15 @@ class TranslationController:
         }
         self.current_language = None  # 当前语言
         self.translations = {}  # 当前语言的翻译
+        self.catalog = {}  # 扁平目录："a.b.c" -> 文本 / flat catalog: "a.b.c" -> text
+        self.templates = set()  # 含占位符的键 / keys whose text has placeholders
+        self._format_cache = {}  # (键, 参数) -> 格式化结果 / (key, arguments) -> formatted text
+        self._missing_keys = set()
+        self._catalogs = {}  # 语言代码 -> LanguageCatalog，每个语言只加载一次 / each language is loaded once
+        self._load_lock = threading.Lock()
+        self._preference_lock = threading.Lock()
+        # 控件 -> {选项: 绑定}，控件被回收后自动移除 / widget -> {option: binding}, dropped once the widget is gone
+        self._bindings = weakref.WeakKeyDictionary()
 
         # 确保资源目录存在
         if not os.path.exists(assets_dir):
@@ -43,6 +59,11 @@ class TranslationController:
         elif len(self.languages) > 0:
             self.set_language(next(iter(self.languages)))
 
+        # 当前语言已可用，其余语言在后台加载，之后切换无需再读文件
+        # The current language is ready; the rest load in the background so later switches never read a file
+        if preload:
+            threading.Thread(target=self.preload_languages, daemon=True).start()
+
     def _check_translation_files(self):
         """检查翻译文件是否存在，移除不存在的语言"""
         available_languages = {}
@@ -55,6 +76,37 @@ class TranslationController:
 
         self.languages = available_languages
 
+    def _get_catalog(self, lang_code):
+        """返回已加载的目录，必要时加载一次 / The loaded catalog of a language, loading it the first time"""
+        catalog = self._catalogs.get(lang_code)
+        if catalog is not None:
+            return catalog
+        with self._load_lock:
+            # 后台线程可能刚刚加载完 / the background thread may have just loaded it
+            catalog = self._catalogs.get(lang_code)
+            if catalog is None:
+                # 编译目录是最新的就直接映射，否则解析JSON / compiled catalog if up to date, else the JSON
+                file_path = os.path.join(self.assets_dir, self.languages[lang_code]["file"])
+                catalog = LanguageCatalog.load(file_path)
+                self._catalogs[lang_code] = catalog
+        return catalog
+
+    def preload_languages(self):
+        """加载所有可用语言 / Load every available language"""
+        for lang_code in list(self.languages):
+            try:
+                self._get_catalog(lang_code)
+            except Exception as e:
+                print(f"加载语言 {lang_code} 失败: {e}")
+
+    def _use_catalog(self, catalog):
+        """换用一个语言：只替换引用 / Switch language by swapping references"""
+        self.translations = catalog.translations
+        self.catalog = catalog.texts
+        self.templates = catalog.templates
+        self._format_cache = catalog.format_cache
+        self._missing_keys = set()
+
     def get_available_languages(self):
         """返回所有可用语言的代码和名称"""
         return {code: info["name"] for code, info in self.languages.items()}
@@ -74,16 +126,17 @@ class TranslationController:
             return False
 
         try:
-            file_path = os.path.join(self.assets_dir, self.languages[lang_code]["file"])
-            with open(file_path, 'r', encoding='utf-8') as file:
-                self.translations = json.load(file)
-                self.current_language = lang_code
-                self.save_language_preference(lang_code)
-                return True
+            catalog = self._get_catalog(lang_code)
         except Exception as e:
             print(f"加载语言 {lang_code} 失败: {e}")
             return False
 
+        self._use_catalog(catalog)
+        self.current_language = lang_code
+        self.relabel()
+        self._save_language_preference_async(lang_code)
+        return True
+
     def get_text(self, key_path, default=None, **format_args):
         """
         获取指定键路径的翻译文本
@@ -96,28 +149,113 @@ class TranslationController:
         Returns:
             str: 翻译后的文本
         """
-        if not self.translations:
-            return default if default is not None else key_path
+        # 扁平目录中一次字典查找 / One dict lookup in the flat catalog
+        value = self.catalog.get(key_path, _MISSING)
+        if value is _MISSING:
+            self._report_missing(key_path)
+            if default is None:
+                return key_path
+            # 默认文本也可以是模板 / the default may be a template too
+            if format_args and isinstance(default, str) and "{" in default:
+                try:
+                    return default.format(**format_args)
+                except (KeyError, IndexError, ValueError):
+                    return default
+            return default
+
+        # 只有含占位符的文本才需要格式化 / Only texts with placeholders are formatted
+        if format_args and key_path in self.templates:
+            return self._format(key_path, value, format_args)
 
-        # 沿着键路径查找值
-        value = self.translations
-        keys = key_path.split('.')
+        return value
 
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default if default is not None else key_path
+    def _format(self, key_path, template, format_args):
+        """格式化文本，相同参数的结果会被缓存 / Format a text, results for the same arguments are cached"""
+        try:
+            cache_key = (key_path, tuple(format_args.items()))
+            hash(cache_key)
+        except TypeError:
+            cache_key = None  # 参数不可哈希时不缓存 / unhashable arguments are not cached
 
-        # 如果有格式化参数，应用它们
-        if isinstance(value, str) and format_args:
-            try:
-                return value.format(**format_args)
-            except KeyError:
-                # 如果格式化失败，返回原始字符串
-                return value
+        if cache_key is not None and cache_key in self._format_cache:
+            return self._format_cache[cache_key]
 
-        return value
+        try:
+            text = template.format(**format_args)
+        except KeyError as e:
+            print(f"格式化翻译文本失败: {e}")
+            # 如果格式化失败，返回原始字符串
+            text = template
+
+        if cache_key is not None:
+            if len(self._format_cache) >= FORMAT_CACHE_SIZE:
+                self._format_cache.clear()
+            self._format_cache[cache_key] = text
+        return text
+
+    def _report_missing(self, key_path):
+        """每个缺失的键只提示一次 / Report each missing key once"""
+        if key_path in self._missing_keys:
+            return
+        self._missing_keys.add(key_path)
+        if self.catalog:
+            print(f"翻译键 '{key_path}' 不存在")
+
+    def bind(self, widget, key_path, default=None, option="text", setter=None, transform=None, **format_args):
+        """
+        把控件的一个选项绑定到翻译键：立即设置，切换语言时自动更新
+        Bind one option of a widget to a translation key: set now, and again on every language switch
+
+        Args:
+            widget: 控件 / the widget
+            key_path: 翻译键 / translation key
+            default: 键不存在时的文本 / text if the key is missing
+            option: 要设置的选项，例如 "text" / widget option to set
+            setter: 代替 widget.config 的函数，例如 root.title / called instead of widget.config
+            transform: 设置前对文本的处理 / applied to the text before it is set
+            format_args: 格式化参数 / format arguments
+
+        Returns:
+            str: 当前语言下的文本 / the text in the current language
+        """
+        binding = (key_path, default, option, setter, transform, format_args)
+        # 同一控件同一选项再次绑定会替换旧的绑定 / binding the same option again replaces the old binding
+        self._bindings.setdefault(widget, {})[option] = binding
+        return self._apply_binding(widget, binding)
+
+    def unbind(self, widget, option=None):
+        """取消控件的绑定 / Remove a widget's bindings, or only the one for option"""
+        options = self._bindings.get(widget)
+        if options is None:
+            return
+        if option is None:
+            del self._bindings[widget]
+        else:
+            options.pop(option, None)
+
+    def _apply_binding(self, widget, binding):
+        key_path, default, option, setter, transform, format_args = binding
+        text = self.get_text(key_path, default=default, **format_args)
+        if transform is not None:
+            text = transform(text)
+        if setter is not None:
+            setter(text)
+        else:
+            widget.configure(**{option: text})
+        return text
+
+    def relabel(self):
+        """一次遍历更新所有已绑定的控件，不重建任何控件 / Update every bound widget in one pass, nothing is rebuilt"""
+        for widget, options in list(self._bindings.items()):
+            try:
+                if hasattr(widget, "winfo_exists") and not widget.winfo_exists():
+                    # 已销毁的控件 / a destroyed widget
+                    del self._bindings[widget]
+                    continue
+                for binding in list(options.values()):
+                    self._apply_binding(widget, binding)
+            except tk.TclError:
+                self._bindings.pop(widget, None)
 
     def get_current_language(self):
         """返回当前语言代码"""
@@ -143,6 +281,16 @@ class TranslationController:
             # 如果保存失败，默默忽略
             pass
 
+    def _save_language_preference_async(self, lang_code):
+        """在后台线程中保存语言偏好，不阻塞界面 / Save the preference off the UI thread"""
+        def write():
+            # 依次写入，最后一次切换的语言最后写 / writes are serialized, so the last switch wins
+            with self._preference_lock:
+                if self.current_language == lang_code:
+                    self.save_language_preference(lang_code)
+
+        threading.Thread(target=write).start()
+
     def load_language_preference(self):
         """
         加载用户的语言偏好
@@ -162,73 +310,3 @@ class TranslationController:
             pass
 
         return None
-
-    def set_language(self, lang_code):
-        """
-        设置当前语言
-
-        Args:
-            lang_code: 语言代码，例如 "en", "zh", "sv"
-
-        Returns:
-            bool: 是否成功加载语言
-        """
-        if lang_code not in self.languages:
-            print(f"语言 {lang_code} 不可用")
-            return False
-
-        try:
-            file_path = os.path.join(self.assets_dir, self.languages[lang_code]["file"])
-            print(f"尝试加载翻译文件: {file_path}")
-
-            with open(file_path, 'r', encoding='utf-8') as file:
-                self.translations = json.load(file)
-                self.current_language = lang_code
-                self.save_language_preference(lang_code)
-
-                # 打印一些关键翻译项以验证
-                print(
-                    f"已加载 {lang_code} 语言，translations['general']['app_title'] = {self.translations.get('general', {}).get('app_title', 'Not found')}")
-                return True
-        except Exception as e:
-            print(f"加载语言 {lang_code} 失败: {e}")
-            return False
-
-    def get_text(self, key_path, default=None, **format_args):
-        """
-        获取指定键路径的翻译文本
-
-        Args:
-            key_path: 点分隔的键路径，例如 "general.welcome"
-            default: 如果键不存在，返回的默认值
-            format_args: 用于格式化字符串的参数
-
-        Returns:
-            str: 翻译后的文本
-        """
-        if not self.translations:
-            print(f"翻译字典为空，返回默认值: {default}")
-            return default if default is not None else key_path
-
-        # 沿着键路径查找值
-        value = self.translations
-        keys = key_path.split('.')
-
-        for i, key in enumerate(keys):
-            path_so_far = '.'.join(keys[:i + 1])
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                print(f"翻译键 '{key_path}' 不存在 (在 '{path_so_far}' 处找不到 '{key}')")
-                return default if default is not None else key_path
-
-        # 如果有格式化参数，应用它们
-        if isinstance(value, str) and format_args:
-            try:
-                return value.format(**format_args)
-            except KeyError as e:
-                print(f"格式化翻译文本失败: {e}")
-                # 如果格式化失败，返回原始字符串
-                return value
-
-        return value
\ No newline at end of file
@@ -213,32 +213,20 @@ class OrderViewManager:
         history_frame = tk.Frame(self.container)
         history_frame.pack(fill="both", expand=True)
 
-        # 获取翻译文本 / Get translated texts
-        back_text = "← Back"
-        order_history_text = "Order History"
-        no_history_orders_text = "No history orders"
-
-        if self.translation_controller:
-            back_text = self.translation_controller.get_text(
-                "general.back",
-                default=back_text
-            )
-            order_history_text = self.translation_controller.get_text(
-                "views.order_management.order_history",
-                default=order_history_text
-            )
-            no_history_orders_text = self.translation_controller.get_text(
-                "views.order_management.no_history_orders",
-                default=no_history_orders_text
-            )
-
         # Add header with back button
         header = tk.Frame(history_frame, bg="#f5f6fa")
         header.pack(fill="x", pady=5)
 
-        ttk.Button(header, text=back_text, command=self.show_list_view).pack(side="left", padx=10, pady=5)
-        tk.Label(header, text=order_history_text, font=("Arial", 14, "bold"), bg="#f5f6fa").pack(side="left", padx=20,
-                                                                                                 pady=5)
+        back_button = ttk.Button(header, text="← Back", command=self.show_list_view)
+        back_button.pack(side="left", padx=10, pady=5)
+        title_label = tk.Label(header, text="Order History", font=("Arial", 14, "bold"), bg="#f5f6fa")
+        title_label.pack(side="left", padx=20, pady=5)
+
+        # 绑定翻译，切换语言时不重建历史视图 / Bound texts, a language switch does not rebuild the history view
+        if self.translation_controller:
+            self.translation_controller.bind(back_button, "general.back", default="← Back")
+            self.translation_controller.bind(title_label, "views.order_management.order_history",
+                                             default="Order History")
 
         # Create scrollable area for order cards
         canvas = tk.Canvas(history_frame, bg="white")
@@ -256,7 +244,11 @@ class OrderViewManager:
         orders = self.controller.get_history_orders()
 
         if not orders:
-            tk.Label(cards_frame, text=no_history_orders_text, font=("Arial", 12), bg="white").pack(pady=20)
+            no_history_label = tk.Label(cards_frame, text="No history orders", font=("Arial", 12), bg="white")
+            no_history_label.pack(pady=20)
+            if self.translation_controller:
+                self.translation_controller.bind(no_history_label, "views.order_management.no_history_orders",
+                                                 default="No history orders")
         else:
             for order in orders:
                 card = OrderCard(
@@ -319,17 +311,12 @@ class OrderViewManager:
 
     def update_translations(self):
         """更新订单视图管理器中的所有翻译"""
-        # 如果当前有活动视图，更新其翻译
+        # 列表、历史视图和订单卡片的文本已绑定翻译，切换语言时自动更新，不再重建视图
+        # List, history and card texts are bound and relabel themselves, so those views are no longer rebuilt;
+        # only the detail views still refresh their item sections
         if self.current_frame and hasattr(self.current_frame, 'update_translations'):
             self.current_frame.update_translations()
 
-        # 如果当前视图是列表视图，强制刷新以更新翻译
-        if self.current_view == "list":
-            self.show_list_view()
-        # 如果当前视图是历史视图，强制刷新以更新翻译
-        elif self.current_view == "history":
-            self.show_history_view()
-
 
 # Application Manager class to handle view switching and user roles
 class AppManager:
@@ -366,43 +353,26 @@ class AppManager:
         # Initialize with tabs hidden (will show based on user role)
         self.update_ui()
 
-    def update_language_button(self):
-        """更新语言按钮文本"""
-        language_text = "Language"
-        if self.translation_controller:
-            language_text = self.translation_controller.get_text(
-                "general.language",
-                default=language_text
-            )
-
-        # 查找并更新语言按钮文本
-        for widget in self.toolbar.winfo_children():
-            if isinstance(widget, ttk.Button):
-                widget.configure(text=language_text)
-                break
-
     def create_language_button(self):
         """创建语言切换按钮"""
         # 创建顶部工具栏
         self.toolbar = tk.Frame(self.root, bg="#f0f0f0", height=30)  # 保存为实例变量
         self.toolbar.pack(side="top", fill="x")
 
-        # 获取语言按钮文本
-        language_text = "Language"
-        if self.translation_controller:
-            language_text = self.translation_controller.get_text(
-                "general.language",
-                default=language_text
-            )
-
         # 创建语言按钮
         language_btn = ttk.Button(
             self.toolbar,
-            text=language_text,
+            text="Language",
             command=self.show_language_selector
         )
         language_btn.pack(side="right", padx=10, pady=2)
 
+        # 绑定按钮文本和窗口标题 / Bind the button text and the window title
+        if self.translation_controller:
+            self.translation_controller.bind(language_btn, "general.language", default="Language")
+            self.translation_controller.bind(self.root, "general.app_title", default="Restaurant Management System",
+                                             option="title", setter=self.root.title)
+
     # 将这段代码替换到CombineView.py文件中对应的地方
 
     # 修复AppManager类中的方法
@@ -501,25 +471,13 @@ class AppManager:
             language_window.minsize(400, 250)
 
     def update_all_translations(self):
-        """递归更新所有视图的翻译"""
-        # 更新语言按钮文本
-        self.update_language_button()
-
-        # 更新标签页标题
-        if self.current_view == "customer":
-            self.show_customer_view(force_update=True)
-        else:
-            self.show_staff_view(force_update=True)
-
-        # 更新主视图及其子视图
+        """语言切换后更新尚未绑定翻译键的视图 / Update the views whose texts are not bound to translation keys"""
+        # 语言按钮、窗口标题、标签页、订单列表和订单卡片已绑定，set_language 时一次性更新
+        # The language button, window title, tabs, order list and order cards are bound and were relabelled by
+        # set_language in one pass; the views below update their own labels in place
         if 'main_view' in globals() and hasattr(main_view, 'update_translations'):
             main_view.update_translations()
 
-            # 直接更新主视图中的订单框架
-            if hasattr(main_view, 'order_frame') and main_view.order_frame:
-                if hasattr(main_view.order_frame, 'update_translations'):
-                    main_view.order_frame.update_translations()
-
         # 更新客户视图
         if hasattr(customer_view, 'update_translations'):
             customer_view.update_translations()
@@ -534,21 +492,9 @@ class AppManager:
 
     def update_language(self):
         """更新语言后的回调"""
-        # 更新窗口标题
-        app_title = "Restaurant Management System"
-        if self.translation_controller:
-            app_title = self.translation_controller.get_text(
-                "general.app_title",
-                default=app_title
-            )
-        self.root.title(app_title)
-
         # 更新所有翻译
         self.update_all_translations()
 
-        # 设置延迟任务来执行第二次更新
-        self.root.after(100, self.delayed_update)
-
         # 通知用户
         language_changed_text = "Interface language has been changed."
         success_title = "Success"
@@ -571,56 +517,34 @@ class AppManager:
 
         messagebox.showinfo(success_title, language_changed_text)
 
-    def delayed_update(self):
-        """延迟执行的更新，确保捕获所有动态加载的组件"""
-        # 再次更新订单框架
-        if 'main_view' in globals() and hasattr(main_view, 'order_frame') and main_view.order_frame:
-            if hasattr(main_view.order_frame, 'update_translations'):
-                main_view.order_frame.update_translations()
-
     def setup_tabs(self):
         # Clear existing tabs if any
         for widget in self.tab_bar.winfo_children():
             widget.destroy()
 
-        # 获取标签文本翻译
-        product_tab_text = "Product"
-        table_tab_text = "Table"
-
-        if self.translation_controller:
-            product_tab_text = self.translation_controller.get_text(
-                "views.menu.products",
-                default=product_tab_text
-            )
-            table_tab_text = self.translation_controller.get_text(
-                "views.bartender.table_status.bar",
-                default=table_tab_text
-            )
-
         # Create tabs
-        self.customer_tab = CustomTab(self.tab_bar, product_tab_text, self.show_customer_view,
+        self.customer_tab = CustomTab(self.tab_bar, "Product", self.show_customer_view,
                                       is_active=(self.current_view == "customer"))
         self.customer_tab.pack(side="left")
 
-        self.staff_tab = CustomTab(self.tab_bar, table_tab_text, self.show_staff_view,
+        self.staff_tab = CustomTab(self.tab_bar, "Table", self.show_staff_view,
                                    is_active=(self.current_view == "staff"))
         self.staff_tab.pack(side="left")
 
+        # 绑定标签文本翻译 / Bind the tab texts
+        if self.translation_controller:
+            self.translation_controller.bind(self.customer_tab.label, "views.menu.products", default="Product")
+            self.translation_controller.bind(self.staff_tab.label, "views.bartender.table_status.bar",
+                                             default="Table")
+
     def show_customer_view(self, force_update=False):
         if self.current_view != "customer" or force_update:
             if self.current_view != "customer":
                 self.staff_view_frame.pack_forget()
                 self.customer_view_frame.pack(fill="both", expand=True)
 
-            # 更新标签文本
+            # 更新标签状态（文本已绑定翻译）/ Update the tab state, the texts are bound
             if self.customer_tab and self.staff_tab:
-                product_tab_text = "Product"
-                if self.translation_controller:
-                    product_tab_text = self.translation_controller.get_text(
-                        "views.menu.products",
-                        default=product_tab_text
-                    )
-                self.customer_tab.label.config(text=product_tab_text)
                 self.customer_tab.set_active(True)
                 self.staff_tab.set_active(False)
 
@@ -632,15 +556,8 @@ class AppManager:
                 self.customer_view_frame.pack_forget()
                 self.staff_view_frame.pack(fill="both", expand=True)
 
-            # 更新标签文本
+            # 更新标签状态（文本已绑定翻译）/ Update the tab state, the texts are bound
             if self.customer_tab and self.staff_tab:
-                table_tab_text = "Table"
-                if self.translation_controller:
-                    table_tab_text = self.translation_controller.get_text(
-                        "views.bartender.table_status.bar",
-                        default=table_tab_text
-                    )
-                self.staff_tab.label.config(text=table_tab_text)
                 self.customer_tab.set_active(False)
                 self.staff_tab.set_active(True)
 
@@ -698,7 +615,7 @@ if __name__ == "__main__":
     # Create login-related views
     login_view = LoginView(root, user_controller, lambda: app_manager.update_ui(), translation_controller)
     register_view = RegisterView(root, user_controller, translation_controller)
-    table_choice_view = TableChoice(root, login_view, None, translation_controller)
+    table_choice_view = TableChoice(root, login_view, None, translation_controller, table_model=table_model)
 
     # Create MainView with translation controller
     main_view = MainView(root, user_controller, menu_controller, translation_controller)
@@ -751,4 +668,7 @@ if __name__ == "__main__":
     y = (root.winfo_screenheight() // 2) - (height // 2)
     root.geometry('{}x{}+{}+{}'.format(width, height, x, y))
 
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+    # write any stock changes still waiting for the write-behind timer
+    menu_model.flush()
\ No newline at end of file
@@ -1,8 +1,12 @@
+import hashlib
 import json
 import os
 import logging
+from collections import Counter
 from datetime import datetime
 
+from Models.Money import discounted, to_major, to_minor
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -14,12 +18,100 @@ logging.basicConfig(
 )
 
 
+MERGE_BATCH_SIZE = 200  # merged orders written to the target per batch
+PROGRESS_EVERY = 500  # source orders between two progress reports
+
+
+class JsonRecordStream:
+    """Reads the records of a JSON file one at a time, the file may hold an array or a single object"""
+
+    def __init__(self, path, chunk_size=65536):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.total_size = os.path.getsize(path)
+        self.position = 0  # characters read so far, for progress reporting
+        self._file = None
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        decoder = json.JSONDecoder()
+        with open(self.path, "r", encoding="utf-8") as f:
+            self._file = f
+            self._buf, self._pos, self._eof = "", 0, False
+
+            first = self._peek()
+            if first is None:
+                return
+            # A single order object instead of an array
+            if first == "{":
+                yield self._decode(decoder)
+                return
+            if first != "[":
+                raise ValueError(f"Unexpected data format starting with {first!r}. Expected dict or list")
+
+            self._pos += 1
+            if self._peek() == "]":
+                return
+            while True:
+                yield self._decode(decoder)
+                separator = self._peek()
+                if separator == ",":
+                    self._pos += 1
+                elif separator == "]":
+                    return
+                else:
+                    raise json.JSONDecodeError("Expected ',' or ']'", self._buf, self._pos)
+
+    def _fill(self):
+        # only the unread tail of the buffer is kept, so memory stays at one record plus one chunk
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+        self.position += len(chunk)
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+
+    def _peek(self):
+        """Skip whitespace and return the next character without consuming it, None at end of file"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._eof:
+                return None
+            self._fill()
+
+    def _decode(self, decoder):
+        self._peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # probably a record cut in half by the chunk boundary, read more and retry
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
 class BarModel:
     """Bar data model, handles database merging and management"""
 
-    def __init__(self, source_path="Database/OrderDB.json", target_path="OrderDB.json"):
+    def __init__(self, source_path="Database/OrderDB.json", target_path="OrderDB.json", target_repository=None,
+                 progress_callback=None):
         self.source_path = source_path
         self.target_path = target_path
+        # Optional Repository for the target; when given, merged orders are upserted into it
+        self.target_repository = target_repository
+        # Optional callback(processed_orders, position, total_size) called while merging
+        self.progress_callback = progress_callback
+        # Watermark of what has already been merged, kept next to the target database
+        self.state_path = os.path.splitext(self.target_path)[0] + "_merge_state.json"
         self.product_id_map = {}
         self.next_id = 100
 
@@ -46,16 +138,11 @@ class BarModel:
                 logging.info(f"Source database file does not exist: {self.source_path}")
                 return False
 
-            # Check modification times of source and target files
-            source_modified = False
-            if os.path.exists(self.target_path):
-                source_time = os.path.getmtime(self.source_path)
-                target_time = os.path.getmtime(self.target_path)
-                source_modified = source_time > target_time
-
-                if not source_modified:
-                    logging.info("Source database has not changed, no need to merge")
-                    return False
+            # Compare the source file with the watermark written by the last merge
+            state = self._load_merge_state()
+            if state["source_stamp"] == self._source_stamp():
+                logging.info("Source database has not changed, no need to merge")
+                return False
 
             # Perform merge operation
             logging.info("Detected updates in source database, starting merge...")
@@ -66,120 +153,361 @@ class BarModel:
 
     def merge_database(self):
         """
-        Merge new database with existing database.
+        Merge new orders from the source database into the target database.
+
+        The source is streamed one order at a time and merged orders are written to the
+        target in batches, so memory does not grow with the size of the source file.
+        Orders whose content was already merged are skipped, so running the merge
+        again never duplicates orders and only new or changed orders are processed.
+        When an order the target already has changed in the source, only its new or
+        changed lines are merged into it; paid flags, discounts and everything else
+        the bartender set on the order are kept.
 
         Returns:
             bool: True if merge successful, False otherwise
         """
         try:
-            # Read new database
-            with open(self.source_path, "r", encoding="utf-8") as f:
-                try:
-                    new_data = json.load(f)
-                    logging.info(f"Successfully loaded new data from: {self.source_path}")
-                except json.JSONDecodeError as e:
-                    logging.error(f"Source file has invalid JSON format: {e}")
-                    return False
+            source_stamp = self._source_stamp()
+            stream = JsonRecordStream(self.source_path)
+            logging.info(f"Streaming orders from: {self.source_path}")
 
-            # Check data format and transform
-            transformed_orders = []
-
-            # If it's a single object (not in an array)
-            if isinstance(new_data, dict):
-                logging.info("Source data is a single order object, converting to list")
-                new_data = [new_data]
-            elif not isinstance(new_data, list):
-                logging.error(f"Unexpected data format: {type(new_data)}. Expected dict or list")
-                return False
-
-            logging.info(f"Processing {len(new_data)} new orders...")
-
-            # Load product_id mapping
+            # Load product_id mapping and merge watermark
             self._load_product_id_mapping()
+            state = self._load_merge_state()
+            merged_hashes = state["hashes"]
+
+            # Without a target repository only the ids of the existing file are kept in memory
+            existing_ids = set() if self.target_repository is not None else self._read_existing_ids()
+
+            batch = []
+            batch_hashes = {}
+            seen = set()  # transaction ids in the source, the watermark forgets the others
+            spool = {}  # file mode: transaction_id -> offset of the merged order in the spool file
+            spool_path = self.target_path + ".merge"
+            spool_file = None
+            processed = merged = skipped = 0
+            source_complete = False
+
+            def flush_batch():
+                nonlocal spool_file
+                if not batch:
+                    return
+                if self.target_repository is not None:
+                    self.target_repository.save_many(batch)
+                else:
+                    if spool_file is None:
+                        spool_file = open(spool_path, "w", encoding="utf-8")
+                    for record in batch:
+                        spool[record["transaction_id"]] = spool_file.tell()
+                        spool_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                merged_hashes.update(batch_hashes)
+                batch.clear()
+                batch_hashes.clear()
 
-            # Process each order
-            for i, order in enumerate(new_data):
-                try:
-                    # Create new order with expected structure
-                    new_order = {
-                        "transaction_id": str(order.get("transaction_id", f"unknown-{i}")),
-                        "table_id": str(order.get("table_id", "")),
-                        "transaction_time": order.get("transaction_time", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
-                        "breakdown": []
-                    }
-
-                    # Process order details
-                    if "breakdown" in order and isinstance(order["breakdown"], list):
-                        for item in order["breakdown"]:
-                            # Get original product_id and specification
-                            original_product_id = str(item.get("product_id", ""))
-                            original_specification = str(item.get("specification", ""))
-
-                            # Merge product_id and specification as new specification
-                            combined_specification = original_product_id
-                            if original_specification:
-                                combined_specification += f" - {original_specification}"
-
-                            # If there's a note, add it to specification
-                            if "notes" in item and item["notes"]:
-                                combined_specification += f" ({item['notes']})"
-
-                            # Assign a numeric ID for product_id
-                            if original_product_id not in self.product_id_map:
-                                self.product_id_map[original_product_id] = self.next_id
-                                self.next_id += 1
-
-                            numeric_product_id = self.product_id_map[original_product_id]
-
-                            # Create transformed product
-                            new_item = {
-                                "product_id": numeric_product_id,  # Use mapped numeric ID
-                                "price": float(item.get("price", 0)),
-                                "amount": int(item.get("amount", 1)),
-                                "specification": combined_specification,  # Use combined specification
-                                "is_paid": bool(item.get("is_paid", False))
-                            }
-
-                            new_order["breakdown"].append(new_item)
-
-                        # Log warning if no products
-                        if not new_order["breakdown"]:
-                            logging.warning(f"Order {new_order['transaction_id']} has no product details")
-                    else:
-                        logging.warning(f"Order {new_order['transaction_id']} is missing valid breakdown section")
-
-                    transformed_orders.append(new_order)
-                    logging.info(f"Processed order {new_order['transaction_id']}, containing {len(new_order['breakdown'])} products")
-
-                except Exception as e:
-                    logging.error(f"Error processing order {i}: {str(e)}")
-                    # Continue processing other orders
-
-            if not transformed_orders:
+            try:
+                # Process each order as it is read
+                for i, order in enumerate(stream):
+                    processed += 1
+                    try:
+                        transaction_id = str(order.get("transaction_id", f"unknown-{i}"))
+                        seen.add(transaction_id)
+                        line_hashes = self._line_hashes(order)
+                        previous = merged_hashes.get(transaction_id)
+                        if isinstance(previous, str):
+                            # watermark written before line hashes were kept: one hash of the whole order
+                            previous = line_hashes if previous == self._order_hash(order) else None
+
+                        # Same content as last time: already merged
+                        if previous == line_hashes:
+                            merged_hashes[transaction_id] = line_hashes
+                            skipped += 1
+                            continue
+
+                        # Merged before the watermark existed: remember it, do not merge it twice
+                        in_target = self._target_has(transaction_id, existing_ids)
+                        if transaction_id not in merged_hashes and in_target:
+                            merged_hashes[transaction_id] = line_hashes
+                            skipped += 1
+                            continue
+
+                        new_order = self._transform_order(order, i)
+                        if in_target:
+                            # Changed since the last merge: only its new or changed lines go into the target order
+                            changed, kept = self._split_lines(previous, line_hashes, new_order["breakdown"])
+                            if self.target_repository is not None:
+                                record = self._merge_lines(self.target_repository.get(transaction_id), changed,
+                                                           kept)
+                            else:
+                                # merged into the existing order when the target file is rewritten
+                                record = {"transaction_id": transaction_id, "changed": changed, "kept": kept}
+                        else:
+                            record = new_order
+                        batch.append(record)
+                        batch_hashes[transaction_id] = line_hashes
+                        merged += 1
+                        logging.debug(f"Processed order {new_order['transaction_id']}, containing {len(new_order['breakdown'])} products")
+
+                    except Exception as e:
+                        logging.error(f"Error processing order {i}: {str(e)}")
+                        # Continue processing other orders
+
+                    if len(batch) >= MERGE_BATCH_SIZE:
+                        flush_batch()
+                    if processed % PROGRESS_EVERY == 0:
+                        self._report_progress(processed, stream)
+                source_complete = True
+            except ValueError as e:
+                # Orders read before the error are still merged, the watermark keeps the old stamp so we retry
+                logging.error(f"Source file has invalid JSON format: {e}")
+            finally:
+                flush_batch()
+                if spool_file is not None:
+                    spool_file.close()
+
+            self._report_progress(processed, stream)
+
+            # Forget orders that are gone from the source, so the watermark does not grow forever
+            if source_complete:
+                merged_hashes = {transaction_id: hashes for transaction_id, hashes in merged_hashes.items()
+                                 if transaction_id in seen}
+
+            if self.target_repository is None and spool:
+                self._write_target_with_spool(spool_path, spool)
+            if os.path.exists(spool_path):
+                os.remove(spool_path)
+
+            # Save product_id mapping and move the watermark
+            if merged:
+                self._save_product_id_mapping()
+            self._save_merge_state(source_stamp if source_complete else state["source_stamp"], merged_hashes)
+
+            if not merged:
+                if skipped:
+                    logging.info(f"All {skipped} source orders were already merged, nothing to do")
+                    return source_complete
                 logging.error("No valid orders found for conversion")
                 return False
 
-            # Read existing target database (if it exists)
-            existing_orders = self._read_existing_database()
+            logging.info(f"Successfully merged {merged} new orders to database, {skipped} already merged")
+            return source_complete
 
-            # Merge existing orders and new orders
-            merged_orders = existing_orders + transformed_orders
-            logging.info(f"Merged database now has {len(merged_orders)} orders")
+        except Exception as e:
+            logging.error(f"Error during database merge process: {str(e)}")
+            return False
 
-            # Write merged data to target path
-            with open(self.target_path, "w", encoding="utf-8") as f:
-                json.dump(merged_orders, f, indent=4, ensure_ascii=False)
+    def _report_progress(self, processed, stream):
+        percent = 100.0 * stream.position / stream.total_size if stream.total_size else 100.0
+        logging.info(f"Merge progress: {processed} orders read ({min(percent, 100.0):.0f}%)")
+        if self.progress_callback:
+            self.progress_callback(processed, stream.position, stream.total_size)
 
-            # Save product_id mapping
-            self._save_product_id_mapping()
+    def _read_existing_ids(self):
+        """Stream the existing target file and collect its transaction ids"""
+        existing_ids = set()
+        if os.path.exists(self.target_path) and os.path.getsize(self.target_path) > 0:
+            try:
+                for order in JsonRecordStream(self.target_path):
+                    if isinstance(order, dict):
+                        existing_ids.add(str(order.get("transaction_id", "")))
+                logging.info(f"Found {len(existing_ids)} existing orders in {self.target_path}")
+            except Exception as e:
+                logging.warning(f"Unable to load existing database, will create new database: {str(e)}")
+        return existing_ids
+
+    def _write_target_with_spool(self, spool_path, spool):
+        """Rewrite the target file order by order: merge changed orders in place, append the new ones"""
+        tmp_path = self.target_path + ".tmp"
+        written = 0
+        with open(spool_path, "r", encoding="utf-8") as spool_file, \
+                open(tmp_path, "w", encoding="utf-8") as out:
+
+            def write_order(order):
+                nonlocal written
+                out.write(",\n" if written else "[\n")
+                out.write(json.dumps(order, indent=4, ensure_ascii=False))
+                written += 1
+
+            def spooled_order(transaction_id):
+                spool_file.seek(spool.pop(transaction_id))
+                return json.loads(spool_file.readline())
+
+            if os.path.exists(self.target_path) and os.path.getsize(self.target_path) > 0:
+                try:
+                    for order in JsonRecordStream(self.target_path):
+                        transaction_id = str(order.get("transaction_id", "")) if isinstance(order, dict) else None
+                        if transaction_id in spool:
+                            update = spooled_order(transaction_id)
+                            if "changed" in update:
+                                order = self._merge_lines(order, update["changed"], update["kept"])
+                            else:
+                                order = update
+                        write_order(order)
+                except Exception as e:
+                    logging.warning(f"Unable to read existing database, keeping what was read: {str(e)}")
+
+            for transaction_id in list(spool):
+                update = spooled_order(transaction_id)
+                if "changed" in update:
+                    logging.warning(f"Order {transaction_id} is no longer in the target, its changes are dropped")
+                    continue
+                write_order(update)
+            out.write("\n]" if written else "[]")
+
+        os.replace(tmp_path, self.target_path)
+        logging.info(f"Merged database now has {written} orders")
+        logging.info(f"Updated database saved to {self.target_path}")
+
+    def _transform_order(self, order, i):
+        """Convert one source order to the bartender order structure"""
+        # Create new order with expected structure
+        new_order = {
+            "transaction_id": str(order.get("transaction_id", f"unknown-{i}")),
+            "table_id": str(order.get("table_id", "")),
+            "transaction_time": order.get("transaction_time", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            "breakdown": []
+        }
+
+        # Process order details
+        if "breakdown" in order and isinstance(order["breakdown"], list):
+            for item in order["breakdown"]:
+                # Get original product_id and specification
+                original_product_id = str(item.get("product_id", ""))
+                original_specification = str(item.get("specification", ""))
+
+                # Merge product_id and specification as new specification
+                combined_specification = original_product_id
+                if original_specification:
+                    combined_specification += f" - {original_specification}"
+
+                # If there's a note, add it to specification
+                if "notes" in item and item["notes"]:
+                    combined_specification += f" ({item['notes']})"
+
+                # Assign a numeric ID for product_id
+                if original_product_id not in self.product_id_map:
+                    self.product_id_map[original_product_id] = self.next_id
+                    self.next_id += 1
+
+                numeric_product_id = self.product_id_map[original_product_id]
+
+                # Create transformed product
+                new_item = {
+                    "product_id": numeric_product_id,  # Use mapped numeric ID
+                    "price": float(to_major(to_minor(item.get("price", 0)))),  # normalised to whole öre
+                    "amount": int(item.get("amount", 1)),
+                    "specification": combined_specification,  # Use combined specification
+                    "is_paid": bool(item.get("is_paid", False))
+                }
+
+                new_order["breakdown"].append(new_item)
+
+            # Log warning if no products
+            if not new_order["breakdown"]:
+                logging.warning(f"Order {new_order['transaction_id']} has no product details")
+        else:
+            logging.warning(f"Order {new_order['transaction_id']} is missing valid breakdown section")
+
+        return new_order
+
+    @staticmethod
+    def _line_key(item):
+        """Lines of one order are matched by product and specification"""
+        return str(item.get("product_id", "")), item.get("specification", "")
+
+    @staticmethod
+    def _split_lines(previous, line_hashes, lines):
+        """Split the transformed lines of a changed order into new or changed lines and the keys of unchanged ones"""
+        unchanged = Counter(previous or ())
+        changed, kept = [], []
+        for digest, item in zip(line_hashes, lines):
+            if unchanged[digest] > 0:
+                unchanged[digest] -= 1
+                kept.append(BarModel._line_key(item))
+            else:
+                changed.append(item)
+        return changed, kept
+
+    def _merge_lines(self, existing, changed, kept):
+        """
+        Merge the new or changed lines of a source order into the order the target already has.
 
-            logging.info(f"Successfully merged {len(transformed_orders)} new orders to database")
-            logging.info(f"Updated database saved to {self.target_path}")
-            return True
+        A changed line takes the new amount and price of the matching target line (same product and
+        specification), keeping its paid flag and discount; other lines are added. Unchanged lines and
+        all other fields of the target order stay as they are.
+        """
+        merged = dict(existing)
+        lines = [dict(item) for item in existing.get("breakdown", [])]
+        free = {}
+        for item in lines:
+            free.setdefault(self._line_key(item), []).append(item)
+        # the target lines the unchanged source lines were merged into are left alone
+        for key in kept:
+            candidates = free.get(tuple(key))
+            if candidates:
+                candidates.pop(0)
+
+        for new_item in changed:
+            candidates = free.get(self._line_key(new_item))
+            if not candidates:
+                lines.append(new_item)
+                continue
+            item = candidates.pop(0)
+            item["amount"] = new_item["amount"]
+            item["is_paid"] = bool(item.get("is_paid", False)) or new_item["is_paid"]
+            if "original_price" in item:
+                # keep the bartender's discount, now taken off the new price
+                base = to_minor(new_item["price"])
+                price = discounted(base, item.get("discount_percentage", 0) / 100)
+                item["original_price"] = new_item["price"]
+                item["price"] = float(to_major(price))
+                item["discount_amount"] = float(to_major(base - price))
+            else:
+                item["price"] = new_item["price"]
+        merged["breakdown"] = lines
+        return merged
+
+    def _target_has(self, transaction_id, existing_ids):
+        """Check whether the target already holds an order with this transaction_id"""
+        if self.target_repository is not None:
+            return self.target_repository.get(transaction_id) is not None
+        return transaction_id in existing_ids
+
+    @staticmethod
+    def _order_hash(order):
+        """Content hash of a source order, used to detect orders that were merged already"""
+        canonical = json.dumps(order, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _line_hashes(order):
+        """Short content hash of every breakdown line of a source order, in order"""
+        lines = order.get("breakdown")
+        if not isinstance(lines, list):
+            return []
+        return [hashlib.sha1(json.dumps(item, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+                .hexdigest()[:16] for item in lines]
+
+    def _source_stamp(self):
+        st = os.stat(self.source_path)
+        return [st.st_mtime_ns, st.st_size]
+
+    def _load_merge_state(self):
+        """Load the merge watermark: stamp of the last merged source file and line hashes of merged orders"""
+        state = {"source_stamp": None, "hashes": {}}
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    state.update(json.load(f))
+            except Exception as e:
+                logging.warning(f"Unable to load merge state, merging from scratch: {str(e)}")
+        return state
 
+    def _save_merge_state(self, source_stamp, hashes):
+        try:
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump({"source_stamp": source_stamp, "hashes": hashes}, f, indent=4)
         except Exception as e:
-            logging.error(f"Error during database merge process: {str(e)}")
-            return False
+            logging.error(f"Error saving merge state: {str(e)}")
 
     def _load_product_id_mapping(self):
         """Load existing product_id mapping"""
@@ -205,20 +533,6 @@ class BarModel:
         except Exception as e:
             logging.error(f"Error saving product ID mapping: {str(e)}")
 
-    def _read_existing_database(self):
-        """Read existing database"""
-        existing_orders = []
-        if os.path.exists(self.target_path):
-            try:
-                with open(self.target_path, "r", encoding="utf-8") as f:
-                    existing_orders = json.load(f)
-                    if not isinstance(existing_orders, list):
-                        existing_orders = []
-                    logging.info(f"Loaded {len(existing_orders)} existing orders from {self.target_path}")
-            except Exception as e:
-                logging.warning(f"Unable to load existing database, will create new database: {str(e)}")
-        return existing_orders
-
     def validate_database(self):
         """
         Validate database to ensure it conforms to expected format.
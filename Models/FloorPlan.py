@@ -0,0 +1,102 @@
+#Floor plan of the pub: where every table and the bar are drawn
+#Positions come from the tables themselves ("position": {"x", "y"} in TablesDB), then from the optional layout file
+#Database/FloorPlanDB.json, and any table without a position is put on a grid. A grid hash of the table
+#rectangles answers "which table is at this point" without looking at every table
+
+import json
+import math
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FLOOR_PLAN_FILE = os.path.join(BASE_DIR, "Database", "FloorPlanDB.json")
+
+TABLE_WIDTH = 100
+TABLE_HEIGHT = 60
+GRID_ORIGIN = (150, 120)  # center of the first table
+GRID_SPACING = (200, 160)
+BAR_WIDTH = 100
+CELL_SIZE = 200  # side of a spatial index cell, about one table with its spacing
+
+
+def load_layout_file(path=FLOOR_PLAN_FILE):
+    #{"tables": {"<table_id>": {"x": .., "y": ..}}, "bar": {"x1": .., "y1": .., "x2": .., "y2": ..}}
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (IOError, ValueError) as e:
+        print(f"Error loading floor plan {path}: {e}")
+        return {}
+
+
+class FloorPlan:
+    """Table rectangles and the bar area, plus a spatial index for hit-testing"""
+
+    def __init__(self, tables, layout=None):
+        layout = layout if layout is not None else load_layout_file()
+        placed = layout.get("tables", {})
+        self.rects = {}  # table_id -> (x1, y1, x2, y2)
+        self.cells = {}  # (column, row) -> [table_id]
+
+        # rows are 2/3 of the columns, which keeps the original two columns of three for six tables
+        columns = max(2, math.ceil(math.sqrt(len(tables) * 2 / 3)))
+        slot = 0
+        for table in tables:
+            position = self._stored_position(table, placed)
+            if position is None:
+                # tables without a stored position fill the grid in order
+                row, column = divmod(slot, columns)
+                position = (GRID_ORIGIN[0] + column * GRID_SPACING[0], GRID_ORIGIN[1] + row * GRID_SPACING[1])
+                slot += 1
+            self._add(table.table_id, position)
+
+        rows = math.ceil(slot / columns) if slot else 1
+        self.bar = self._bar_rect(layout.get("bar"), columns, rows)
+
+    @staticmethod
+    def _stored_position(table, placed):
+        data = table.position or placed.get(str(table.table_id))
+        if data and "x" in data and "y" in data:
+            return data["x"], data["y"]
+        return None
+
+    def _bar_rect(self, bar, columns, rows):
+        if bar:
+            return bar["x1"], bar["y1"], bar["x2"], bar["y2"]
+        # to the right of the grid, as tall as the grid; for six tables this is the original bar
+        x1 = GRID_ORIGIN[0] + columns * GRID_SPACING[0] + 100
+        y2 = max(600, GRID_ORIGIN[1] + rows * GRID_SPACING[1])
+        return x1, 100, x1 + BAR_WIDTH, y2
+
+    def _add(self, table_id, center):
+        x, y = center
+        rect = (x - TABLE_WIDTH / 2, y - TABLE_HEIGHT / 2, x + TABLE_WIDTH / 2, y + TABLE_HEIGHT / 2)
+        self.rects[table_id] = rect
+        for cell in self._cells_of(rect):
+            self.cells.setdefault(cell, []).append(table_id)
+
+    @staticmethod
+    def _cells_of(rect):
+        x1, y1, x2, y2 = rect
+        for column in range(int(x1 // CELL_SIZE), int(x2 // CELL_SIZE) + 1):
+            for row in range(int(y1 // CELL_SIZE), int(y2 // CELL_SIZE) + 1):
+                yield column, row
+
+    def center(self, table_id):
+        x1, y1, x2, y2 = self.rects[table_id]
+        return (x1 + x2) / 2, (y1 + y2) / 2
+
+    def hit_test(self, x, y):
+        #The table under the point, only the tables in that one cell are checked
+        for table_id in self.cells.get((int(x // CELL_SIZE), int(y // CELL_SIZE)), ()):
+            x1, y1, x2, y2 = self.rects[table_id]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                return table_id
+        return None
+
+    def bounds(self):
+        #Area covering all tables and the bar, for the canvas scroll region
+        rects = list(self.rects.values()) + [self.bar]
+        return (min(r[0] for r in rects) - 50, min(r[1] for r in rects) - 50,
+                max(r[2] for r in rects) + 50, max(r[3] for r in rects) + 50)
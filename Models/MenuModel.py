@@ -1,23 +1,40 @@
 #For food or beverage object id, name, price, stock, image(?) etc.
 #Robert
 
-import json
+import atexit
 import os
+import threading
+
+from Models.MenuSearch import MenuSearchIndex, load_catalog_texts
+from Models.Money import parse_price, to_major
+from Models.Repository import create_repository
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MENU_FILE = os.path.join(BASE_DIR, "Database", "MenuDB.json")
+STOCK_FLUSH_DELAY = 0.5  # seconds without stock changes before dirty items are written
 
-MENU_FILE = "database/MenuDB.json"
 
 class MenuItem:
-    
+    #__slots__ keeps each item free of a per-instance __dict__
+    __slots__ = ("id", "name", "price", "price_minor", "currency", "stock", "description", "is_vip", "category",
+                 "image")
+
     def __init__(self, name, price, stock, description, is_vip, category, image="", item_id=None):
         self.id = item_id  # keep existing ID from database
         self.name = name # do a dictionary for the db
-        self.price = price
+        self.price = price  # display string as stored, e.g. "60 SEK"
+        self.price_minor, self.currency = parse_price(price)  # parsed once: 6000, "SEK"
         self.stock = stock
         self.description = description
         self.is_vip = is_vip
         self.category = category  #Food, Wine, Cocktail etc.
         self.image = image  
 
+    @property
+    def unit_price(self):
+        #Price in major units for orders: an int for whole amounts, a float otherwise
+        return to_major(self.price_minor)
+
     def to_dict(self):
         #Convert object to dictionary for JSON storage
         return {
@@ -49,47 +66,170 @@ class MenuItem:
 class MenuModel:
     #Handles loading menu items and updating stock
 
-    def __init__(self):
+    def __init__(self, flush_delay=STOCK_FLUSH_DELAY):
         self.menu = []
+        self._unreadable = []  # stored rows that could not be loaded, kept so save_menu does not drop them
+        self.version = 0  # bumped whenever items are added, removed or reloaded, views key their caches on it
+        self.repository = create_repository("menu", MENU_FILE)
+        #Write-behind state: ids with unsaved stock changes, written together after flush_delay
+        self.flush_delay = flush_delay
+        self._dirty = set()
+        self._flush_timer = None
+        self._lock = threading.RLock()
+        #Lookup indexes, rebuilt whenever the item list changes
+        self._by_id = {}
+        self._by_name = {}
+        self._by_category = {}
+        self._by_category_vip = {}
+        self._by_vip = {}
+        #Translated names and descriptions only change with the Assets files, so they are read once
+        self._catalog_texts = load_catalog_texts()
+        self._search = MenuSearchIndex(self._catalog_texts)
         self.load_menu()
+        atexit.register(self.flush)
 
     def load_menu(self):
-        #Load menu from a single JSON file
+        #Load menu through the configured storage backend, pending stock changes are written first
+        self.flush()
+        self.menu = []
+        self._unreadable = []
         try:
-            if os.path.exists(MENU_FILE):
-                with open(MENU_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.menu = [MenuItem.from_dict(item) for item in data]
-            else:
-                self.menu = []
-        except (IOError, json.JSONDecodeError) as e:
+            records = self.repository.load_all()
+        except (IOError, ValueError) as e:
             print(f"Error loading menu: {e}")
-            self.menu = []
+            records = []
+        for record in records:
+            #one bad row (e.g. an unknown price format) only skips that item, not the whole menu
+            try:
+                self.menu.append(MenuItem.from_dict(record))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Skipping menu item {record.get('id') if isinstance(record, dict) else record!r}: {e}")
+                self._unreadable.append(record)
+        self._build_indexes()
+        self.version += 1
 
-    def update_stock(self, item_id, new_stock):
-        #Update stock of a specific menu item
+    def _build_indexes(self):
+        #Index by id, exact name, category, (category, is_vip) and is_vip; keys are lowercased once here
+        self._by_id = {}
+        self._by_name = {}
+        self._by_category = {}
+        self._by_category_vip = {}
+        self._by_vip = {}
+        self._search = MenuSearchIndex(self._catalog_texts)
         for item in self.menu:
-            if item.id == item_id:
-                item.stock = new_stock
-                self.save_menu()
+            self._index_item(item)
+
+    def _index_item(self, item):
+        #The indexes hold the MenuItem objects themselves, so stock changes need no re-indexing
+        category = item.category.lower()
+        self._by_id[item.id] = item
+        self._by_name.setdefault(item.name, item)
+        self._by_category.setdefault(category, []).append(item)
+        self._by_category_vip.setdefault((category, item.is_vip.lower()), []).append(item)
+        self._by_vip.setdefault(item.is_vip.lower(), []).append(item)
+        self._search.add(item)
+
+    def _unindex_item(self, item):
+        category = item.category.lower()
+        self._by_id.pop(item.id, None)
+        if self._by_name.get(item.name) is item:
+            del self._by_name[item.name]
+            #another item with the same name takes over the exact-name lookup
+            other = next((other for other in self.menu if other.name == item.name), None)
+            if other:
+                self._by_name[item.name] = other
+        self._by_category[category].remove(item)
+        self._by_category_vip[(category, item.is_vip.lower())].remove(item)
+        self._by_vip[item.is_vip.lower()].remove(item)
+        self._search.remove(item.id)
+
+    def add_item(self, item):
+        #Add a new item to the menu and its indexes and store it
+        with self._lock:
+            self.menu.append(item)
+            self._index_item(item)
+            self.version += 1
+            self.repository.save(item.to_dict())
+
+    def remove_item(self, item_id):
+        #Remove an item from the menu, its indexes and storage
+        with self._lock:
+            item = self._by_id.get(item_id)
+            if item is None:
+                return False
+            self.menu.remove(item)
+            self._unindex_item(item)
+            self.version += 1
+            self._dirty.discard(item_id)
+            self.repository.delete(item_id)
+            return True
+
+    def update_stock(self, item_id, new_stock):
+        #Update stock of a specific menu item in memory, the write is deferred and coalesced
+        item = self._by_id.get(item_id)
+        if item is None:
+            return False
+        with self._lock:
+            item.stock = new_stock
+            self._dirty.add(item_id)
+            self._schedule_flush()
+        return True
+
+    def _schedule_flush(self):
+        #Debounce: every change restarts the timer, so a burst of changes ends in one write
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush(self):
+        #Write all dirty items in one batch; called by the timer, explicitly, or at shutdown
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
                 return True
-        return False
+            records = [self._by_id[item_id].to_dict() for item_id in self._dirty if item_id in self._by_id]
+            try:
+                self.repository.save_many(records)
+            except (IOError, ValueError) as e:
+                #keep the items dirty so the next flush tries again
+                print(f"Error saving menu: {e}")
+                return False
+            self._dirty.clear()
+            return True
 
     def save_menu(self):
-        #Save updated stock values back to the JSON file
-        with open(MENU_FILE, "w", encoding="utf-8") as f:
-            json.dump([item.to_dict() for item in self.menu], f, indent=4)
+        #Save all menu items back to storage, this includes any pending stock changes
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self.repository.replace_all([item.to_dict() for item in self.menu] + self._unreadable)
+            self._dirty.clear()
+            #callers may have edited self.menu directly
+            self._build_indexes()
+            self.version += 1
 
-    def get_items_by_category(self, category, is_vip):
-        #Retrieve all items in a specific category
-        return [item for item in self.menu if (item.category.lower() == category.lower() and item.is_vip.lower() == is_vip.lower())]
+    def get_items_by_category(self, category, is_vip=None):
+        #Retrieve all items in a specific category, optionally only VIP or non-VIP ones
+        if is_vip is None:
+            return list(self._by_category.get(category.lower(), ()))
+        return list(self._by_category_vip.get((category.lower(), is_vip.lower()), ()))
 
     def get_item_by_id(self, item_id):
         #Retrieve a single item by its ID
-        return next((item for item in self.menu if item.id == item_id), None)
+        return self._by_id.get(item_id)
+
+    def get_item_by_exact_name(self, name):
+        #Retrieve the item with exactly this (untranslated) name
+        return self._by_name.get(name)
     
-    def get_item_by_name(self, name):
-        return [item for item in self.menu if name.lower() in item.name.lower()]
+    def get_item_by_name(self, name, limit=None):
+        #Ranked substring search over names, translated names and descriptions
+        return self._search.search(name, limit)
 
     def get_vip_items(self):
-        return [item for item in self.menu if item.is_vip.lower() == "yes"]
\ No newline at end of file
+        return list(self._by_vip.get("yes", ()))
\ No newline at end of file
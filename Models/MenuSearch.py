@@ -0,0 +1,136 @@
+#Search index for menu items
+#Names (English and the translated names in Assets/*Translation.json) and descriptions are split into
+#1-3 character grams once; a search only verifies the items that share all grams of the query
+
+import glob
+import os
+
+from Models.TranslationCatalog import load_translations
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(BASE_DIR, "Assets")
+GRAM_SIZE = 3
+
+NAME_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+
+def load_catalog_texts(assets_dir=ASSETS_DIR):
+    #Collect products.names and products.descriptions of every translation file: {id: ([names], [descriptions])}
+    texts = {}
+    for path in sorted(glob.glob(os.path.join(assets_dir, "*Translation.json"))):
+        try:
+            products = load_translations(path).get("products", {})
+        except (IOError, ValueError) as e:
+            print(f"Error loading {path}: {e}")
+            continue
+        for item_id, name in products.get("names", {}).items():
+            texts.setdefault(item_id, ([], []))[0].append(name)
+        for item_id, description in products.get("descriptions", {}).items():
+            texts.setdefault(item_id, ([], []))[1].append(description)
+    return texts
+
+
+def _grams(text):
+    return {text[i:i + n] for n in range(1, GRAM_SIZE + 1) for i in range(len(text) - n + 1)}
+
+
+class MenuSearchIndex:
+    """n-gram index over item names, translated names and (optionally) descriptions"""
+
+    def __init__(self, catalog_texts=None, include_descriptions=True):
+        self.catalog_texts = catalog_texts if catalog_texts is not None else {}
+        self.include_descriptions = include_descriptions
+        self.postings = {}  # gram -> set of item ids
+        self.texts = {}  # item id -> [(lowercased text, weight)]
+        self.items = {}  # item id -> item
+        self.order = {}  # item id -> insertion number, keeps menu order for ties
+        self._counter = 0
+
+    def _texts_of(self, item):
+        names, descriptions = self.catalog_texts.get(str(item.id), ([], []))
+        texts = [(name, NAME_WEIGHT) for name in [item.name] + names]
+        if self.include_descriptions:
+            own = item.description.values() if isinstance(item.description, dict) else [item.description]
+            texts += [(text, DESCRIPTION_WEIGHT) for text in list(own) + descriptions]
+        # the same text in several languages only needs to be indexed once
+        unique = {}
+        for text, weight in texts:
+            if isinstance(text, str) and text:
+                text = text.lower()
+                unique[text] = max(weight, unique.get(text, 0))
+        return list(unique.items())
+
+    def add(self, item):
+        if item.id in self.items:
+            self.remove(item.id)
+        texts = self._texts_of(item)
+        self.items[item.id] = item
+        self.texts[item.id] = texts
+        self.order[item.id] = self._counter
+        self._counter += 1
+        for text, _ in texts:
+            for gram in _grams(text):
+                self.postings.setdefault(gram, set()).add(item.id)
+
+    def remove(self, item_id):
+        if item_id not in self.items:
+            return
+        for text, _ in self.texts.pop(item_id):
+            for gram in _grams(text):
+                ids = self.postings.get(gram)
+                if ids is not None:
+                    ids.discard(item_id)
+                    if not ids:
+                        del self.postings[gram]
+        del self.items[item_id]
+        del self.order[item_id]
+
+    def update(self, item):
+        self.add(item)
+
+    def _candidates(self, query):
+        if len(query) <= GRAM_SIZE:
+            return self.postings.get(query, set())
+        # every gram of the query has to occur; start from the rarest one
+        grams = sorted((query[i:i + GRAM_SIZE] for i in range(len(query) - GRAM_SIZE + 1)),
+                       key=lambda gram: len(self.postings.get(gram, ())))
+        candidates = set(self.postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self.postings.get(gram, set())
+        return candidates
+
+    def _score(self, item_id, query):
+        best = None
+        for text, weight in self.texts[item_id]:
+            position = text.find(query)
+            if position < 0:
+                continue
+            if text == query:
+                rank = 3
+            elif position == 0:
+                rank = 2
+            elif not text[position - 1].isalnum():
+                rank = 1  # start of a word
+            else:
+                rank = 0
+            score = (weight, rank, -len(text))
+            if best is None or score > best:
+                best = score
+        return best
+
+    def search(self, query, limit=None):
+        #Items whose texts contain query, best matches first: names before descriptions,
+        #exact before prefix before word start before any substring, shorter texts first
+        query = query.strip().lower()
+        if not query:
+            return sorted(self.items.values(), key=lambda item: self.order[item.id])[:limit]
+        scored = []
+        for item_id in self._candidates(query):
+            score = self._score(item_id, query)
+            if score is not None:
+                scored.append((score, -self.order[item_id], item_id))
+        scored.sort(reverse=True)
+        return [self.items[item_id] for _, _, item_id in scored[:limit]]
@@ -0,0 +1,114 @@
+#Money arithmetic in integer minor units (öre / cents)
+#Prices stay numbers in major units in the JSON files ("price": 65 or 62.5) and strings like "60 SEK" in the menu;
+#everything that adds, discounts or taxes them converts to int minor units once, so sums are exact and rounding
+#(half up, to the minor unit) happens in exactly one place
+
+import re
+from decimal import Decimal, ROUND_HALF_UP
+
+MINOR_PER_MAJOR = 100
+DEFAULT_CURRENCY = "SEK"
+
+# "SEK 60", "60 SEK", and the Swedish shorthands "60 kr" / "60:-"
+_PRICE_PATTERN = re.compile(r"^\s*([A-Za-z]{3})?\s*(-?\d+(?:[.,]\d+)?)\s*(?:([A-Za-z]{3})|(kr\.?|:-))?\s*$",
+                            re.IGNORECASE)
+_SHORTHAND_CURRENCY = "SEK"
+_ONE = Decimal(1)
+RATE_QUANTUM = Decimal("0.0001")  # rates are kept to 0.01 %, so 0.1 from a float entry is exactly 0.1000
+
+
+def _round(value):
+    return int(value.quantize(_ONE, rounding=ROUND_HALF_UP))
+
+
+def to_minor(value):
+    """Amount in major units (int, float, Decimal or numeric string) as int minor units."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value * MINOR_PER_MAJOR
+    # str() first so a float like 0.1 is taken as written, not as its binary expansion
+    return _round(Decimal(str(value)) * MINOR_PER_MAJOR)
+
+
+def to_major(minor):
+    """Minor units back to the number stored in the files: an int for whole amounts, else a float."""
+    if minor % MINOR_PER_MAJOR == 0:
+        return minor // MINOR_PER_MAJOR
+    return float(Decimal(minor) / MINOR_PER_MAJOR)
+
+
+def format_amount(minor):
+    """Minor units as text with two decimals, e.g. 6250 -> "62.50"."""
+    sign = "-" if minor < 0 else ""
+    major, cents = divmod(abs(minor), MINOR_PER_MAJOR)
+    return f"{sign}{major}.{cents:02d}"
+
+
+def parse_price(price, default_currency=DEFAULT_CURRENCY):
+    """Parse a menu price such as "60 SEK", "62.50 SEK", "SEK 60", "60 kr", "60:-" or 60 into (minor, currency)."""
+    if isinstance(price, (int, float)) and not isinstance(price, bool):
+        return to_minor(price), default_currency
+    match = _PRICE_PATTERN.match(str(price))
+    if not match:
+        raise ValueError(f"Invalid price: {price!r}")
+    if match.group(4):
+        return to_minor(match.group(2).replace(",", ".")), _SHORTHAND_CURRENCY
+    currency = (match.group(1) or match.group(3) or default_currency).upper()
+    return to_minor(match.group(2).replace(",", ".")), currency
+
+
+def to_rate(rate):
+    """A fraction rate (float, Decimal or string) as a Decimal rounded half up to RATE_QUANTUM."""
+    return Decimal(str(rate)).quantize(RATE_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+def discounted(minor, rate):
+    """Price after taking off a fraction rate (0.2 = 20 %), rounded half up to the minor unit."""
+    return _round(Decimal(minor) * (_ONE - to_rate(rate)))
+
+
+def tax_of(minor, rate):
+    """Tax at a fraction rate on an amount, rounded half up to the minor unit."""
+    return _round(Decimal(minor) * to_rate(rate))
+
+
+# Batch versions: one conversion per line and plain int arithmetic, so a long tab costs a single pass.
+# A rate becomes one exact integer fraction, so the same formula also runs on whole NumPy columns (OrderBatch)
+
+def rate_ratio(rate):
+    """A rate as an exact integer fraction, 0.15 -> (3, 20); at most 10000 as denominator (RATE_QUANTUM)."""
+    return to_rate(rate).as_integer_ratio()
+
+
+def keep_ratio(rate):
+    """The part kept after a discount, 1 - rate, as an exact integer fraction, 0.15 -> (17, 20)."""
+    return (_ONE - to_rate(rate)).as_integer_ratio()
+
+
+def scale_half_up(minor, numerator, denominator):
+    """minor * numerator / denominator rounded half up (away from zero), integers only."""
+    product = minor * numerator
+    result = (abs(product) * 2 + denominator) // (2 * denominator)
+    return -result if product < 0 else result
+
+
+def line_totals(prices, amounts):
+    """price * amount per line, prices in major units, result in minor units."""
+    return [to_minor(price) * amount for price, amount in zip(prices, amounts)]
+
+
+def items_total(items, unpaid_only=False):
+    """Sum of price * amount over order item dicts, in minor units."""
+    return sum(to_minor(item["price"]) * item["amount"] for item in items
+               if not (unpaid_only and item.get("is_paid", False)))
+
+
+def apply_discount(minors, rate):
+    """discounted() for many amounts in minor units."""
+    numerator, denominator = keep_ratio(rate)
+    return [scale_half_up(minor, numerator, denominator) for minor in minors]
+
+
+def apply_tax(minors, rate):
+    """tax_of() for many amounts in minor units."""
+    numerator, denominator = rate_ratio(rate)
+    return [scale_half_up(minor, numerator, denominator) for minor in minors]
@@ -0,0 +1,136 @@
+#Bulk discount and checkout over the line items of many orders at once
+#The "breakdown" lines of all orders are flattened into columns (order, price in minor units, amount, paid,
+#product id) and the rule is applied to whole columns: with NumPy as array operations, without it as one plain
+#pass over the same columns (Money.apply_discount). Both paths use the same integer arithmetic, so they give
+#identical results, and both match Money.discounted() for a single line
+
+from Models.Money import apply_discount, keep_ratio, to_major, to_minor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python path does the same work
+    np = None
+
+
+def _as_id_set(product_ids):
+    return None if product_ids is None else {str(product_id) for product_id in product_ids}
+
+
+class OrderColumns:
+    """The line items of a list of orders as parallel columns; the items themselves are updated in place"""
+
+    def __init__(self, orders, lines_field="breakdown"):
+        self.orders = list(orders)
+        self.items = []  # the line dicts, in column order
+        order_index, base_prices, prices, amounts, paid, product_ids = [], [], [], [], [], []
+        minor_of = {}  # a service has few distinct prices, each is converted once
+        for i, order in enumerate(self.orders):
+            for item in order.get(lines_field, []):
+                price = item["price"]
+                base = item.get("original_price", price)
+                for value in (price, base):
+                    if value not in minor_of:
+                        minor_of[value] = to_minor(value)
+                self.items.append(item)
+                order_index.append(i)
+                base_prices.append(minor_of[base])
+                prices.append(minor_of[price])
+                amounts.append(item.get("amount", 1))
+                paid.append(bool(item.get("is_paid", False)))
+                product_ids.append(str(item["product_id"]))
+
+        self.product_ids = product_ids
+        if np is not None:
+            self.order_index = np.array(order_index, dtype=np.int64)
+            self.base_prices = np.array(base_prices, dtype=np.int64)  # before any discount
+            self.prices = np.array(prices, dtype=np.int64)
+            self.amounts = np.array(amounts, dtype=np.int64)
+            self.paid = np.array(paid, dtype=bool)
+        else:
+            self.order_index = order_index
+            self.base_prices = base_prices
+            self.prices = prices
+            self.amounts = amounts
+            self.paid = paid
+
+    def __len__(self):
+        return len(self.items)
+
+    def select(self, product_ids=None, unpaid_only=False):
+        """Positions of the lines matching the product ids (all lines if None), optionally only unpaid ones."""
+        wanted = _as_id_set(product_ids)
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            if wanted is not None:
+                mask &= np.fromiter((product_id in wanted for product_id in self.product_ids), dtype=bool,
+                                    count=len(self))
+            if unpaid_only:
+                mask &= ~self.paid
+            return np.flatnonzero(mask)
+        return [i for i, product_id in enumerate(self.product_ids)
+                if (wanted is None or product_id in wanted) and not (unpaid_only and self.paid[i])]
+
+    def order_totals(self, positions):
+        """Per-order sum of price * amount over the given lines, in minor units, as {order position: total}."""
+        if np is not None:
+            owners = self.order_index[positions]
+            sums = np.zeros(len(self.orders), dtype=np.int64)
+            np.add.at(sums, owners, self.prices[positions] * self.amounts[positions])
+            return {int(i): int(sums[i]) for i in np.unique(owners)}
+        totals = {}
+        for i in positions:
+            order = self.order_index[i]
+            totals[order] = totals.get(order, 0) + self.prices[i] * self.amounts[i]
+        return totals
+
+
+def discount_orders(orders, discount_rate, product_ids=None):
+    """Applies one discount rate to the matching lines of many orders; returns the orders that changed.
+
+    Like EnhancedOrderController.apply_discount, the discount is taken off the original price, so applying
+    a new rate replaces an earlier discount instead of stacking on it.
+    """
+    columns = OrderColumns(orders)
+    positions = columns.select(product_ids)
+    if len(positions) == 0:
+        return []
+
+    if np is not None:
+        # Money.keep_ratio keeps the denominator at most 10000, so price * numerator stays far inside int64
+        numerator, denominator = keep_ratio(discount_rate)
+        base = columns.base_prices[positions]
+        # the same rounding as Money.scale_half_up, on the whole column
+        product = base * numerator
+        new_prices = np.sign(product) * ((np.abs(product) * 2 + denominator) // (2 * denominator))
+        base, new_prices = base.tolist(), new_prices.tolist()
+    else:
+        base = [columns.base_prices[i] for i in positions]
+        new_prices = apply_discount(base, discount_rate)
+
+    discount_percentage = round(discount_rate * 100, 1)
+    changed = {}
+    for i, original_minor, new_minor in zip(positions, base, new_prices):
+        item = columns.items[i]
+        if "original_price" not in item:
+            item["original_price"] = item["price"]
+        item["price"] = float(to_major(new_minor))
+        item["discount_percentage"] = discount_percentage
+        item["discount_amount"] = float(to_major(original_minor - new_minor))
+        changed[int(columns.order_index[i])] = None
+    return [columns.orders[i] for i in changed]
+
+
+def checkout_orders(orders, product_ids=None):
+    """Marks the matching unpaid lines of many orders as paid.
+
+    Returns {transaction_id: amount paid now, in minor units} for the orders that had something to pay.
+    """
+    columns = OrderColumns(orders)
+    positions = columns.select(product_ids, unpaid_only=True)
+    if len(positions) == 0:
+        return {}
+
+    totals = columns.order_totals(positions)
+    for i in positions:
+        columns.items[i]["is_paid"] = True
+    return {str(columns.orders[order].get("transaction_id", "")): total for order, total in totals.items()}
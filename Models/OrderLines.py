@@ -0,0 +1,144 @@
+#Struct-of-arrays storage for order line items
+#An order keeps its items as a list of dicts ("items" on the customer side, "breakdown" on the bartender side).
+#OrderLines holds the same lines column by column in typed arrays, which is much smaller for long histories;
+#to_dicts() gives the original list of dicts back. PackedOrders shares one OrderLines across many orders
+
+import sys
+from array import array
+
+# bits in the per-line flags column
+_HAS_PRICE = 1
+_INT_PRICE = 2
+_HAS_AMOUNT = 4
+_HAS_PAID = 8
+_HAS_SPECIFICATION = 16
+_HAS_NOTES = 32
+
+_KNOWN_FIELDS = {"product_id", "price", "amount", "is_paid", "specification", "notes"}
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class OrderLines:
+    """Order line items stored as parallel columns instead of one dict per line"""
+
+    __slots__ = ("product_ids", "prices", "amounts", "paid", "specifications", "notes", "flags", "extras")
+
+    def __init__(self):
+        self.product_ids = []  # ids or names, shared objects
+        self.prices = array("d")
+        self.amounts = array("q")
+        self.paid = array("b")
+        self.specifications = []  # repeated texts are interned, so lines share one string
+        self.notes = []
+        self.flags = array("B")  # which keys the original dict had, so the round trip is exact
+        self.extras = {}  # line index -> fields this class has no column for
+
+    @classmethod
+    def from_dicts(cls, items):
+        lines = cls()
+        for item in items:
+            lines.append(item)
+        return lines
+
+    def append(self, item):
+        flags = 0
+        price = item.get("price")
+        if "price" in item:
+            flags |= _HAS_PRICE
+            if isinstance(price, int):
+                flags |= _INT_PRICE
+        if "amount" in item:
+            flags |= _HAS_AMOUNT
+        if "is_paid" in item:
+            flags |= _HAS_PAID
+        if "specification" in item:
+            flags |= _HAS_SPECIFICATION
+        if "notes" in item:
+            flags |= _HAS_NOTES
+
+        extra = {key: value for key, value in item.items() if key not in _KNOWN_FIELDS}
+        if extra:
+            self.extras[len(self.flags)] = extra
+        self.product_ids.append(_intern(item.get("product_id")))
+        self.prices.append(float(price) if price is not None else 0.0)
+        self.amounts.append(int(item.get("amount") or 0))
+        self.paid.append(1 if item.get("is_paid") else 0)
+        self.specifications.append(_intern(item.get("specification")))
+        self.notes.append(_intern(item.get("notes")))
+        self.flags.append(flags)
+
+    def __len__(self):
+        return len(self.flags)
+
+    def line(self, i):
+        #Rebuild the dict of line i with the keys and value types it was stored with
+        flags = self.flags[i]
+        item = {"product_id": self.product_ids[i]}
+        if flags & _HAS_PRICE:
+            item["price"] = int(self.prices[i]) if flags & _INT_PRICE else self.prices[i]
+        if flags & _HAS_AMOUNT:
+            item["amount"] = self.amounts[i]
+        if flags & _HAS_SPECIFICATION:
+            item["specification"] = self.specifications[i]
+        if flags & _HAS_NOTES:
+            item["notes"] = self.notes[i]
+        if flags & _HAS_PAID:
+            item["is_paid"] = bool(self.paid[i])
+        if i in self.extras:
+            item.update(self.extras[i])
+        return item
+
+    def __iter__(self):
+        return (self.line(i) for i in range(len(self)))
+
+    def to_dicts(self):
+        return list(self)
+
+    def total(self, unpaid_only=False):
+        #Sum of price * amount, straight from the columns
+        return sum(price * amount for price, amount, paid in zip(self.prices, self.amounts, self.paid)
+                   if not (unpaid_only and paid))
+
+
+class PackedOrders:
+    """A list of orders whose line items all live in one shared OrderLines
+
+    The columns only pay off when they are long, so a whole order history shares one set of arrays
+    and every order keeps just its header fields and where its lines start.
+    """
+
+    __slots__ = ("lines_field", "headers", "starts", "lines")
+
+    def __init__(self, orders=(), lines_field="breakdown"):
+        self.lines_field = lines_field
+        self.headers = []  # the order dicts without their line items
+        self.starts = array("q")  # index of the first line of every order in self.lines
+        self.lines = OrderLines()
+        for order in orders:
+            self.append(order)
+
+    def append(self, order):
+        header = {key: value for key, value in order.items() if key != self.lines_field}
+        self.headers.append(header)
+        self.starts.append(len(self.lines))
+        for item in order.get(self.lines_field, []):
+            self.lines.append(item)
+
+    def __len__(self):
+        return len(self.headers)
+
+    def order(self, i):
+        #The order as the plain JSON-ready dict it was stored from
+        stop = self.starts[i + 1] if i + 1 < len(self.starts) else len(self.lines)
+        order = dict(self.headers[i])
+        order[self.lines_field] = [self.lines.line(j) for j in range(self.starts[i], stop)]
+        return order
+
+    def __iter__(self):
+        return (self.order(i) for i in range(len(self)))
+
+    def to_dicts(self):
+        return list(self)
@@ -0,0 +1,124 @@
+#Append-only order journal for the bartender side order database
+#OrderDB.json stays the snapshot, every save appends a single JSON line to the journal next to it
+#and the full snapshot is only rewritten when the journal is compacted
+
+import copy
+import json
+import os
+
+from Models.Repository import Repository, atomic_write_json, file_stamp
+
+COMPACT_EVERY = 200  # minimum journal records before the snapshot is rewritten
+
+
+class OrderLog(Repository):
+    """Orders keyed by transaction_id, persisted as snapshot + JSON Lines journal"""
+
+    key_field = "transaction_id"
+
+    def __init__(self, snapshot_path, log_path=None, compact_every=COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path if log_path else snapshot_path + ".log"
+        self.compact_every = compact_every
+        self.orders = {}  # transaction_id -> order, keeps the original file order; callers only ever get copies
+        self.pending = 0  # journal records written since the last snapshot
+        self.load()
+
+    def load(self):
+        """Rebuild the in-memory state: read the snapshot, then replay the journal on top of it."""
+        self.orders = {}
+        self.pending = 0
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, list):
+                raise ValueError(f"Order snapshot {self.snapshot_path} is not a list")
+            for order in data:
+                if isinstance(order, dict) and "transaction_id" in order:
+                    self.orders[str(order["transaction_id"])] = order
+
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # torn last line after a crash, everything before it is still valid
+                        break
+                    self._apply(record)
+                    self.pending += 1
+
+    def _apply(self, record):
+        if record.get("op") == "put":
+            order = record["order"]
+            self.orders[str(order["transaction_id"])] = order
+        elif record.get("op") == "delete":
+            self.orders.pop(str(record["transaction_id"]), None)
+
+    def _append(self, records):
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        for record in records:
+            self._apply(record)
+        self.pending += len(records)
+        # the threshold grows with the snapshot, so compaction stays amortised O(1) per record on bulk writes
+        if self.pending >= max(self.compact_every, len(self.orders) // 2):
+            self.compact()
+
+    def load_all(self):
+        # copies, like the freshly parsed orders of the JSON file: an edit that is never saved changes nothing
+        return copy.deepcopy(list(self.orders.values()))
+
+    def get(self, key):
+        order = self.orders.get(str(key))
+        return copy.deepcopy(order) if order is not None else None
+
+    def save(self, record):
+        """Append one put record for the order; cost does not depend on the size of the history."""
+        self.save_many([record])
+
+    def save_many(self, records):
+        # all records go out in one append and one fsync
+        puts = []
+        for order in records:
+            order["transaction_id"] = str(order["transaction_id"])
+            # the caller keeps its dict, later edits to it must not reach the stored order
+            puts.append({"op": "put", "order": copy.deepcopy(order)})
+        if puts:
+            self._append(puts)
+
+    def delete(self, key):
+        self._append([{"op": "delete", "transaction_id": str(key)}])
+
+    def replace_all(self, records):
+        self.orders = {str(order["transaction_id"]): copy.deepcopy(order) for order in records}
+        self.compact()
+
+    def mtime(self):
+        times = [os.path.getmtime(path) for path in (self.snapshot_path, self.log_path) if os.path.exists(path)]
+        return max(times) if times else None
+
+    def stamp(self):
+        return file_stamp(self.snapshot_path), file_stamp(self.log_path)
+
+    def refresh(self):
+        self.load()
+
+    def checkpoint(self):
+        if self.pending:
+            self.compact()
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and start an empty journal."""
+        atomic_write_json(self.snapshot_path, list(self.orders.values()))
+        # replaying an old journal over the new snapshot is harmless, so truncating last is safe
+        with open(self.log_path, "w", encoding="utf-8"):
+            pass
+        self.pending = 0
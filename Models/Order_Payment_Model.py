@@ -1,11 +1,14 @@
-import json
 import os
 import uuid
 from datetime import datetime
 from enum import Enum
 
-ORDER_FILE = "Database/OrderDB.json"
-PAYMENT_FILE = "../Database/PaymentDB.json"
+from Models.Money import items_total, to_major, to_minor
+from Models.Repository import create_repository
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ORDER_FILE = os.path.join(BASE_DIR, "Database", "OrderDB.json")
+PAYMENT_FILE = os.path.join(BASE_DIR, "Database", "PaymentDB.json")
 #transaction_count = 0 #begin with 0 every day,once an order created, plus 1
 
 class OrderModel:
@@ -15,53 +18,156 @@ class OrderModel:
         self.user_id = user_id
         self.table_id = table_id
         #self.items = [{"product_id": "Burger", "price": 15, "amount": 2, "specification": "can", "note": "cold"},{"product_id": "beef", "price": 25, "amount": 12, "specification": "can", "note": "cold"}] #all items that have ordered
-        self.items= []
+        self._lines = {} # cart: (product_id, specification, notes) -> item, in the order items were added
+        self._by_product = {} # product_id -> keys of its lines
+        self._serial = 0 # makes keys unique for lines that share (product_id, specification, notes) but not price or paid
+        self._subtotal = 0 # running sum of price * amount over all lines, in minor units
+        self._unpaid_subtotal = 0 # the same over lines that are not paid yet
         self.order_info = {} # order_info for this order without detailed items info
         self.transaction_id = str(uuid.uuid4())
-
+        self.repository = create_repository("customer_orders", ORDER_FILE)
+
+    @property
+    def items(self):
+        # all items that have ordered, as the list of dicts the views and the order file use
+        return list(self._lines.values())
+
+    @items.setter
+    def items(self, items):
+        self.clear_order()
+        for item in items:
+            self._insert(dict(item))
+
+    @staticmethod
+    def _key(item):
+        return item["product_id"], item.get("specification"), item.get("notes")
+
+    def _count(self, item, sign):
+        # add (sign=1) or take away (sign=-1) one line from the running totals
+        line_total = to_minor(item["price"]) * item["amount"]
+        self._subtotal += sign * line_total
+        if not item.get("is_paid"):
+            self._unpaid_subtotal += sign * line_total
+
+    def _merge_target(self, item):
+        # an existing line the item can be folded into: same key, same price and both paid or both unpaid
+        for key in self._by_product.get(item["product_id"], ()):
+            line = self._lines[key]
+            if (line is not item and key[:3] == self._key(item) and line["price"] == item["price"]
+                    and bool(line.get("is_paid")) == bool(item.get("is_paid"))):
+                return line
+        return None
+
+    def _free_key(self, item):
+        # the line's own key, or that key plus a serial when a line that could not be merged already has it
+        key = self._key(item)
+        if key in self._lines:
+            self._serial += 1
+            key = key + (self._serial,)
+        return key
+
+    def _grow(self, line, amount):
+        self._count(line, -1)
+        line["amount"] += amount
+        self._count(line, 1)
+
+    def _insert(self, item):
+        target = self._merge_target(item)
+        if target is not None:
+            # same product with the same specification and notes: one line with a larger amount
+            self._grow(target, item["amount"])
+            return target
+        key = self._free_key(item)
+        self._lines[key] = item
+        self._by_product.setdefault(item["product_id"], []).append(key)
+        self._count(item, 1)
+        return item
+
+    def _lines_of(self, product_id):
+        return [self._lines[key] for key in self._by_product.get(product_id, ())]
+
+    def _change(self, item, **fields):
+        # edit one line, keeping the totals and, if specification or notes change, its key up to date
+        keys = self._by_product[item["product_id"]]
+        old_key = next((key for key in keys if self._lines[key] is item), None)
+        if old_key is None:
+            return  # already folded into another line earlier in the same operation
+        self._count(item, -1)
+        item.update(fields)
+        if old_key[:3] == self._key(item):
+            self._count(item, 1)
+            return
+        keys.remove(old_key)
+        target = self._merge_target(item)
+        if target is not None:
+            del self._lines[old_key]
+            self._grow(target, item["amount"])
+            return
+        # rekeying is rare (notes, specification), so rebuilding the dict in place to keep the line order is fine
+        new_key = self._free_key(item)
+        self._lines = {(new_key if key == old_key else key): line for key, line in self._lines.items()}
+        keys.append(new_key)
+        self._count(item, 1)
 
     def add_item(self, product_id, price, amount=1, specification="", notes=""):
-        # add new items
+        # add new items, the same product with the same specification and notes adds to its line
         item = dict(product_id=product_id, price=price, amount=amount, specification=specification, notes=notes)
-        self.items.append(item)
+        self._insert(item)
 
     def minus1_item(self, product_id):
         # amount - 1
-        for item in self.items:
-            if item["product_id"] == product_id:
-                if item["amount"] <= 1:
-                    return False
-                else: item["amount"]-=1
-                return True
+        for item in self._lines_of(product_id):
+            if item["amount"] <= 1:
+                return False
+            else: self._change(item, amount=item["amount"] - 1)
+            return True
+        return False
 
     def plus1_item(self, product_id):
         # amount + 1
-        for item in self.items:
-            if item["product_id"] == product_id:
-                item["amount"] += 1
+        for item in self._lines_of(product_id):
+            self._change(item, amount=item["amount"] + 1)
 
     def update_items(self, product_id, price, amount=1, specification=None, notes=None):
         #refresh data of existed items
-        for item in self.items:
-            if item["product_id"] == product_id:
-                item["price"] = price
-                item["amount"] = amount
-                item["specification"] = specification
-                item["notes"] = notes
+        for item in self._lines_of(product_id):
+            self._change(item, price=price, amount=amount, specification=specification, notes=notes)
 
     def remove_item(self, product_id):
         #delete an item
-        self.items = [item for item in self.items if item["product_id"] != product_id]
+        for key in self._by_product.pop(product_id, ()):
+            self._count(self._lines.pop(key), -1)
 
     def add_notes(self, product_id, notes):
-        for item in self.items:
-            if item["product_id"] == product_id:
-                item["notes"] = notes
+        for item in self._lines_of(product_id):
+            self._change(item, notes=notes)
 
     def pick_spe(self, product_id, spe):
-        for item in self.items:
-            if item["product_id"] == product_id:
-                item["specification"] = spe
+        for item in self._lines_of(product_id):
+            self._change(item, specification=spe)
+
+    def mark_paid(self, product_ids):
+        # mark the unpaid lines of these products (compared as strings) as paid, returns the lines changed
+        wanted = {str(product_id) for product_id in product_ids}
+        paid = []
+        for product_id in list(self._by_product):
+            if str(product_id) not in wanted:
+                continue
+            for item in self._lines_of(product_id):
+                if not item.get("is_paid"):
+                    self._count(item, -1)
+                    item["is_paid"] = True
+                    self._count(item, 1)
+                    paid.append(item)
+        return paid
+
+    def mark_unpaid(self, lines):
+        # undo mark_paid for the lines it returned
+        for item in lines:
+            if item.get("is_paid"):
+                self._count(item, -1)
+                item["is_paid"] = False
+                self._count(item, 1)
 
     def get_order_info(self, transaction_id, user_id, table_id, total_price, transaction_time, items):
         self.order_info = {
@@ -74,10 +180,11 @@ class OrderModel:
         }
 
     def total_price(self):
-        total_price = 0
-        for item in self.items:
-            total_price += item["price"] * item["amount"]
-        return total_price
+        # kept up to date by every cart operation, exact because it is summed in minor units
+        return to_major(self._subtotal)
+
+    def unpaid_total(self):
+        return to_major(self._unpaid_subtotal)
 
     def checkout_info(self):
         transaction_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -86,28 +193,23 @@ class OrderModel:
         return self.order_info
 
     def read_order(self):
-        #read exsited orders from db
-        if os.path.exists(ORDER_FILE):
-            with open(ORDER_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                transaction_id = data["transaction_id"]
-                user_id = data["user_id"]
-                table_id = data["table_id"]
-                total_price = data["money"]
-                transaction_time = data["transaction_time"]
-                items = data["breakdown"]
-            self.get_order_info(transaction_id, user_id, table_id, total_price, transaction_time, items)
-            return self.order_info
-        else:
+        #read this order back from db
+        data = self.repository.get(self.transaction_id)
+        if data is None:
             return "File not found"
+        self.get_order_info(data["transaction_id"], data["user_id"], data["table_id"], data["money"],
+                            data["transaction_time"], data["breakdown"])
+        return self.order_info
 
     def write_order(self):
         #if an order created, data will be written into OrderDB.json
-            with open(ORDER_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.checkout_info(), f, ensure_ascii=False, indent=4)
+        self.repository.save(self.checkout_info())
 
     def clear_order(self):
-        self.items = []
+        self._lines = {}
+        self._by_product = {}
+        self._subtotal = 0
+        self._unpaid_subtotal = 0
 
 
 #test demos
@@ -139,7 +241,8 @@ class PaymentModel:
         初始化支付模块
         """
         self.order = order_model
-        self.PAYMENT_FILE = "../Database/PaymentDB.json"
+        self.PAYMENT_FILE = PAYMENT_FILE
+        self.repository = create_repository("payments", self.PAYMENT_FILE)
 
         # paid status
         for item in self.order.items:
@@ -147,56 +250,49 @@ class PaymentModel:
                 item["is_paid"] = False
 
     def _save_payment_record(self, payment_data):
-        """save the record to file"""
+        """save the record to storage"""
+        self._save_payment_records([payment_data])
+
+    def _save_payment_records(self, payments):
+        """save several records to storage in one write"""
         try:
-            # read existing record
-            if os.path.exists(self.PAYMENT_FILE):
-                with open(self.PAYMENT_FILE, "r", encoding="utf-8") as f:
-                    all_payments = json.load(f)
-            else:
-                all_payments = []
-
-            # add new record
-            all_payments.append(payment_data)
-
-            # add payment record to file
-            with open(self.PAYMENT_FILE, "w", encoding="utf-8") as f:
-                json.dump(all_payments, f, ensure_ascii=False, indent=4)
+            self.repository.save_many(payments)
         except Exception as e:
             raise IOError(f"fail to save record: {str(e)}")
 
+    @staticmethod
+    def _normalize_ids(selected_ids):
+        # product ids are compared as strings, the view passes strings and the cart may hold ints
+        return {str(product_id) for product_id in selected_ids}
+
+    def _unpaid_lines_by_id(self):
+        # one pass over the cart: str(product_id) -> its unpaid lines
+        lines = {}
+        for item in self.order.items:
+            if not item["is_paid"]:
+                lines.setdefault(str(item["product_id"]), []).append(item)
+        return lines
+
     def _calculate_selected_total(self, selected_ids):
         """calculate the price"""
-        total = 0
-        for item in self.order.items:
-            if item["product_id"] in selected_ids and not item["is_paid"]:
-                total += item["price"] * item["amount"]
-        return total
+        lines = self._unpaid_lines_by_id()
+        selected = [item for product_id in self._normalize_ids(selected_ids) for item in lines.get(product_id, ())]
+        return to_major(items_total(selected))
 
-    def split_payment(self, selected_ids: list, payer_id: str, is_vip: bool, payment_method: str,
-                      amount_paid: float = 0):
-        """
-        payment split
-        :param selected_ids: item has been selected
-        :param payer_id: payer id (not sure if we need)
-        :param is_vip: Vip or not
-        :param payment_method: payment method
-        :param amount_paid: actual payment amount (used when use cash)
-        """
-        # error status
+    def _prepare_payment(self, unpaid_lines, selected_ids, payer_id, is_vip, payment_method, amount_paid=0):
+        # check one split and build its payment record; nothing is changed yet
         if not selected_ids:
             raise ValueError("please select a product")
 
-        # read selected item
-        selected_items = [item for item in self.order.items
-                          if str(item["product_id"]) in selected_ids
-                          and not item["is_paid"]]
+        # read selected item; ids without unpaid lines are dropped, so they are never claimed
+        wanted = {product_id for product_id in self._normalize_ids(selected_ids) if product_id in unpaid_lines}
+        selected_items = [item for product_id in wanted for item in unpaid_lines[product_id]]
 
         if not selected_items:
             raise ValueError("no item can be paid")
 
         # calculate the price
-        total_due = self._calculate_selected_total(selected_ids)
+        total_due = to_major(items_total(selected_items))
 
         # VIP payment
         if is_vip:
@@ -243,19 +339,64 @@ class PaymentModel:
                 } for item in selected_items
             ]
         }
+        return wanted, payment_data
 
-        # move item to paid
-        for item in self.order.items:
-            if str(item["product_id"]) in selected_ids:
-                item["is_paid"] = True
-
-        # refresh the order
-        self.order.write_order()
+    def split_payment(self, selected_ids: list, payer_id: str, is_vip: bool, payment_method: str,
+                      amount_paid: float = 0):
+        """
+        payment split
+        :param selected_ids: item has been selected
+        :param payer_id: payer id (not sure if we need)
+        :param is_vip: Vip or not
+        :param payment_method: payment method
+        :param amount_paid: actual payment amount (used when use cash)
+        """
+        return self.settle_payments([{
+            "selected_ids": selected_ids,
+            "payer_id": payer_id,
+            "is_vip": is_vip,
+            "payment_method": payment_method,
+            "amount_paid": amount_paid,
+        }])[0]
 
-        # save payment record
-        self._save_payment_record(payment_data)
+    def settle_payments(self, splits):
+        """
+        settle several payers at once, all or nothing
+        :param splits: list of dicts with the split_payment arguments
+            (selected_ids, payer_id, is_vip, payment_method, optional amount_paid)
+        :return: the payment records, in the order of splits
+        """
+        # every split is checked before anything is marked paid, so one bad split leaves the order untouched
+        unpaid_lines = self._unpaid_lines_by_id()
+        claimed = set()
+        payments = []
+        for split in splits:
+            wanted, payment_data = self._prepare_payment(
+                unpaid_lines, split.get("selected_ids"), split.get("payer_id"), split.get("is_vip", False),
+                split.get("payment_method"), split.get("amount_paid", 0))
+            if wanted & claimed:
+                raise ValueError("item selected by more than one payer")
+            claimed |= wanted
+            payments.append(payment_data)
+
+        if not payments:
+            return []
+
+        # payments and orders live in two stores, so the batch is one write to each: all payment records
+        # first (if that fails nothing has changed yet), then the order
+        self._save_payment_records(payments)
+
+        # move item to paid and refresh the order
+        try:
+            self.order.mark_paid(claimed)
+            self.order.write_order()
+        except Exception:
+            # undo both: the claimed lines are unpaid again and the records just saved are withdrawn, in one write
+            self.order.mark_unpaid(line for product_id in claimed for line in unpaid_lines.get(product_id, ()))
+            self.repository.delete_many([payment["payment_id"] for payment in payments])
+            raise
 
-        return payment_data
+        return payments
 
     def _check_vip_balance(self, required: float, vip_id: str = None) -> bool:
         """check account balance"""
@@ -272,8 +413,4 @@ class PaymentModel:
 
     def get_payment_history(self):
         """get the payment record for this payment"""
-        if os.path.exists(self.PAYMENT_FILE):
-            with open(self.PAYMENT_FILE, "r", encoding="utf-8") as f:
-                all_payments = json.load(f)
-            return [p for p in all_payments if p["transaction_id"] == self.order.transaction_id]
-        return []
\ No newline at end of file
+        return self.repository.find("transaction_id", self.order.transaction_id)
@@ -0,0 +1,207 @@
+#Append-only payment ledger
+#Every payment is one JSON line appended to the ledger; a side index maps payment_id, transaction_id
+#and payer_id to byte offsets in the ledger, so a lookup only reads the matching lines.
+#The side index file is a snapshot: the ledger lines after the offset it covers are its journal and are
+#replayed on load, so an append never rewrites the index. A delete appends a tombstone line.
+
+import atexit
+import json
+import os
+
+from Models.Repository import Repository, JsonRepository, file_stamp
+
+INDEX_SAVE_MIN = 50  # minimum appends between two snapshots of the side index
+INDEXED_FIELDS = ("transaction_id", "payer_id")
+DELETED_FIELD = "_deleted"  # marks a tombstone line, the payment it names no longer exists
+
+_ledgers = {}
+
+
+def open_ledger(ledger_path, legacy_path=None):
+    """Return the shared ledger for a path, so all PaymentModels in a process use one index."""
+    ledger_path = os.path.abspath(ledger_path)
+    if ledger_path not in _ledgers:
+        _ledgers[ledger_path] = PaymentLedger(ledger_path, legacy_path)
+    return _ledgers[ledger_path]
+
+
+class PaymentLedger(Repository):
+    """Payments as a JSON Lines ledger plus an offset index persisted next to it"""
+
+    key_field = "payment_id"
+
+    def __init__(self, ledger_path, legacy_path=None):
+        self.ledger_path = ledger_path
+        self.index_path = ledger_path + ".idx"
+        self.by_key = {}  # payment_id -> offset
+        self.by_field = {field: {} for field in INDEXED_FIELDS}  # field -> value -> [offsets]
+        self.entries_at = {}  # offset -> [(field, value)] it is indexed under, to unindex a replaced line
+        self.indexed_size = 0  # ledger bytes covered by the index
+        self.unsaved = 0  # lines indexed since the last snapshot
+
+        # first start: move the payments of the old JSON file into the ledger
+        if not os.path.exists(self.ledger_path) and legacy_path and os.path.exists(legacy_path):
+            records = JsonRepository(legacy_path, self.key_field).load_all()
+            open(self.ledger_path, "wb").close()
+            if records:
+                self.save_many(records)
+
+        self._load_index()
+        self._catch_up()
+        atexit.register(self.save_index)
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return
+        ledger_size = os.path.getsize(self.ledger_path) if os.path.exists(self.ledger_path) else 0
+        # an index for a longer file belongs to a ledger that was replaced, rebuild it
+        if data.get("size", 0) > ledger_size:
+            return
+        self.indexed_size = data["size"]
+        self.by_key = data["by_key"]
+        self.by_field = {field: data["by_field"].get(field, {}) for field in INDEXED_FIELDS}
+        self.entries_at = {}
+        for field, values in self.by_field.items():
+            for value, offsets in values.items():
+                for offset in offsets:
+                    self.entries_at.setdefault(offset, []).append((field, value))
+
+    def save_index(self):
+        """Snapshot the side index; whatever is appended afterwards is replayed by _catch_up."""
+        if not self.unsaved and os.path.exists(self.index_path):
+            return
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"size": self.indexed_size, "by_key": self.by_key, "by_field": self.by_field}, f)
+        os.replace(tmp_path, self.index_path)
+        self.unsaved = 0
+
+    def _catch_up(self):
+        """Index the ledger lines written after the last indexed offset (by us or another process)."""
+        if not os.path.exists(self.ledger_path):
+            return
+        if os.path.getsize(self.ledger_path) <= self.indexed_size:
+            return
+        with open(self.ledger_path, "rb") as f:
+            f.seek(self.indexed_size)
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    # a torn write at the end is ignored until it is complete
+                    break
+                if line.strip():
+                    self._index(json.loads(line), offset)
+                self.indexed_size = f.tell()
+
+    def _index(self, record, offset):
+        key = self.key_of(record)
+        self.unsaved += 1
+        # a payment saved again replaces its earlier line in the index, also under values that changed since
+        old_offset = self.by_key.get(key)
+        if old_offset is not None:
+            self._unindex_offset(old_offset)
+        if record.get(DELETED_FIELD):
+            self.by_key.pop(key, None)
+            return
+        self.by_key[key] = offset
+        entries = []
+        for field in INDEXED_FIELDS:
+            value = record.get(field)
+            if value is None:
+                continue
+            value = str(value)
+            self.by_field[field].setdefault(value, []).append(offset)
+            entries.append((field, value))
+        self.entries_at[offset] = entries
+
+    def _unindex_offset(self, offset):
+        for field, value in self.entries_at.pop(offset, ()):
+            offsets = self.by_field[field].get(value)
+            if offsets and offset in offsets:
+                offsets.remove(offset)
+                if not offsets:
+                    del self.by_field[field][value]
+
+    def _read_at(self, offsets):
+        records = []
+        if not offsets:
+            return records  # also when no payment was ever written and the ledger does not exist
+        with open(self.ledger_path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+
+    def load_all(self):
+        self._catch_up()
+        return self._read_at(self.by_key.values())
+
+    def get(self, key):
+        self._catch_up()
+        offset = self.by_key.get(str(key))
+        return self._read_at([offset])[0] if offset is not None else None
+
+    def find(self, field, value):
+        self._catch_up()
+        if field == self.key_field:
+            record = self.get(value)
+            return [record] if record else []
+        if field not in self.by_field:
+            return super().find(field, value)
+        return self._read_at(self.by_field[field].get(str(value), []))
+
+    def save(self, record):
+        """Append one payment; the cost is one write no matter how many payments exist."""
+        self.save_many([record])
+
+    def save_many(self, records):
+        self._catch_up()
+        lines = [(record, (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")) for record in records]
+        with open(self.ledger_path, "ab") as f:
+            offset = f.tell()
+            for record, line in lines:
+                f.write(line)
+                self._index(record, offset)
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.indexed_size = offset
+        # the snapshot is rewritten once the journal outgrows it, so its cost is amortised O(1) per append
+        if self.unsaved >= max(INDEX_SAVE_MIN, len(self.by_key)):
+            self.save_index()
+
+    def replace_all(self, records):
+        # rewriting history is rare (repairs), so it simply rebuilds the ledger and its index
+        tmp_path = self.ledger_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for record in records:
+                f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        os.replace(tmp_path, self.ledger_path)
+        self.by_key = {}
+        self.by_field = {field: {} for field in INDEXED_FIELDS}
+        self.entries_at = {}
+        self.indexed_size = 0
+        self._catch_up()
+        self.save_index()
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        """Append one tombstone per payment; replace_all(load_all()) compacts them away."""
+        self._catch_up()
+        keys = [str(key) for key in dict.fromkeys(keys) if str(key) in self.by_key]
+        if keys:
+            self.save_many([{self.key_field: key, DELETED_FIELD: True} for key in keys])
+
+    def mtime(self):
+        return os.path.getmtime(self.ledger_path) if os.path.exists(self.ledger_path) else None
+
+    def stamp(self):
+        return file_stamp(self.ledger_path)
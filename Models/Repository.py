@@ -0,0 +1,301 @@
+#Storage backends shared by all models
+#Models read and write plain dict records through a Repository instead of opening their JSON files directly.
+#The backend is picked by configuration: PUB_STORAGE_BACKEND=json (default, the original JSON files)
+#or PUB_STORAGE_BACKEND=sqlite (one SQLite database with indexed lookup columns, PUB_SQLITE_FILE to move it)
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORAGE_BACKEND = os.environ.get("PUB_STORAGE_BACKEND", "json").lower()
+SQLITE_FILE = os.environ.get("PUB_SQLITE_FILE", os.path.join(BASE_DIR, "Database", "PubDB.sqlite3"))
+
+# collection -> (key field, fields with their own index)
+COLLECTIONS = {
+    "menu": ("id", ("category",)),
+    "users": ("id", ("name", "method")),
+    "tables": ("table_id", ()),
+    "orders": ("transaction_id", ("table_id", "user_id")),
+    "customer_orders": ("transaction_id", ("table_id", "user_id")),
+    "payments": ("payment_id", ("transaction_id", "payer_id", "table_id")),
+}
+
+# the customer order file is the hand-off that BarModel merges, so it always stays JSON
+EXPORT_COLLECTIONS = {"customer_orders"}
+
+
+def atomic_write_json(path, data):
+    """Write JSON to a temporary file and swap it in, so a crash never leaves a half written file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _file_mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+def file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Repository:
+    """Interface every storage backend implements; records are dicts identified by key_field"""
+
+    key_field = None
+
+    def key_of(self, record):
+        return str(record[self.key_field])
+
+    def load_all(self):
+        raise NotImplementedError
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def find(self, field, value):
+        """All records whose field equals value (compared as strings, like the ids in the files)."""
+        value = str(value)
+        return [record for record in self.load_all() if str(record.get(field)) == value]
+
+    def save(self, record):
+        """Insert or update one record by its key."""
+        raise NotImplementedError
+
+    def save_many(self, records):
+        for record in records:
+            self.save(record)
+
+    def replace_all(self, records):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.delete(key)
+
+    def mtime(self):
+        """Latest modification time of the backing storage, None if nothing is stored yet."""
+        raise NotImplementedError
+
+    def stamp(self):
+        """Cheap value that changes whenever the stored data changes, used to validate caches."""
+        return self.mtime()
+
+    def refresh(self):
+        """Pick up changes written by someone else; only needed by backends that keep state in memory."""
+
+    def checkpoint(self):
+        """Flush any journal into the main store; a no-op for backends without one."""
+
+
+class JsonRepository(Repository):
+    """The original storage: one JSON file holding a list of records, rewritten on every change"""
+
+    def __init__(self, path, key_field):
+        self.path = path
+        self.key_field = key_field
+
+    def load_all(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # older files hold a single record instead of a list
+        if isinstance(data, dict):
+            return [data]
+        if not isinstance(data, list):
+            raise ValueError(f"{self.path} does not contain a list of records")
+        return data
+
+    def get(self, key):
+        key = str(key)
+        return next((record for record in self.load_all() if self.key_of(record) == key), None)
+
+    def save(self, record):
+        self.save_many([record])
+
+    def save_many(self, records):
+        existing = self.load_all()
+        positions = {self.key_of(record): i for i, record in enumerate(existing)}
+        for record in records:
+            key = self.key_of(record)
+            if key in positions:
+                existing[positions[key]] = record
+            else:
+                positions[key] = len(existing)
+                existing.append(record)
+        self.replace_all(existing)
+
+    def replace_all(self, records):
+        atomic_write_json(self.path, list(records))
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        keys = {str(key) for key in keys}
+        self.replace_all([record for record in self.load_all() if self.key_of(record) not in keys])
+
+    def mtime(self):
+        return _file_mtime(self.path)
+
+    def stamp(self):
+        return file_stamp(self.path)
+
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def _connect(db_path):
+    # one shared connection per database file, guarded by a lock because flushes may run on a timer thread
+    with _connections_lock:
+        if db_path not in _connections:
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            _connections[db_path] = (conn, threading.RLock())
+        return _connections[db_path]
+
+
+class SqliteRepository(Repository):
+    """One table per collection: the key, the record as JSON and an indexed column per lookup field"""
+
+    def __init__(self, db_path, collection, key_field, index_fields=(), seed_path=None):
+        self.db_path = db_path
+        self.table = collection
+        self.key_field = key_field
+        self.index_fields = tuple(index_fields)
+        self.conn, self.lock = _connect(db_path)
+        self._create_table()
+        # first start on SQLite: import what the JSON file already holds
+        if seed_path and self._is_empty():
+            seed = JsonRepository(seed_path, key_field)
+            try:
+                records = seed.load_all()
+            except (IOError, ValueError) as e:
+                print(f"Could not import {seed_path}: {e}")
+                records = []
+            if records:
+                self.save_many(records)
+                # the imported data is as old as the file it came from
+                with self.lock, self.conn:
+                    self._touch(os.path.getmtime(seed_path))
+
+    def _column(self, field):
+        return f"idx_{field}"
+
+    def _create_table(self):
+        columns = "".join(f", {self._column(field)} TEXT" for field in self.index_fields)
+        with self.lock, self.conn:
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" '
+                              f'(key TEXT PRIMARY KEY, data TEXT NOT NULL{columns})')
+            for field in self.index_fields:
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{self.table}_{field}" '
+                                  f'ON "{self.table}" ({self._column(field)})')
+            # all collections share one file, so modification times are kept per collection
+            self.conn.execute('CREATE TABLE IF NOT EXISTS "_modified" (collection TEXT PRIMARY KEY, at REAL)')
+
+    def _touch(self, at=None):
+        self.conn.execute('INSERT INTO "_modified" (collection, at) VALUES (?, ?) '
+                          'ON CONFLICT(collection) DO UPDATE SET at = excluded.at',
+                          (self.table, at if at is not None else time.time()))
+
+    def _is_empty(self):
+        with self.lock:
+            return self.conn.execute(f'SELECT 1 FROM "{self.table}" LIMIT 1').fetchone() is None
+
+    def _row(self, record):
+        values = [self.key_of(record), json.dumps(record, ensure_ascii=False)]
+        for field in self.index_fields:
+            value = record.get(field)
+            values.append(None if value is None else str(value))
+        return values
+
+    def _upsert_sql(self):
+        columns = ["key", "data"] + [self._column(field) for field in self.index_fields]
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        return (f'INSERT INTO "{self.table}" ({", ".join(columns)}) VALUES ({placeholders}) '
+                f'ON CONFLICT(key) DO UPDATE SET {updates}')
+
+    def load_all(self):
+        with self.lock:
+            rows = self.conn.execute(f'SELECT data FROM "{self.table}" ORDER BY rowid').fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute(f'SELECT data FROM "{self.table}" WHERE key = ?', (str(key),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, field, value):
+        if field == self.key_field:
+            record = self.get(value)
+            return [record] if record else []
+        if field not in self.index_fields:
+            return super().find(field, value)
+        with self.lock:
+            rows = self.conn.execute(f'SELECT data FROM "{self.table}" WHERE {self._column(field)} = ? '
+                                     f'ORDER BY rowid', (str(value),)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save(self, record):
+        self.save_many([record])
+
+    def save_many(self, records):
+        rows = [self._row(record) for record in records]
+        with self.lock, self.conn:
+            self.conn.executemany(self._upsert_sql(), rows)
+            self._touch()
+
+    def replace_all(self, records):
+        rows = [self._row(record) for record in records]
+        with self.lock, self.conn:
+            self.conn.execute(f'DELETE FROM "{self.table}"')
+            self.conn.executemany(self._upsert_sql(), rows)
+            self._touch()
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        with self.lock, self.conn:
+            self.conn.executemany(f'DELETE FROM "{self.table}" WHERE key = ?', [(str(key),) for key in keys])
+            self._touch()
+
+    def mtime(self):
+        with self.lock:
+            row = self.conn.execute('SELECT at FROM "_modified" WHERE collection = ?', (self.table,)).fetchone()
+        return row[0] if row else None
+
+
+def create_repository(collection, json_path, backend=None):
+    """Return the repository for a collection using the configured backend."""
+    backend = (backend or STORAGE_BACKEND).lower()
+    key_field, index_fields = COLLECTIONS[collection]
+
+    if collection in EXPORT_COLLECTIONS or backend == "json":
+        if collection == "orders":
+            # the bartender order database keeps its append-only journal
+            from Models.OrderLog import OrderLog
+            return OrderLog(json_path)
+        if collection == "payments":
+            # payments are only ever added, so they go to an append-only ledger next to the old file
+            from Models.PaymentLedger import open_ledger
+            return open_ledger(os.path.splitext(json_path)[0] + ".jsonl", legacy_path=json_path)
+        return JsonRepository(json_path, key_field)
+    if backend == "sqlite":
+        return SqliteRepository(SQLITE_FILE, collection, key_field, index_fields, seed_path=json_path)
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -1,24 +1,30 @@
 #declare table object id, number of seats, order list, status(reserved, free), ( list of products), customer list
 #etc.
-import json
 import os
+from contextlib import contextmanager
+
+from Models.Repository import create_repository
 
 # Hitta alltid rätt mapp oavsett var du startar programmet ifrån
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TABLE_FILE = os.path.join(BASE_DIR, "Database", "TablesDB.json")
 
 class Table:
-    def __init__(self, table_id, number_of_seats, status="free", order_list=None, product_list=None, customer_list=None):
+    __slots__ = ("table_id", "number_of_seats", "status", "order_list", "product_list", "customer_list", "position")
+
+    def __init__(self, table_id, number_of_seats, status="free", order_list=None, product_list=None, customer_list=None,
+                 position=None):
         self.table_id = table_id
         self.number_of_seats = number_of_seats
         self.status = status
         self.order_list = order_list if order_list is not None else []
         self.product_list = product_list if product_list else []
         self.customer_list = customer_list if customer_list else []
+        self.position = position  # optional {"x": .., "y": ..} on the floor plan
 
     def to_dict(self):
         """Returns table data as a dictionary."""
-        return {
+        data = {
             "table_id": self.table_id,
             "number_of_seats": self.number_of_seats,
             "status": self.status,
@@ -26,57 +32,162 @@ class Table:
             "product_list": self.product_list,
             "customer_list": self.customer_list
         }
+        if self.position is not None:
+            data["position"] = self.position
+        return data
+
+    def derived_status(self):
+        """Status that follows from the lists: customers mean VIP, products occupied, nothing free."""
+        if self.customer_list:
+            return "VIP"
+        if self.product_list:
+            return "occupied"
+        return "free"
+
+    @classmethod
+    def from_dict(cls, data):
+        """Creates a Table from a stored dictionary."""
+        return cls(
+            table_id=data["table_id"],
+            number_of_seats=data["number_of_seats"],
+            status=data.get("status", "free"),
+            order_list=data.get("order_list"),
+            product_list=data.get("product_list"),
+            customer_list=data.get("customer_list"),
+            position=data.get("position")
+        )
 
 
 class TableModel:
     def __init__(self, database_path=TABLE_FILE):
         self.database_path = database_path
+        self.repository = create_repository("tables", database_path)
+        self._by_id = {}  # table_id -> Table
+        self._dirty = set()  # ids of tables changed since the last write
+        self._batch_depth = 0
+        self._listeners = []  # callbacks(table_id, old_status, new_status)
+        self._published = {}  # table_id -> status listeners last heard about
         self.tables = self.load_tables()
 
     def load_tables(self):
-        """Loads tables from JSON database file and updates their status."""
+        """Loads tables from the storage backend and updates their status."""
         try:
-            with open(self.database_path, "r") as file:
-                data = json.load(file)
-                tables = []
-                for table_data in data:
-                    table = Table(**table_data)
-
-                    # Set table status based on business logic
-                    if not table.customer_list and not table.product_list:
-                        table.status = "free"
-                    elif table.customer_list:
-                        table.status = "VIP"
-                    elif table.product_list:
-                        table.status = "occupied"
-
-                    tables.append(table)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            data = self.repository.load_all()
+            tables = []
+            for table_data in data:
+                table = Table.from_dict(table_data)
+                # Set table status based on business logic
+                table.status = table.derived_status()
+                tables.append(table)
+        except (IOError, ValueError) as e:
             print("Error loading tables:", e)
-            return []
+            tables = []
 
+        self._by_id = {table.table_id: table for table in tables}
+        self._published = {table.table_id: table.status for table in tables}
+        self._dirty.clear()
         return tables
 
+    def subscribe(self, callback):
+        """Calls callback(table_id, old_status, new_status) whenever a table's status changes."""
+        self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _publish(self, table):
+        old_status = self._published.get(table.table_id)
+        if old_status == table.status:
+            return
+        self._published[table.table_id] = table.status
+        for callback in list(self._listeners):
+            callback(table.table_id, old_status, table.status)
+
+    def refresh_status(self, table_id):
+        """Re-derives one table's status from its lists and saves the table."""
+        table = self._by_id.get(table_id)
+        if table is None:
+            return None
+        table.status = table.derived_status()
+        self.update_table(table)
+        return table.status
+
+    def _change_list(self, table_id, change):
+        # change(table) edits customer_list/product_list in place; the status follows in O(1)
+        table = self._by_id.get(table_id)
+        if table is None:
+            return False
+        if change(table) is False:
+            return False
+        return self.refresh_status(table_id) is not None
+
+    def add_customer(self, table_id, customer_name):
+        return self._change_list(table_id, lambda table: table.customer_list.append(customer_name))
+
+    def remove_customer(self, table_id, customer_name):
+        def change(table):
+            if customer_name not in table.customer_list:
+                return False
+            table.customer_list.remove(customer_name)
+        return self._change_list(table_id, change)
+
+    def add_products(self, table_id, product_ids):
+        return self._change_list(table_id, lambda table: table.product_list.extend(product_ids))
+
+    def remove_product(self, table_id, product_id):
+        def change(table):
+            if product_id not in table.product_list:
+                return False
+            table.product_list.remove(product_id)
+        return self._change_list(table_id, change)
+
     def save_tables(self):
-        """Saves current table data to JSON database file."""
-        with open(self.database_path, "w") as file:
-            json.dump([table.to_dict() for table in self.tables], file, indent=4)
+        """Saves current table data to the storage backend."""
+        self.repository.replace_all([table.to_dict() for table in self.tables])
+        self._dirty.clear()
 
     def get_table_by_id(self, table_id):
         """Returns a table object by its ID."""
-        for table in self.tables:
-            if table.table_id == table_id:
-                return table
-        return None
+        return self._by_id.get(table_id)
 
     def update_table(self, table: Table):
-        """Updates table data."""
-        for i, t in enumerate(self.tables):
-            if t.table_id == table.table_id:
-                self.tables[i] = table
-                self.save_tables()
-                return True
-        return False
+        """Updates table data; it is written now, or when the surrounding batch ends."""
+        current = self._by_id.get(table.table_id)
+        if current is None:
+            return False
+        if current is not table:
+            self.tables[self.tables.index(current)] = table
+            self._by_id[table.table_id] = table
+        self.mark_dirty(table.table_id)
+        self._publish(table)
+        return True
+
+    def mark_dirty(self, table_id):
+        """Records that a table changed; outside a batch this writes it right away."""
+        self._dirty.add(table_id)
+        if self._batch_depth == 0:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Groups changes: every table changed inside is written once, when the outermost batch ends."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self):
+        """Writes all dirty tables in one save."""
+        if not self._dirty:
+            return
+        records = [self._by_id[table_id].to_dict() for table_id in self._dirty if table_id in self._by_id]
+        self.repository.save_many(records)
+        self._dirty.clear()
 
 
 #VIP -> pay at the table, for normal customer
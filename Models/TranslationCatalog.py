@@ -0,0 +1,125 @@
+#Translation catalogs: the Assets/*Translation.json files, loaded once per language
+#A catalog keeps the nested translations, a flat read-only map "a.b.c" -> text and the keys that need formatting.
+#save_compiled() stores all of that with marshal next to the JSON file (EnglishTranslation.catalog); loading
+#maps the compiled file into memory and uses it while the JSON file keeps the mtime and size it was built from,
+#otherwise it parses the JSON and rebuilds the compiled file.
+#Build all compiled catalogs from the repository root: python Models/TranslationCatalog.py
+
+import glob
+import json
+import marshal
+import mmap
+import os
+import sys
+import tempfile
+from types import MappingProxyType
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(BASE_DIR, "Assets")
+COMPILED_SUFFIX = ".catalog"
+FORMAT_VERSION = 1
+# marshal data is only valid for the interpreter that wrote it
+_BUILD_TAG = (FORMAT_VERSION, marshal.version, sys.implementation.cache_tag)
+
+
+def flatten_catalog(translations, prefix=""):
+    #Nested dict -> {"a.b.c": value}; inner nodes are kept (as the sub-dicts), so every path resolves as before
+    flat = {}
+    for key, value in translations.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(flatten_catalog(value, path + "."))
+    return flat
+
+
+def compiled_path(json_path):
+    return os.path.splitext(json_path)[0] + COMPILED_SUFFIX
+
+
+def _source_stamp(json_path):
+    stat = os.stat(json_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class LanguageCatalog:
+    """One loaded language, read-only once built"""
+
+    __slots__ = ("translations", "texts", "templates", "format_cache")
+
+    def __init__(self, translations, texts=None, templates=None):
+        self.translations = translations  # the nested dict as read from the file
+        texts = texts if texts is not None else flatten_catalog(translations)
+        self.texts = MappingProxyType(texts)
+        if templates is None:
+            templates = (key for key, value in texts.items() if isinstance(value, str) and "{" in value)
+        self.templates = frozenset(templates)  # keys whose text has placeholders
+        self.format_cache = {}  # per-language cache of formatted texts
+
+    @classmethod
+    def from_json(cls, json_path):
+        with open(json_path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def load(cls, json_path):
+        #The compiled catalog when it is up to date, else the JSON file (and the compiled file is rebuilt)
+        catalog = cls.from_compiled(json_path)
+        if catalog is None:
+            catalog = cls.from_json(json_path)
+            try:
+                catalog.save_compiled(json_path)
+            except OSError as e:
+                print(f"Could not write compiled catalog for {json_path}: {e}")
+        return catalog
+
+    @classmethod
+    def from_compiled(cls, json_path):
+        #None when the compiled file is missing, unreadable or older than the JSON file
+        path = compiled_path(json_path)
+        try:
+            stamp = _source_stamp(json_path)
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                build_tag, source_stamp, translations, texts, templates = marshal.loads(data)
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+        if build_tag != _BUILD_TAG or source_stamp != stamp:
+            return None
+        return cls(translations, texts, templates)
+
+    def save_compiled(self, json_path):
+        # marshal keeps shared objects shared, so the inner dicts in texts are not stored twice
+        data = marshal.dumps((_BUILD_TAG, _source_stamp(json_path), self.translations, dict(self.texts),
+                              sorted(self.templates)))
+        path = compiled_path(json_path)
+        # a temp file of its own, so the preload thread and another writer never share one
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=COMPILED_SUFFIX + ".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+def load_translations(json_path):
+    #The nested translations of one file, from the compiled catalog when it is up to date
+    return LanguageCatalog.load(json_path).translations
+
+
+def compile_all(assets_dir=ASSETS_DIR):
+    #Compile every Assets/*Translation.json, returns the paths written
+    written = []
+    for json_path in sorted(glob.glob(os.path.join(assets_dir, "*Translation.json"))):
+        LanguageCatalog.from_json(json_path).save_compiled(json_path)
+        written.append(compiled_path(json_path))
+    return written
+
+
+if __name__ == "__main__":
+    for path in compile_all(sys.argv[1] if len(sys.argv) > 1 else ASSETS_DIR):
+        print(f"Compiled {path}")
@@ -3,17 +3,25 @@
 # Functions - login; logout; show_balance; register; type_of_user_ident;
 # Hao
 
-import json
 import os
 import time
-import random
 import re
+from collections import OrderedDict
+
+from Models.Repository import create_repository
 
 USER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Database", "UsersDB.json")
 USER_FILE = os.path.abspath(USER_FILE)
 
+MAX_FAILED_ATTEMPTS = 5
+LOCKOUT_SECONDS = 15 * 60  # failed attempts are forgotten this long after the last one
+LOCKOUT_CAPACITY = 10000  # identifiers tracked at most, the least recently failed are dropped first
+FIRST_USER_ID = 1000  # user ids start here and grow without an upper limit
+
 
 class UserList:
+    __slots__ = ("id", "name", "password", "type_of_user", "balance", "method")  # no per-instance __dict__
+
     def __init__(self, name, password, type_of_user, balance=0.0, method="", user_id=None):
         self.id = user_id  # ID assigned by the system
         self.name = name  # Username, either customized or randomly assigned
@@ -44,58 +52,127 @@ class UserList:
         )
 
 
+class FailedAttempts:
+    # Bounded failed-login counter: entries expire after ttl seconds and the table never holds more than capacity
+
+    def __init__(self, capacity=LOCKOUT_CAPACITY, ttl=LOCKOUT_SECONDS):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.entries = OrderedDict()  # identifier -> (count, time of last failure), oldest first
+
+    def get(self, identifier, default=0):
+        entry = self.entries.get(identifier)
+        if entry is None:
+            return default
+        if time.monotonic() - entry[1] >= self.ttl:
+            del self.entries[identifier]
+            return default
+        return entry[0]
+
+    def __contains__(self, identifier):
+        return self.get(identifier, None) is not None
+
+    def __getitem__(self, identifier):
+        return self.get(identifier)
+
+    def __setitem__(self, identifier, count):
+        if count <= 0:
+            self.entries.pop(identifier, None)
+            return
+        self.entries[identifier] = (count, time.monotonic())
+        self.entries.move_to_end(identifier)
+        # expired entries sit at the front, so the sweep stops at the first live one
+        now = time.monotonic()
+        while self.entries:
+            oldest = next(iter(self.entries.values()))
+            if now - oldest[1] < self.ttl and len(self.entries) <= self.capacity:
+                break
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
 class UserModel:
     def __init__(self):
         self.users = []
+        # login identifier indexes: value -> (position in self.users, user), first user wins like the old scan
+        self._by_id = {}
+        self._by_name = {}
+        self._by_method = {}
+        self._next_id = FIRST_USER_ID  # id allocator, always above every id in use
+        self.repository = create_repository("users", USER_FILE)
         self.load_users()
-        self.failed_attempts = {}  # Track failed password attempts
+        self.failed_attempts = FailedAttempts()  # Track failed password attempts
 
     def load_users(self):
         # print("Loading users from database...")
-        if os.path.exists(USER_FILE):
-            with open(USER_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # print("Loaded data from JSON:", data)  # Print data from JSON file
-                self.users = [UserList.from_dict(user) for user in data]
-                # print("Converted users:", [user.to_dict() for user in self.users])  # Readable output
-        else:
-            print("User database file not found!")
-            self.users = []
+        data = self.repository.load_all()
+        # print("Loaded data from storage:", data)
+        self.users = [UserList.from_dict(user) for user in data]
+        self._build_indexes()
+        if not self.users:
+            print("User database is empty or not found!")
+
+    def _build_indexes(self):
+        self._by_id = {}
+        self._by_name = {}
+        self._by_method = {}
+        self._next_id = FIRST_USER_ID
+        for position, user in enumerate(self.users):
+            self._index_user(position, user)
+
+    def _index_user(self, position, user):
+        self._by_id.setdefault(str(user.id), (position, user))
+        self._by_name.setdefault(user.name, (position, user))
+        self._by_method.setdefault(user.method, (position, user))
+        if isinstance(user.id, int) and user.id >= self._next_id:
+            self._next_id = user.id + 1
+
+    def _allocate_id(self):
+        # O(1): hand out the counter; the index check only matters if ids were added behind our back
+        new_id = self._next_id
+        while str(new_id) in self._by_id:
+            new_id += 1
+        self._next_id = new_id + 1
+        return new_id
+
+    def find_user(self, identifier):
+        # Same result as scanning for the first user whose id, name or method equals identifier
+        hits = [index[identifier] for index in (self._by_id, self._by_name, self._by_method) if identifier in index]
+        return min(hits, key=lambda hit: hit[0])[1] if hits else None
 
     def save_users(self):
         # Update user data to the database
-        with open(USER_FILE, "w", encoding="utf-8") as f:
-            json.dump([user.to_dict() for user in self.users], f, indent=4)
+        self.repository.replace_all([user.to_dict() for user in self.users])
 
     def login(self, identifier, password):
-        if identifier in self.failed_attempts and self.failed_attempts[identifier] >= 5:
+        if self.failed_attempts.get(identifier) >= MAX_FAILED_ATTEMPTS:
             return {"status":"locked"}  # account locked
 
-        for user in self.users:
-            if str(user.id) == identifier or user.name == identifier or user.method == identifier:
-                if user.password == password:
-                    self.failed_attempts[identifier] = 0  # successfully logged in
-                    return {"status":"success", "use_list":user}  # return user list
-                else:
-                    self.failed_attempts[identifier] = self.failed_attempts.get(identifier, 0) + 1
-                    #check is this identifier exist in failed_attempts, if yes add 1, if no set default 0 and add 1
-                    remaining_attempts = 5 - self.failed_attempts[identifier]
-                    if remaining_attempts > 0:
-                        return {"status":"wrong_password", "attempts":remaining_attempts} #return remain attempts
-                    else :
-                        return {"status":"locked"} #account locked
-
-        return {"status":"not_found" } # user not found
+        user = self.find_user(identifier)
+        if user is None:
+            return {"status":"not_found" } # user not found
+
+        if user.password == password:
+            self.failed_attempts[identifier] = 0  # successfully logged in
+            return {"status":"success", "use_list":user}  # return user list
+
+        self.failed_attempts[identifier] = self.failed_attempts.get(identifier, 0) + 1
+        #an expired or unknown identifier starts again from 0
+        remaining_attempts = MAX_FAILED_ATTEMPTS - self.failed_attempts[identifier]
+        if remaining_attempts > 0:
+            return {"status":"wrong_password", "attempts":remaining_attempts} #return remain attempts
+        else :
+            return {"status":"locked"} #account locked
 
     def show_balance(self, user):
         # Show balance - in future versions, different display methods can be used
         print(f"Your balance: {user.balance} ")
 
     def register(self, name, password, type_of_user, method):
-        # Generate a unique user ID
-        new_id = random.randint(1000, 9999)
-        while any(user.id == new_id for user in self.users):
-            new_id = random.randint(1000, 9999)  # Ensure the ID is unique
+        # Generate a unique user ID, one above the highest id in use
+        new_id = self._allocate_id()
 
         # Registration method (email or phone number)
         if not method or not re.fullmatch(r"(\w+@\w+\.\w+|\d{10,15})", method):
@@ -109,7 +186,8 @@ class UserModel:
         # Create a new user
         new_user = UserList(name, password, type_of_user, method=method, user_id=new_id)
         self.users.append(new_user)
-        self.save_users()
+        self._index_user(len(self.users) - 1, new_user)
+        self.repository.save(new_user.to_dict())
 
         print(f"Registration successful! Your user ID is {new_id}")
         return {"status": "success", "new_user": new_user}
@@ -7,6 +7,7 @@ from Controllers.TableController import TableController
 import tkinter as tk
 from tkinter import messagebox, ttk
 from Controllers.TableController import TableController
+from Models.FloorPlan import FloorPlan
 
 
 class BartenderView(tk.Frame):
@@ -34,18 +35,34 @@ class BartenderView(tk.Frame):
         self.canvas_frame = tk.Frame(self.bottom_frame, bg="white")
         self.canvas_frame.pack(expand=True, fill="both")
 
-        # Canvas for drawing tables and bar
+        # Canvas for drawing tables and bar, scrollable for large floor plans
         self.canvas = tk.Canvas(self.canvas_frame, bg="white")
+        y_scroll = tk.Scrollbar(self.canvas_frame, orient="vertical", command=self.canvas.yview)
+        x_scroll = tk.Scrollbar(self.canvas_frame, orient="horizontal", command=self.canvas.xview)
+        self.canvas.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        y_scroll.pack(side="right", fill="y")
+        x_scroll.pack(side="bottom", fill="x")
         self.canvas.pack(expand=True, fill="both")
 
+        # 点击桌子打开详情，通过楼层平面图的空间索引查找 / Clicking a table opens its details, found via the floor plan index
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
+        self.floor_plan = None
+        self.bar_items = None
+
         # 存储状态标签的引用，用于更新翻译 / Store status label references for translation updates
         self.status_labels = []
 
+        # 每张桌子的画布图元 / Canvas items of every table: table_id -> (rectangle, text)
+        self.table_items = {}
+
         # Initialize the interface components
         self.create_legend()
         self.draw_tables()
         self.draw_bar()
 
+        # 只重绘状态变化的桌子 / Only redraw the tables whose status changed
+        self.controller.model.subscribe(self.on_table_status_changed)
+
     def create_legend(self):
         """Creates a legend explaining table status colors."""
         legend = tk.Frame(self.top_frame, bg="#F7F9FC")
@@ -73,47 +90,94 @@ class BartenderView(tk.Frame):
 
     def draw_tables(self):
         """Fetches tables from the controller and visually represents them on the canvas."""
-        self.canvas.delete("all")
         tables = self.controller.model.tables
 
-        # Define positions for each table visually
-        positions = [(150, 120), (350, 120),
-                     (150, 280), (350, 280),
-                     (150, 440), (350, 440)]
+        # Positions come from the floor plan: TablesDB, the layout file or a grid for any number of tables
+        self.floor_plan = FloorPlan(tables)
+
+        # 复用已有的图元，只创建新桌子、删除已移除的桌子 / Reuse existing items, only create new and delete removed tables
+        for table_id in set(self.table_items) - set(self.floor_plan.rects):
+            for item in self.table_items.pop(table_id):
+                self.canvas.delete(item)
+
+        for table in tables:
+            color, label = self.table_appearance(table)
+            x1, y1, x2, y2 = self.floor_plan.rects[table.table_id]
+            x, y = self.floor_plan.center(table.table_id)
+
+            if table.table_id in self.table_items:
+                rect, text = self.table_items[table.table_id]
+                self.canvas.coords(rect, x1, y1, x2, y2)
+                self.canvas.itemconfig(rect, fill=color)
+                self.canvas.coords(text, x, y)
+                self.canvas.itemconfig(text, text=label)
+            else:
+                # Draw table rectangle and status
+                rect = self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, tags=f"table_{table.table_id}")
+                text = self.canvas.create_text(x, y, text=label)
+                self.table_items[table.table_id] = (rect, text)
+
+        self.canvas.configure(scrollregion=self.floor_plan.bounds())
+
+    def on_canvas_click(self, event):
+        """Opens the details of the table under the mouse."""
+        table_id = self.floor_plan.hit_test(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if table_id is not None:
+            self.show_table_orders(self.controller.model.get_table_by_id(table_id))
+
+    def table_appearance(self, table):
+        """Returns the fill color and the label text of a table."""
+        # Select color based on table status
+        color = "#E3F2FD" if table.status == "free" else "#FFD700" if table.status == "VIP" else "#90CAF9"
+
+        # 获取表状态的翻译 / Get translation for table status
+        status_text = table.status
+        if self.translation_controller:
+            status_key = table.status.lower()
+            status_text = self.translation_controller.get_text(f"views.bartender.table_status.{status_key}",
+                                                               default=status_text)
 
-        # Iterate over tables and their positions to draw them
-        for table, position in zip(tables, positions):
-            # Select color based on table status
-            color = "#E3F2FD" if table.status == "free" else "#FFD700" if table.status == "VIP" else "#90CAF9"
+        # 获取"Table"的翻译 / Get translation for "Table"
+        table_text = "Table"
+        if self.translation_controller:
+            table_text = self.translation_controller.get_text("views.bartender.table_text", default=table_text)
 
-            # 获取表状态的翻译 / Get translation for table status
-            status_text = table.status
-            if self.translation_controller:
-                status_key = table.status.lower()
-                status_text = self.translation_controller.get_text(f"views.bartender.table_status.{status_key}",
-                                                                   default=status_text)
+        return color, f"{table_text} {table.table_id}\n{status_text}"
 
-            # 获取"Table"的翻译 / Get translation for "Table"
-            table_text = "Table"
-            if self.translation_controller:
-                table_text = self.translation_controller.get_text("views.bartender.table_text", default=table_text)
+    def on_table_status_changed(self, table_id, old_status, new_status):
+        """Model event: update the existing canvas items of that one table."""
+        items = self.table_items.get(table_id)
+        table = self.controller.model.get_table_by_id(table_id)
+        if not items or table is None:
+            return
+        color, label = self.table_appearance(table)
+        rect, text = items
+        self.canvas.itemconfig(rect, fill=color)
+        self.canvas.itemconfig(text, text=label)
 
-            # Draw table rectangle and status
-            x, y = position
-            rect = self.canvas.create_rectangle(x - 50, y - 30, x + 50, y + 30, fill=color,
-                                                tags=f"table_{table.table_id}")
-            self.canvas.create_text(x, y, text=f"{table_text} {table.table_id}\n{status_text}")
+    def destroy(self):
+        self.controller.model.unsubscribe(self.on_table_status_changed)
+        super().destroy()
 
     def draw_bar(self):
         """Draws a visual representation of the bar area."""
-        self.canvas.create_rectangle(650, 100, 750, 600, fill="#607D8B")
+        x1, y1, x2, y2 = self.floor_plan.bar
 
         # 获取"BAR"的翻译 / Get translation for "BAR"
         bar_text = "BAR"
         if self.translation_controller:
             bar_text = self.translation_controller.get_text("views.bartender.table_status.bar", default=bar_text)
 
-        self.canvas.create_text(700, 350, text=bar_text, fill="white", font=("Arial", 20, "bold"))
+        if self.bar_items is None:
+            rect = self.canvas.create_rectangle(x1, y1, x2, y2, fill="#607D8B")
+            text = self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, text=bar_text, fill="white",
+                                           font=("Arial", 20, "bold"))
+            self.bar_items = (rect, text)
+        else:
+            rect, text = self.bar_items
+            self.canvas.coords(rect, x1, y1, x2, y2)
+            self.canvas.coords(text, (x1 + x2) / 2, (y1 + y2) / 2)
+            self.canvas.itemconfig(text, text=bar_text)
 
     def show_table_orders(self, table):
         """Opens a popup window to display orders and allow status changes for a specific table."""
@@ -191,8 +255,8 @@ class BartenderView(tk.Frame):
                     break
 
         table.status = new_status
+        # 模型会通知 on_table_status_changed 重绘这张桌子 / The model notifies on_table_status_changed for this table
         self.controller.model.update_table(table)
-        self.draw_tables()
         popup.destroy()
 
         # 获取成功消息的翻译 / Get translation for success message
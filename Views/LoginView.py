@@ -13,6 +13,8 @@
 import tkinter as tk
 from tkinter import Toplevel, Label, Entry, Button, StringVar, messagebox
 
+TABLE_CHOICE_ROWS = 8  # rows of table buttons shown before the table choice scrolls
+
 
 class MultiStepForm:
     """Handles shared functionalities for Back, Next, Cancel buttons."""
@@ -429,11 +431,12 @@ class RegisterView:
 class TableChoice:
     """Handles the table selection functionality."""
 
-    def __init__(self, root, login_view, on_finish, translation_controller=None):
+    def __init__(self, root, login_view, on_finish, translation_controller=None, table_model=None):
         self.root = root
         self.login_view = login_view  # Load LoginView to get user_id
         self.on_finish = on_finish  # callback function to get table choice
         self.translation_controller = translation_controller  # 存储翻译控制器 / Store translation controller
+        self.table_model = table_model  # tables to offer; without a model the original tables 1-6
         self.table_choice = None  # Store the selected table
 
     def show(self):
@@ -461,11 +464,38 @@ class TableChoice:
         if self.translation_controller:
             table_text = self.translation_controller.get_text("views.bartender.table_text", default=table_text)
 
-        # Create buttons for tables 1-6
-        for i in range(1, 7):
-            btn = tk.Button(top_window, text=f"{table_text} {i}",
-                            command=lambda table=i: self.on_table_selected(table, top_window))
-            btn.pack(pady=5)
+        # Create a button for every table, in a grid so large venues still fit
+        table_ids = [table.table_id for table in self.table_model.tables] if self.table_model else range(1, 7)
+        columns = 1 if len(table_ids) <= 6 else min(8, (len(table_ids) + 5) // 6)
+
+        # 可滚动的画布，桌子再多也能选到 / Scrollable canvas, so every table can be reached however many there are
+        grid_frame = tk.Frame(top_window)
+        grid_frame.pack(fill="both", expand=True)
+        canvas = tk.Canvas(grid_frame, highlightthickness=0)
+        scrollbar = tk.Scrollbar(grid_frame, orient="vertical", command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        canvas.pack(side="left", fill="both", expand=True)
+
+        button_frame = tk.Frame(canvas)
+        canvas.create_window((0, 0), window=button_frame, anchor="nw")
+        button_frame.bind("<Configure>", lambda e: canvas.config(scrollregion=canvas.bbox("all")))
+        for i, table_id in enumerate(table_ids):
+            btn = tk.Button(button_frame, text=f"{table_text} {table_id}",
+                            command=lambda table=table_id: self.on_table_selected(table, top_window))
+            btn.grid(row=i // columns, column=i % columns, padx=5, pady=5)
+
+        # 画布与网格同宽，高度最多显示 TABLE_CHOICE_ROWS 行 / As wide as the grid, at most TABLE_CHOICE_ROWS rows high
+        button_frame.update_idletasks()
+        row_height = button_frame.winfo_reqheight() / max(1, (len(table_ids) + columns - 1) // columns)
+        canvas.config(width=button_frame.winfo_reqwidth(),
+                      height=min(button_frame.winfo_reqheight(), int(row_height * TABLE_CHOICE_ROWS)))
+        # 鼠标滚轮滚动 / Scroll with the mouse wheel
+        top_window.bind("<MouseWheel>", lambda e: canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+        top_window.bind("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))
+        top_window.bind("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))
+        if columns > 1:
+            top_window.geometry("")  # let the window fit the grid
 
         # Keep the window in the foreground, waiting for user selection
         top_window.grab_set()
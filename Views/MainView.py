@@ -58,7 +58,8 @@ class MainView:
         # menu and order can't show complete view both, I think reason is from their own codes, not outer frame or pack
         # put order frame here
         # 创建订单视图，传递翻译控制器 / Create order view, pass translation controller
-        self.order_frame = OrderViewClass(self.order_area, None, self.translation_controller)
+        self.order_frame = OrderViewClass(self.order_area, None, self.translation_controller,
+                                          menu_model=self.menu_controller.model)
 
         self.user_controller.set_menu_view(self.menu_frame)
 
@@ -69,11 +70,15 @@ class MainView:
         self.menu_frame.product_listbox.bind("<ButtonRelease-1>", self.on_drop)
 
     def on_drag_start(self, event):
-        """ 记录被拖拽的 Listbox 项目文本 / Record the text of the dragged Listbox item """
+        """ 记录被拖拽的 Listbox 项目 / Record the dragged Listbox item """
         try:
-            selected = self.menu_frame.product_listbox.get(
-                self.menu_frame.product_listbox.curselection())  # 获取选中的文本 / Get selected text
-            self.menu_frame.product_listbox.drag_data = {"text": selected}
+            # 鼠标下的行及其产品ID / The row under the pointer and its product id
+            index = self.menu_frame.product_listbox.nearest(event.y)
+            selected = self.menu_frame.product_listbox.get(index)  # 获取选中的文本 / Get selected text
+            product_id = self.menu_frame.product_id_at(index)
+            if product_id is None:
+                return
+            self.menu_frame.product_listbox.drag_data = {"text": selected, "product_id": product_id}
             # print(selected)#pick successfully
             # widget = event.widget
             # x = widget.winfo_x()  # correct initial placement do not modify
@@ -91,8 +96,7 @@ class MainView:
     def on_drop(self, event):
         """ 在 Frame 中放置 Label / Place a Label in the Frame """
         if hasattr(self.menu_frame.product_listbox, "drag_data"):
-            text = self.menu_frame.product_listbox.drag_data["text"]
-            print(text)
+            product_id = self.menu_frame.product_listbox.drag_data["product_id"]
             # label = tk.Label(self.order_frame.order_panel, text=text, bg="lightblue", padx=10, pady=5)
             # label.pack()  # 在鼠标松开的位置放置 Label
             x, y = event.x_root, event.y_root
@@ -104,7 +108,7 @@ class MainView:
             if order_x1 < x < order_x2 and order_y1 < y < order_y2:
                 # check if in target area
                 try:
-                    self.order_frame.add_item_from_menu(text)
+                    self.order_frame.add_product_from_menu(product_id)
                 except AttributeError:
                     # 获取警告消息的翻译 / Get translation for warning message
                     warning_title = "Warning!"
@@ -14,6 +14,12 @@ class MenuView(tk.Frame):
         self.stock_history = []  # 用于存储历史记录
         self.history_position = -1  # 当前位置
 
+        # 产品ID <-> 显示名称的双向索引，每种语言构建一次 / product id <-> display name, built once per language
+        self._names_by_id = {}
+        self._ids_by_name = {}
+        self._names_key = None  # (语言, 菜单版本) / (language, menu version) the index was built for
+        self.row_ids = []  # 列表框每一行的产品ID / product id of every listbox row
+
         self.user_role = self.user_controller.get_current_user_role()
 
         # Left category panel
@@ -193,53 +199,73 @@ class MenuView(tk.Frame):
 
         # Clear the product listbox
         self.product_listbox.delete(0, tk.END)
+        self.row_ids = []
+        names = self.product_names()
 
         # Populate listbox with products and change color if stock < 5
+        role = self.user_controller.get_current_user_role()
         for item in items:
-            index = self.product_listbox.size()
-            if self.user_controller.get_current_user_role() == "bartender":
-                # 获取产品名称的翻译 / Get translation for product name
-                product_name = item.name
-                if self.translation_controller:
-                    product_name = self.translation_controller.get_text(f"products.names.{item.id}", default=item.name)
-                self.product_listbox.insert(tk.END, product_name)
-            elif self.user_controller.get_current_user_role() == "customer":
-                if item.stock >= 5:
-                    # 获取产品名称的翻译 / Get translation for product name
-                    product_name = item.name
-                    if self.translation_controller:
-                        product_name = self.translation_controller.get_text(f"products.names.{item.id}",
-                                                                            default=item.name)
-                    self.product_listbox.insert(tk.END, product_name)
+            if role == "bartender":
+                visible = True
+            elif role == "customer":
+                visible = item.stock >= 5
             else:
-                if item.is_vip == "NO" and item.stock >= 5:
-                    # 获取产品名称的翻译 / Get translation for product name
-                    product_name = item.name
-                    if self.translation_controller:
-                        product_name = self.translation_controller.get_text(f"products.names.{item.id}",
-                                                                            default=item.name)
-                    self.product_listbox.insert(tk.END, product_name)
+                visible = item.is_vip == "NO" and item.stock >= 5
+            if not visible:
+                continue
+
+            # 每行记下产品ID，选择时无需反查名称 / Every row keeps its product id, so selecting needs no name lookup
+            index = self.product_listbox.size()
+            self.product_listbox.insert(tk.END, names.get(item.id, item.name))
+            self.row_ids.append(item.id)
 
             # If stock is low, change text color to red
-            if item.stock < 5 and self.user_controller.get_current_user_role() == "bartender":
+            if item.stock < 5 and role == "bartender":
                 self.product_listbox.itemconfig(index, {'fg': 'red'})
 
-    def on_product_select(self, event):
-        selected_product = self.product_listbox.get(tk.ACTIVE)
+    def product_names(self):
+        """产品ID -> 当前语言的显示名称 / Product id -> display name in the current language"""
+        language = self.translation_controller.get_current_language() if self.translation_controller else None
+        model = self.controller.model
+        menu = model.menu
+        key = (language, model.version)
+        if key != self._names_key:
+            # 切换语言或菜单变化后才重新构建 / Rebuilt only after a language switch or a menu change
+            names = {}
+            for item in menu:
+                # 获取产品名称的翻译 / Get translation for product name
+                names[item.id] = item.name
+                if self.translation_controller:
+                    names[item.id] = self.translation_controller.get_text(f"products.names.{item.id}",
+                                                                          default=item.name)
+            ids = {}
+            for item_id, name in names.items():
+                ids.setdefault(name, item_id)
+            self._names_by_id, self._ids_by_name, self._names_key = names, ids, key
+        return self._names_by_id
+
+    def product_id_for_name(self, display_name):
+        """显示名称 -> 产品ID / Display name -> product id"""
+        self.product_names()
+        return self._ids_by_name.get(display_name)
+
+    def product_id_at(self, index):
+        """列表框某一行的产品ID / Product id of a listbox row"""
+        if 0 <= index < len(self.row_ids):
+            return self.row_ids[index]
+        return None
 
-        # 如果产品名已被翻译，需要找到原始产品 / If product name is translated, need to find the original product
-        product = None
+    def on_product_select(self, event):
+        # 选中行直接给出产品ID，无需按名称查找 / The selected row gives the product id, no lookup by name
+        selection = self.product_listbox.curselection()
+        index = selection[0] if selection else self.product_listbox.index(tk.ACTIVE)
+        product_id = self.product_id_at(index)
 
-        # 首先尝试通过名称精确匹配 / First try exact match by name
-        product = next((item for item in self.controller.model.menu if item.name == selected_product), None)
+        # 行没有ID时按显示名称反查 / Without a row id, look the display name up in the reverse index
+        if product_id is None:
+            product_id = self.product_id_for_name(self.product_listbox.get(index))
 
-        # 如果没找到，可能是翻译后的名称，尝试遍历所有产品 / If not found, it might be a translated name, try all products
-        if not product and self.translation_controller:
-            for item in self.controller.model.menu:
-                translated_name = self.translation_controller.get_text(f"products.names.{item.id}", default=item.name)
-                if translated_name == selected_product:
-                    product = item
-                    break
+        product = self.controller.get_item_by_id(product_id) if product_id is not None else None
 
         if product:
             # 显示产品名称 - 使用原始名称 / Display product name - use original name
@@ -305,7 +331,7 @@ class MenuView(tk.Frame):
             return
 
         new_stock = int(new_stock)
-        product = next((item for item in self.controller.model.menu if item.name == product_name), None)
+        product = self.controller.get_item_by_exact_name(product_name)
 
         if product:
             old_stock = product.stock  # 保存旧库存值
@@ -388,7 +414,7 @@ class MenuView(tk.Frame):
                 self.stock_input.insert(0, str(record["old_stock"]))
 
             # 刷新分类显示
-            product = next((item for item in self.controller.model.menu if item.id == record["product_id"]), None)
+            product = self.controller.get_item_by_id(record["product_id"])
             if product:
                 self.display_category(product.category)
 
@@ -417,7 +443,7 @@ class MenuView(tk.Frame):
                 self.stock_input.insert(0, str(record["new_stock"]))
 
             # 刷新分类显示
-            product = next((item for item in self.controller.model.menu if item.id == record["product_id"]), None)
+            product = self.controller.get_item_by_id(record["product_id"])
             if product:
                 self.display_category(product.category)
 
@@ -497,7 +523,7 @@ class MenuView(tk.Frame):
         if not confirm:
             return
 
-        product = next((item for item in self.controller.model.menu if item.name == product_name), None)
+        product = self.controller.get_item_by_exact_name(product_name)
 
         if product:
             old_stock = product.stock  # 保存旧值用于历史记录
@@ -5,10 +5,11 @@ from tkinter import ttk, simpledialog, messagebox
 
 
 class OrderViewClass:
-    def __init__(self, root, controller, translation_controller=None):
+    def __init__(self, root, controller, translation_controller=None, menu_model=None):
         self.root = root
         self.controller = controller
         self.translation_controller = translation_controller  # 存储翻译控制器 / Store translation controller
+        self.menu_model = menu_model  # 共享已加载的菜单 / Share the already loaded menu for prices
         # self.root.title("Order")  # 设置窗口标题
         # self.root.geometry("560x700")  # 设置窗口大小 对于 Arial 字体，12 号字体的字符宽度大约为 7 像素。总共80个字符宽度
 
@@ -28,23 +29,10 @@ class OrderViewClass:
         self.order_panel = tk.Frame(root, width=560, height=550, bg="white")
         self.order_panel.pack(side="top", fill="both", expand=True)
 
-        # 如果提供了翻译控制器，更新文本 / If translation controller is provided, update texts
-        if self.translation_controller:
-            self.update_translations()
-
     def init_confirm_order(self):
         """创建确认订单面板和按钮"""
-        # 清除现有内容
-        for widget in self.confirm_panel.winfo_children():
-            widget.destroy()
-
-        # 获取"Sum"的翻译
-        sum_text = "Sum: "
-        if self.translation_controller:
-            sum_text = self.translation_controller.get_text("views.order.sum", default=sum_text)
-
         # Sum 标签
-        self.sum_label = tk.Label(self.confirm_panel, text=sum_text + str(self.total_price), font=("Arial", 16),
+        self.sum_label = tk.Label(self.confirm_panel, text="Sum: " + str(self.total_price), font=("Arial", 16),
                                   bg="white")
         self.sum_label.grid(row=0, column=0, padx=10, pady=5)
 
@@ -52,28 +40,31 @@ class OrderViewClass:
         button_frame = tk.Frame(self.confirm_panel, width=560, bg="lightgray")
         button_frame.grid(row=1, column=0, pady=5)
 
-        # 获取按钮文本的翻译
-        place_order_text = "Place the order"
-        table_confirm_text = "Table Confirmation"
-        check_out_text = "Check Out"
-
-        if self.translation_controller:
-            place_order_text = self.translation_controller.get_text("views.order.place_order", default=place_order_text)
-            table_confirm_text = self.translation_controller.get_text("views.order.table_confirmation",
-                                                                      default=table_confirm_text)
-            check_out_text = self.translation_controller.get_text("views.order.check_out", default=check_out_text)
-
         # 创建所有按钮
-        checkout_button = tk.Button(button_frame, text=place_order_text, command=self.place_order, width=20, height=2)
+        checkout_button = tk.Button(button_frame, text="Place the order", command=self.place_order, width=20, height=2)
         checkout_button.grid(row=0, column=0, padx=10)
 
-        temp_button = tk.Button(button_frame, text=table_confirm_text, command=self.temp_button, width=20, height=2)
+        temp_button = tk.Button(button_frame, text="Table Confirmation", command=self.temp_button, width=20, height=2)
         temp_button.grid(row=0, column=1, padx=10)
 
-        self.checkout_button = tk.Button(button_frame, text=check_out_text, command=self.checkout_window, width=20,
+        self.checkout_button = tk.Button(button_frame, text="Check Out", command=self.checkout_window, width=20,
                                          height=2)
         self.checkout_button.grid(row=0, column=2, padx=10)
 
+        # 绑定翻译，切换语言时只更新文本，不再重建按钮
+        # Bound to translation keys, a language switch relabels them instead of recreating the buttons
+        if self.translation_controller:
+            self._bind_sum_label()
+            self.translation_controller.bind(checkout_button, "views.order.place_order", default="Place the order")
+            self.translation_controller.bind(temp_button, "views.order.table_confirmation",
+                                             default="Table Confirmation")
+            self.translation_controller.bind(self.checkout_button, "views.order.check_out", default="Check Out")
+
+    def _bind_sum_label(self):
+        # "Sum: " 的翻译加上当前总价 / the translated "Sum: " followed by the current total
+        self.translation_controller.bind(self.sum_label, "views.order.sum", default="Sum: ",
+                                         transform=lambda text: text + str(self.total_price))
+
     def place_order(self):
         self.controller.place_order()
 
@@ -88,15 +79,11 @@ class OrderViewClass:
         messagebox.showinfo(confirm_title, confirm_message)
 
     def init_title_order(self):
-        # 获取"Order Details"的翻译 / Get translation for "Order Details"
-        order_details_text = "Order Details"
-        if self.translation_controller:
-            order_details_text = self.translation_controller.get_text("views.order.order_details",
-                                                                      default=order_details_text)
-
         # 订单标题 / Order title
-        self.title_label = tk.Label(self.order_title, text=order_details_text, font=("Arial", 16), bg="white")
+        self.title_label = tk.Label(self.order_title, text="Order Details", font=("Arial", 16), bg="white")
         self.title_label.pack(pady=10)
+        if self.translation_controller:
+            self.translation_controller.bind(self.title_label, "views.order.order_details", default="Order Details")
 
     def checkout_window(self):
         # 创建 Toplevel 窗口 / Create Toplevel window
@@ -145,11 +132,10 @@ class OrderViewClass:
         self.total_price = self.controller.order.total_price()
 
         # 获取"Sum"的翻译 / Get translation for "Sum"
-        sum_text = "Sum: "
         if self.translation_controller:
-            sum_text = self.translation_controller.get_text("views.order.sum", default=sum_text)
-
-        self.sum_label.config(text=sum_text + str(self.total_price))
+            self._bind_sum_label()
+        else:
+            self.sum_label.config(text="Sum: " + str(self.total_price))
 
         print(self.order_panel.winfo_geometry())
         # 清空 order_panel / Clear order_panel
@@ -170,15 +156,12 @@ class OrderViewClass:
             label = tk.Label(self.order_panel, text=item["amount"], width=5, height=1, bg="white")
             label.grid(row=i + 1, column=2, sticky="w", padx=5, pady=2)
 
-            # 获取"notes"的翻译 / Get translation for "notes"
-            notes_text = "notes"
-            if self.translation_controller:
-                notes_text = self.translation_controller.get_text("views.order.notes", default=notes_text)
-
             # 创建 notes 按钮 / Create notes button
-            label = tk.Button(self.order_panel, text=notes_text, width=5, height=1, bg="lightblue",
+            label = tk.Button(self.order_panel, text="notes", width=5, height=1, bg="lightblue",
                               command=lambda item=item: self.notes_dialog(item["product_id"], item["notes"]))
             label.grid(row=i + 1, column=4, sticky="w", padx=5, pady=2)
+            if self.translation_controller:
+                self.translation_controller.bind(label, "views.order.notes", default="notes")
 
             # 创建 - 按钮 / Create - button
             button = tk.Button(self.order_panel, text="-", width=5, height=1, bg="lightgray",
@@ -219,7 +202,7 @@ class OrderViewClass:
         # 重要！临时措施，后面这里接入 table，点击 table 确定落座后，创建订单实例
         # Important! Temporary measure, later connect to table, create order instance after confirming table
         from Controllers.OrderController import OrderController
-        self.controller = OrderController(self, 1, 1)
+        self.controller = OrderController(self, 1, 1, menu_model=self.menu_model)
 
         # 获取确认消息的翻译 / Get translation for confirmation message
         notice_title = "Notice!"
@@ -236,18 +219,6 @@ class OrderViewClass:
     def add_item_from_menu(self, product_index):
         self.controller.add_item(product_index)
 
-    def update_translations(self):
-        """更新界面中的所有翻译文本"""
-        if not self.translation_controller:
-            return
-
-        # 重新创建所有按钮，而不是更新文本
-        self.init_confirm_order()
-
-        # 更新订单标题
-        order_details_text = self.translation_controller.get_text("views.order.order_details", default="Order Details")
-        self.title_label.config(text=order_details_text)
-
-        # 刷新订单项
-        if hasattr(self.controller, "order") and self.controller.order:
-            self.update_items()
\ No newline at end of file
+    def add_product_from_menu(self, product_id):
+        """按菜单项ID添加，与显示的语言无关 / Add by menu item id, independent of the display language"""
+        self.controller.add_item_by_id(product_id)
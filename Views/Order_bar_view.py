@@ -4,6 +4,8 @@ import os
 import sys
 from datetime import datetime
 
+from Models.Money import format_amount, items_total
+
 
 # 订单卡片组件 view card set (view part start here)
 class OrderCard(tk.Frame):
@@ -17,46 +19,18 @@ class OrderCard(tk.Frame):
         self.config(relief=tk.RAISED, borderwidth=1, padx=10, pady=10)
         self.bind("<Button-1>", self._on_click)
 
-        # 计算总金额
-        total = 0
-        for item in order["breakdown"]:
-            total += item["price"] * item["amount"]
-
-        # 获取标签文本的翻译 / Get translations for label texts
-        table_text = f"Table: {order['table_id']}"
-        time_text = f"Time: {order['transaction_time']}"
-        status_label_text = "Status: "
-        total_text = f"Total: ¥{total:.2f}"
-
-        if self.translation_controller:
-            # 获取"Table: X"的翻译 / Get translation for "Table: X"
-            table_pattern = self.translation_controller.get_text("views.order_management.table",
-                                                                 default="Table: {table_id}")
-            table_text = table_pattern.format(table_id=order['table_id'])
-
-            # 获取"Time: X"的翻译 / Get translation for "Time: X"
-            time_pattern = self.translation_controller.get_text("views.order_management.time",
-                                                                default="Time: {transaction_time}")
-            time_text = time_pattern.format(transaction_time=order['transaction_time'])
-
-            # 获取"Status: "的翻译 / Get translation for "Status: "
-            status_label_text = self.translation_controller.get_text("views.order_management.status_text",
-                                                                     default="Status: ")
-
-            # 获取"Total: ¥X"的翻译 / Get translation for "Total: ¥X"
-            total_pattern = self.translation_controller.get_text("views.order_management.total",
-                                                                 default="Total: ¥{total}")
-            total_text = total_pattern.format(total=f"{total:.2f}")
+        # 计算总金额（最小货币单位，精确）/ Total in minor units, exact
+        total = items_total(order["breakdown"])
 
         # 卡片标题 - 桌号 / Card title - table number
         title_frame = tk.Frame(self)
         title_frame.pack(fill=tk.X, pady=(0, 5))
 
-        self.table_label = tk.Label(title_frame, text=table_text, font=("Arial", 12, "bold"))
+        self.table_label = tk.Label(title_frame, text=f"Table: {order['table_id']}", font=("Arial", 12, "bold"))
         self.table_label.pack(side=tk.LEFT)
 
         # 订单时间 / Order time
-        self.time_label = tk.Label(self, text=time_text, font=("Arial", 10))
+        self.time_label = tk.Label(self, text=f"Time: {order['transaction_time']}", font=("Arial", 10))
         self.time_label.pack(anchor=tk.W)
 
         # 订单状态 / Order status
@@ -66,73 +40,41 @@ class OrderCard(tk.Frame):
                 is_completed = False
                 break
 
-        # 获取状态文本的翻译 / Get translation for status text
         status_text = "Completed" if is_completed else "In Progress"
-        if self.translation_controller:
-            status_key = "completed" if is_completed else "in_progress"
-            status_text = self.translation_controller.get_text(f"views.order_management.status.{status_key}",
-                                                               default=status_text)
-
         status_color = "#27ae60" if is_completed else "#e74c3c"  # 绿色表示完成，红色表示进行中 / Green for completed, red for in progress
 
         status_frame = tk.Frame(self)
         status_frame.pack(fill=tk.X, pady=5)
 
-        self.status_label_text = tk.Label(status_frame, text=status_label_text, font=("Arial", 10))
+        self.status_label_text = tk.Label(status_frame, text="Status: ", font=("Arial", 10))
         self.status_label_text.pack(side=tk.LEFT)
 
         self.status_label = tk.Label(status_frame, text=status_text, fg=status_color, font=("Arial", 10, "bold"))
         self.status_label.pack(side=tk.LEFT)
 
         # 总价 / Total price
-        self.total_label = tk.Label(self, text=total_text, font=("Arial", 11))
+        self.total_label = tk.Label(self, text=f"Total: ¥{format_amount(total)}", font=("Arial", 11))
         self.total_label.pack(anchor=tk.E)
 
+        # 绑定到翻译键，切换语言时只更新文本，卡片不会重建
+        # Bound to translation keys: a language switch only relabels them, the card is never rebuilt
+        if self.translation_controller:
+            tc = self.translation_controller
+            tc.bind(self.table_label, "views.order_management.table", default="Table: {table_id}",
+                    table_id=order['table_id'])
+            tc.bind(self.time_label, "views.order_management.time", default="Time: {transaction_time}",
+                    transaction_time=order['transaction_time'])
+            tc.bind(self.status_label_text, "views.order_management.status_text", default="Status: ")
+            status_key = "completed" if is_completed else "in_progress"
+            tc.bind(self.status_label, f"views.order_management.status.{status_key}", default=status_text)
+            tc.bind(self.total_label, "views.order_management.total", default="Total: ¥{total}",
+                    total=format_amount(total))
+
     # 处理点击事件 / Handle click event
     def _on_click(self, event):
         if self.on_click:
             self.on_click(self.order["transaction_id"])
 
-    def update_translations(self):
-        """更新卡片中的所有翻译文本 / Update all translated text in the card"""
-        if not self.translation_controller:
-            return
-
-        # 更新桌号标签 / Update table number label
-        table_pattern = self.translation_controller.get_text("views.order_management.table",
-                                                             default="Table: {table_id}")
-        self.table_label.config(text=table_pattern.format(table_id=self.order['table_id']))
-
-        # 更新时间标签 / Update time label
-        time_pattern = self.translation_controller.get_text("views.order_management.time",
-                                                            default="Time: {transaction_time}")
-        self.time_label.config(text=time_pattern.format(transaction_time=self.order['transaction_time']))
-
-        # 更新状态标签文本 / Update status label text
-        status_label_text = self.translation_controller.get_text("views.order_management.status_text",
-                                                                 default="Status: ")
-        self.status_label_text.config(text=status_label_text)
-
-        # 更新状态文本 / Update status text
-        is_completed = True
-        for item in self.order["breakdown"]:
-            if not item.get("is_paid", False):
-                is_completed = False
-                break
-
-        status_key = "completed" if is_completed else "in_progress"
-        status_text = self.translation_controller.get_text(f"views.order_management.status.{status_key}",
-                                                           default="Completed" if is_completed else "In Progress")
-        self.status_label.config(text=status_text)
-
-        # 更新总价标签 / Update total price label
-        total = 0
-        for item in self.order["breakdown"]:
-            total += item["price"] * item["amount"]
-
-        total_pattern = self.translation_controller.get_text("views.order_management.total", default="Total: ¥{total}")
-        self.total_label.config(text=total_pattern.format(total=f"{total:.2f}"))
-
 
 # 订单列表视图 order list view
 class OrderListView(ttk.Frame):
@@ -146,33 +88,29 @@ class OrderListView(ttk.Frame):
 
     # 创建界面组件 / Create UI components
     def create_widgets(self):
-        # 获取按钮文本的翻译 / Get translations for button texts
-        refresh_text = "Refresh"
-        history_text = "History"
-        current_orders_text = "Current Orders"
-
-        if self.translation_controller:
-            refresh_text = self.translation_controller.get_text("views.order_management.refresh", default=refresh_text)
-            history_text = self.translation_controller.get_text("views.order_management.history", default=history_text)
-            current_orders_text = self.translation_controller.get_text("views.order_management.current_orders",
-                                                                       default=current_orders_text)
-
         # 顶部工具栏 / Top toolbar
         toolbar = tk.Frame(self, bg="#f5f6fa")
         toolbar.pack(fill=tk.X, pady=5)
 
-        self.refresh_button = ttk.Button(toolbar, text=refresh_text, command=self.load_orders)
+        self.refresh_button = ttk.Button(toolbar, text="Refresh", command=self.load_orders)
         self.refresh_button.pack(side=tk.LEFT, padx=5)
 
-        self.history_button = ttk.Button(toolbar, text=history_text, command=self.show_history)
+        self.history_button = ttk.Button(toolbar, text="History", command=self.show_history)
         self.history_button.pack(side=tk.LEFT, padx=5)
 
         # 标题 / Title
         title_frame = tk.Frame(self, bg="#f5f6fa")
         title_frame.pack(fill=tk.X, pady=10)
-        self.title_label = tk.Label(title_frame, text=current_orders_text, font=("Arial", 14, "bold"), bg="#f5f6fa")
+        self.title_label = tk.Label(title_frame, text="Current Orders", font=("Arial", 14, "bold"), bg="#f5f6fa")
         self.title_label.pack(pady=5)
 
+        # 绑定按钮和标题的翻译 / Bind the button and title texts
+        if self.translation_controller:
+            self.translation_controller.bind(self.refresh_button, "views.order_management.refresh", default="Refresh")
+            self.translation_controller.bind(self.history_button, "views.order_management.history", default="History")
+            self.translation_controller.bind(self.title_label, "views.order_management.current_orders",
+                                             default="Current Orders")
+
         # 创建滚动区域 / Create scrollable area
         self.canvas = tk.Canvas(self, bg="white")
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
@@ -206,14 +144,12 @@ class OrderListView(ttk.Frame):
         orders = self.controller.get_active_orders()
 
         if not orders:
-            # 获取"No active orders"的翻译 / Get translation for "No active orders"
-            no_orders_text = "No active orders"
-            if self.translation_controller:
-                no_orders_text = self.translation_controller.get_text("views.order_management.no_active_orders",
-                                                                      default=no_orders_text)
-
             # 显示无订单信息 / Display no orders message
-            tk.Label(self.cards_frame, text=no_orders_text, font=("Arial", 12), bg="white").pack(pady=20)
+            no_orders_label = tk.Label(self.cards_frame, text="No active orders", font=("Arial", 12), bg="white")
+            no_orders_label.pack(pady=20)
+            if self.translation_controller:
+                self.translation_controller.bind(no_orders_label, "views.order_management.no_active_orders",
+                                                 default="No active orders")
             return
 
         # 添加订单卡片 / Add order cards
@@ -235,25 +171,6 @@ class OrderListView(ttk.Frame):
     def show_history(self):
         self.main_window.show_history_view()
 
-    def update_translations(self):
-        """更新视图中的所有翻译文本 / Update all translated text in the view"""
-        if not self.translation_controller:
-            return
-
-        # 更新按钮文本 / Update button texts
-        refresh_text = self.translation_controller.get_text("views.order_management.refresh", default="Refresh")
-        history_text = self.translation_controller.get_text("views.order_management.history", default="History")
-        self.refresh_button.config(text=refresh_text)
-        self.history_button.config(text=history_text)
-
-        # 更新标题文本 / Update title text
-        current_orders_text = self.translation_controller.get_text("views.order_management.current_orders",
-                                                                   default="Current Orders")
-        self.title_label.config(text=current_orders_text)
-
-        # 重新加载订单卡片以更新翻译 / Reload order cards to update translations
-        self.load_orders()
-
 
 # 历史订单详情视图 history view
 class HistoryDetailView(ttk.Frame):
@@ -441,16 +358,14 @@ class HistoryDetailView(ttk.Frame):
                 self.create_item_section(cat_name, items)
 
         # 计算总金额 / Calculate total amount
-        total = 0
-        for item in self.order["breakdown"]:
-            total += item["price"] * item["amount"]
+        total = items_total(self.order["breakdown"])
 
         # 更新总金额显示 / Update total amount display
-        total_pattern = "Total: ¥{total:.2f}"
+        total_pattern = "Total: ¥{total}"
         if self.translation_controller:
             total_pattern = self.translation_controller.get_text("views.order_management.total", default=total_pattern)
 
-        self.total_label.config(text=total_pattern.format(total=total))
+        self.total_label.config(text=total_pattern.format(total=format_amount(total)))
 
     # 创建商品分类部分 / Create product category section
     def create_item_section(self, category, items):
@@ -1048,10 +963,7 @@ class OrderDetailView(ttk.Frame):
                 self.create_item_section(cat_name, items)
 
         # 计算总金额
-        total = 0
-        for item in self.order["breakdown"]:
-            if not item.get("is_paid", False):
-                total += item["price"] * item["amount"]
+        total = items_total(self.order["breakdown"], unpaid_only=True)
 
         # 获取支付标签翻译
         to_pay_pattern = "To Pay: ¥{total}"
@@ -1062,7 +974,7 @@ class OrderDetailView(ttk.Frame):
             )
 
         # 更新总金额显示
-        to_pay_text = to_pay_pattern.format(total=f"{total:.2f}")
+        to_pay_text = to_pay_pattern.format(total=format_amount(total))
         self.total_label.config(text=to_pay_text)
 
         # 全部结账
@@ -1208,12 +1120,9 @@ class OrderDetailView(ttk.Frame):
                 if var.get():
                     selected_ids.append(pid)
 
-            total = 0
-            for item in unpaid_items:
-                if str(item["product_id"]) in selected_ids:
-                    total += item["price"] * item["amount"]
+            total = items_total(item for item in unpaid_items if str(item["product_id"]) in selected_ids)
 
-            to_pay_text = to_pay_pattern.format(total=f"{total:.2f}")
+            to_pay_text = to_pay_pattern.format(total=format_amount(total))
             total_label.config(text=to_pay_text)
 
         if not unpaid_items:
@@ -0,0 +1,116 @@
+#Checks for the incremental, watermark-based merge in Models/BarModel.py
+#Run from the repository root: python -m unittest test_bar_model  (or python -m pytest)
+
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+# BarModel logs to database_merge.log in the working directory unless logging is already configured
+logging.getLogger().addHandler(logging.NullHandler())
+
+from Models.BarModel import BarModel
+from Models.Repository import JsonRepository
+
+
+def source_order(transaction_id, *lines):
+    return {"transaction_id": transaction_id, "table_id": 1, "transaction_time": "2025-01-01 18:00:00",
+            "breakdown": [{"product_id": product_id, "price": price, "amount": amount}
+                          for product_id, price, amount in lines]}
+
+
+class BarModelMergeTest(unittest.TestCase):
+
+    def setUp(self):
+        # the product id mapping is written to the working directory
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.source_path = "CustomerOrders.json"
+        self.target_path = "OrderDB.json"
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def write_source(self, orders):
+        with open(self.source_path, "w", encoding="utf-8") as f:
+            json.dump(orders, f)
+        # a new stamp even when the file is rewritten within the same clock tick
+        stat = os.stat(self.source_path)
+        os.utime(self.source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def read_target(self):
+        with open(self.target_path, "r", encoding="utf-8") as f:
+            return {order["transaction_id"]: order for order in json.load(f)}
+
+    def write_target(self, orders):
+        with open(self.target_path, "w", encoding="utf-8") as f:
+            json.dump(list(orders.values()), f)
+
+    def merge_state(self):
+        with open(os.path.splitext(self.target_path)[0] + "_merge_state.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_merging_again_does_not_duplicate(self):
+        self.write_source([source_order("t1", ("A", 60, 1)), source_order("t2", ("B", 40, 2))])
+        model = BarModel(self.source_path, self.target_path)
+        self.assertEqual(sorted(self.read_target()), ["t1", "t2"])
+
+        # same content, new stamp: everything is skipped
+        self.write_source([source_order("t1", ("A", 60, 1)), source_order("t2", ("B", 40, 2))])
+        self.assertTrue(model.merge_database())
+        self.assertEqual(len(self.read_target()), 2)
+
+    def test_unchanged_source_is_not_merged(self):
+        self.write_source([source_order("t1", ("A", 60, 1))])
+        model = BarModel(self.source_path, self.target_path)
+        self.assertFalse(model.auto_merge_database())  # the watermark matches the file
+
+    def test_orders_merged_before_the_watermark_are_skipped(self):
+        self.write_target({"t1": {"transaction_id": "t1", "table_id": "1", "transaction_time": "", "breakdown": []}})
+        self.write_source([source_order("t1", ("A", 60, 1)), source_order("t2", ("B", 40, 1))])
+        BarModel(self.source_path, self.target_path)
+        target = self.read_target()
+        self.assertEqual(target["t1"]["breakdown"], [])  # left alone
+        self.assertEqual(len(target["t2"]["breakdown"]), 1)
+
+    def check_changed_order_keeps_bartender_fields(self, target_repository=None):
+        self.write_source([source_order("t1", ("A", 60, 1), ("B", 40, 2)), source_order("t2", ("C", 30, 1))])
+        model = BarModel(self.source_path, self.target_path, target_repository=target_repository)
+
+        # the bartender pays line A, discounts line B by 50 % and moves the order to another table
+        target = self.read_target()
+        line_a, line_b = target["t1"]["breakdown"]
+        line_a["is_paid"] = True
+        line_b.update(original_price=40.0, price=20.0, discount_percentage=50.0, discount_amount=20.0)
+        target["t1"]["table_id"] = "9"
+        self.write_target(target)
+
+        # the customer side changes B, adds D, drops t2 and adds t3
+        self.write_source([source_order("t1", ("A", 60, 1), ("B", 50, 3), ("D", 10, 1)),
+                           source_order("t3", ("E", 5, 1))])
+        self.assertTrue(model.merge_database())
+
+        target = self.read_target()
+        self.assertEqual(sorted(target), ["t1", "t2", "t3"])
+        self.assertEqual(target["t1"]["table_id"], "9")
+        line_a, line_b, line_d = target["t1"]["breakdown"]
+        self.assertTrue(line_a["is_paid"])
+        self.assertEqual((line_b["amount"], line_b["original_price"], line_b["price"]), (3, 50.0, 25.0))
+        self.assertEqual(line_b["discount_percentage"], 50.0)
+        self.assertEqual((line_d["amount"], line_d["price"], line_d["is_paid"]), (1, 10.0, False))
+
+        # the watermark forgets t2, which is gone from the source
+        self.assertEqual(sorted(self.merge_state()["hashes"]), ["t1", "t3"])
+
+    def test_changed_order_keeps_bartender_fields_in_file(self):
+        self.check_changed_order_keeps_bartender_fields()
+
+    def test_changed_order_keeps_bartender_fields_in_repository(self):
+        self.check_changed_order_keeps_bartender_fields(JsonRepository(self.target_path, "transaction_id"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#Checks for the write-behind stock updates and the lookup indexes in Models/MenuModel.py
+#Run from the repository root: python -m unittest test_menu_model  (or python -m pytest)
+
+import atexit
+import importlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import Models.Repository as repository_module
+from Models.MenuModel import MenuItem, MenuModel
+
+# Models/__init__ exports the MenuModel class under the module's name
+menu_module = importlib.import_module("Models.MenuModel")
+
+
+class MenuModelTest(unittest.TestCase):
+
+    def setUp(self):
+        # a copy of the menu, always through the JSON backend
+        self.tmp = tempfile.TemporaryDirectory()
+        self.menu_path = os.path.join(self.tmp.name, "MenuDB.json")
+        shutil.copy(menu_module.MENU_FILE, self.menu_path)
+        patches = [mock.patch.object(menu_module, "MENU_FILE", self.menu_path),
+                   mock.patch.object(repository_module, "STORAGE_BACKEND", "json")]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self, flush_delay=60):
+        model = MenuModel(flush_delay=flush_delay)
+        atexit.unregister(model.flush)
+        self.addCleanup(model.flush)  # stops a pending timer
+        return model
+
+    def stored_stock(self):
+        with open(self.menu_path, "r", encoding="utf-8") as f:
+            return {item["id"]: item["stock"] for item in json.load(f)}
+
+    def test_stock_updates_are_deferred_and_coalesced(self):
+        model = self.open()
+        writes = []
+        save_many = model.repository.save_many
+
+        def counting_save_many(records):
+            writes.append(len(records))
+            save_many(records)
+
+        model.repository.save_many = counting_save_many
+
+        first, second = model.menu[0], model.menu[1]
+        before = self.stored_stock()
+        for stock in range(10):
+            model.update_stock(first.id, stock)
+        model.update_stock(second.id, 99)
+        self.assertEqual(self.stored_stock(), before)  # nothing written yet
+
+        self.assertTrue(model.flush())
+        self.assertEqual(writes, [2])  # eleven updates of two items, one write
+        stored = self.stored_stock()
+        self.assertEqual((stored[first.id], stored[second.id]), (9, 99))
+
+    def test_timer_flushes_after_the_delay(self):
+        model = self.open(flush_delay=0.05)
+        item = model.menu[0]
+        model.update_stock(item.id, 42)
+        deadline = time.time() + 5
+        while self.stored_stock()[item.id] != 42 and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self.stored_stock()[item.id], 42)
+
+    def test_reload_writes_pending_changes_first(self):
+        model = self.open()
+        item = model.menu[0]
+        model.update_stock(item.id, 7)
+        model.load_menu()
+        self.assertEqual(model.get_item_by_id(item.id).stock, 7)
+
+    def test_indexes_follow_add_and_remove(self):
+        model = self.open()
+        version = model.version
+        item = MenuItem("Test Lager", "55 kr", 12, "", "NO", "Beer", item_id=9999)
+        model.add_item(item)
+        self.assertIs(model.get_item_by_id(9999), item)
+        self.assertEqual(item.price_minor, 5500)
+        self.assertTrue(model.remove_item(9999))
+        self.assertIsNone(model.get_item_by_id(9999))
+        self.assertEqual(model.version, version + 2)
+
+    def test_one_bad_price_skips_only_that_item(self):
+        with open(self.menu_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        records[0]["price"] = "sixty"
+        with open(self.menu_path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+
+        with mock.patch("builtins.print"):
+            model = self.open()
+        self.assertEqual(len(model.menu), len(records) - 1)
+        model.save_menu()
+        self.assertEqual(len(self.stored_stock()), len(records))  # the bad row is written back
+
+
+if __name__ == "__main__":
+    unittest.main()
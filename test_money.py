@@ -0,0 +1,64 @@
+#Checks for the integer minor-unit money helpers in Models/Money.py
+#Run from the repository root: python -m unittest test_money  (or python -m pytest)
+
+import random
+import unittest
+from decimal import Decimal
+
+from Models.Money import (apply_discount, apply_tax, discounted, format_amount, items_total, line_totals,
+                          parse_price, tax_of, to_major, to_minor)
+
+RATES = [0.15, 0.25, 1 / 3, 1 - 0.7, float("12.3") / 100, 0.005, 0.0, 1.0]
+
+
+class MoneyTest(unittest.TestCase):
+
+    def test_to_minor_takes_floats_as_written(self):
+        self.assertEqual(to_minor(0.1), 10)
+        self.assertEqual(to_minor(62.5), 6250)
+        self.assertEqual(to_minor(1.005), 101)  # half up, not the binary 1.00499...
+        self.assertEqual(to_minor(-1.005), -101)
+        self.assertEqual(to_minor(Decimal("19.99")), 1999)
+        self.assertEqual(to_minor("45.50"), 4550)
+        self.assertEqual(to_minor(60), 6000)
+
+    def test_to_major_and_format(self):
+        self.assertEqual(to_major(6000), 60)
+        self.assertIsInstance(to_major(6000), int)
+        self.assertEqual(to_major(6250), 62.5)
+        self.assertEqual(format_amount(6250), "62.50")
+        self.assertEqual(format_amount(-5), "-0.05")
+
+    def test_sums_are_exact(self):
+        items = [{"price": 0.1, "amount": 3}, {"price": 0.2, "amount": 1, "is_paid": True}]
+        self.assertEqual(items_total(items), 50)
+        self.assertEqual(items_total(items, unpaid_only=True), 30)
+        self.assertEqual(line_totals([0.1, 62.5], [3, 2]), [30, 12500])
+
+    def test_discount_and_tax_round_half_up_once(self):
+        self.assertEqual(discounted(1, 0.5), 1)  # 0.5 öre rounds up
+        self.assertEqual(discounted(14500, float("12.3") / 100), 12717)
+        self.assertEqual(discounted(14500, 1 - 0.7), 10150)
+        self.assertEqual(discounted(14500, 1 / 3), 9667)  # the rate is kept to 0.01 %
+        self.assertEqual(tax_of(1000, 0.25), 250)
+        self.assertEqual(tax_of(3, 0.5), 2)
+
+    def test_batch_helpers_match_single_amounts(self):
+        rng = random.Random(7)
+        amounts = [rng.randint(-10 ** 7, 10 ** 7) for _ in range(2000)]
+        for rate in RATES:
+            self.assertEqual(apply_discount(amounts, rate), [discounted(minor, rate) for minor in amounts])
+            self.assertEqual(apply_tax(amounts, rate), [tax_of(minor, rate) for minor in amounts])
+
+    def test_parse_price(self):
+        self.assertEqual(parse_price("60 SEK"), (6000, "SEK"))
+        self.assertEqual(parse_price("EUR 62.50"), (6250, "EUR"))
+        self.assertEqual(parse_price("62,50 kr"), (6250, "SEK"))
+        self.assertEqual(parse_price("60:-"), (6000, "SEK"))
+        self.assertEqual(parse_price(45.5), (4550, "SEK"))
+        with self.assertRaises(ValueError):
+            parse_price("sixty")
+
+
+if __name__ == "__main__":
+    unittest.main()
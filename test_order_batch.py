@@ -0,0 +1,86 @@
+#Checks for the bulk discount and checkout in Models/OrderBatch.py
+#The NumPy and the pure Python path have to give the same orders; the NumPy comparison is skipped without NumPy.
+#Run from the repository root: python -m unittest test_order_batch  (or python -m pytest)
+
+import copy
+import random
+import unittest
+
+from Models import OrderBatch
+from Models.Money import discounted, to_minor
+from Models.OrderBatch import checkout_orders, discount_orders
+
+RATES = [float("12.3") / 100, float("33.3") / 100, 1 - 0.7, 1 / 3, 0.15, 0.005, 1.0]
+
+
+def make_orders(count, seed=1):
+    rng = random.Random(seed)
+    return [{
+        "transaction_id": str(i),
+        "breakdown": [{
+            "product_id": rng.randint(100, 120),
+            "price": rng.choice([32.0, 45.5, 60, 62.5, 98.0, 145.0, 0.05]),
+            "amount": rng.randint(1, 5),
+            "is_paid": rng.random() < 0.2,
+        } for _ in range(4)],
+    } for i in range(count)]
+
+
+def run_with(numpy_module, action, orders):
+    # runs action on a copy of the orders with OrderBatch using numpy_module (None: the pure Python path)
+    orders = copy.deepcopy(orders)
+    saved, OrderBatch.np = OrderBatch.np, numpy_module
+    try:
+        result = action(orders)
+    finally:
+        OrderBatch.np = saved
+    return orders, result
+
+
+class OrderBatchTest(unittest.TestCase):
+
+    def test_discount_matches_single_line_rounding(self):
+        for rate in RATES:
+            orders, _ = run_with(None, lambda orders: discount_orders(orders, rate), make_orders(50))
+            for order in orders:
+                for item in order["breakdown"]:
+                    self.assertEqual(to_minor(item["price"]), discounted(to_minor(item["original_price"]), rate))
+
+    def test_new_discount_replaces_the_old_one(self):
+        orders = make_orders(5)
+        discount_orders(orders, 0.5)
+        discount_orders(orders, 0.1)
+        for item in orders[0]["breakdown"]:
+            self.assertEqual(to_minor(item["price"]), discounted(to_minor(item["original_price"]), 0.1))
+            self.assertEqual(item["discount_percentage"], 10.0)
+
+    def test_discount_only_touches_selected_products(self):
+        orders = make_orders(20)
+        changed = discount_orders(orders, 0.25, product_ids=["101"])
+        for order in orders:
+            for item in order["breakdown"]:
+                self.assertEqual("original_price" in item, item["product_id"] == 101)
+        self.assertEqual(len(changed), sum(any(item["product_id"] == 101 for item in order["breakdown"])
+                                           for order in orders))
+
+    def test_checkout_pays_unpaid_lines(self):
+        orders = make_orders(20)
+        expected = {order["transaction_id"]: sum(to_minor(item["price"]) * item["amount"]
+                                                 for item in order["breakdown"] if not item["is_paid"])
+                    for order in orders}
+        paid = checkout_orders(orders)
+        self.assertEqual(paid, {transaction_id: total for transaction_id, total in expected.items() if total})
+        self.assertTrue(all(item["is_paid"] for order in orders for item in order["breakdown"]))
+        self.assertEqual(checkout_orders(orders), {})
+
+    @unittest.skipIf(OrderBatch.np is None, "NumPy is not installed")
+    def test_numpy_and_pure_python_agree(self):
+        orders = make_orders(300)
+        for rate in RATES:
+            action = lambda orders: discount_orders(orders, rate, product_ids=range(100, 115))
+            self.assertEqual(run_with(OrderBatch.np, action, orders), run_with(None, action, orders), rate)
+        self.assertEqual(run_with(OrderBatch.np, checkout_orders, orders), run_with(None, checkout_orders, orders))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#Checks for the append-only order journal in Models/OrderLog.py
+#Run from the repository root: python -m unittest test_order_log  (or python -m pytest)
+
+import json
+import os
+import tempfile
+import unittest
+
+from Models.OrderLog import OrderLog
+
+
+def make_order(transaction_id, price=60.0, is_paid=False):
+    return {"transaction_id": transaction_id, "table_id": "1", "transaction_time": "2025-01-01 18:00:00",
+            "breakdown": [{"product_id": 101, "price": price, "amount": 1, "is_paid": is_paid}]}
+
+
+class OrderLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.tmp.name, "OrderDB.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_journal(self, log):
+        with open(log.log_path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_save_appends_one_journal_record(self):
+        log = OrderLog(self.snapshot_path)
+        log.save(make_order("1"))
+        log.save(make_order("2"))
+        log.save(make_order("1", price=45.5))
+        self.assertEqual([record["op"] for record in self.read_journal(log)], ["put", "put", "put"])
+        self.assertFalse(os.path.exists(self.snapshot_path))  # nothing is rewritten before compaction
+
+    def test_reopen_replays_snapshot_and_journal(self):
+        log = OrderLog(self.snapshot_path)
+        log.save_many([make_order("1"), make_order("2"), make_order("3")])
+        log.compact()
+        log.save(make_order("2", is_paid=True))
+        log.delete("3")
+
+        reopened = OrderLog(self.snapshot_path)
+        self.assertEqual([order["transaction_id"] for order in reopened.load_all()], ["1", "2"])
+        self.assertTrue(reopened.get("2")["breakdown"][0]["is_paid"])
+        self.assertIsNone(reopened.get("3"))
+
+    def test_torn_last_line_is_ignored(self):
+        log = OrderLog(self.snapshot_path)
+        log.save(make_order("1"))
+        with open(log.log_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "order": {"transaction_id": "2"')  # crash in the middle of a write
+
+        reopened = OrderLog(self.snapshot_path)
+        self.assertEqual([order["transaction_id"] for order in reopened.load_all()], ["1"])
+
+    def test_compaction_folds_journal_into_snapshot(self):
+        log = OrderLog(self.snapshot_path, compact_every=5)
+        for i in range(12):
+            log.save(make_order(str(i)))
+        self.assertLess(log.pending, 5)
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        self.assertEqual(len(snapshot) + len(self.read_journal(log)), 12)
+        self.assertEqual(len(OrderLog(self.snapshot_path).load_all()), 12)
+
+    def test_callers_get_copies(self):
+        log = OrderLog(self.snapshot_path)
+        order = make_order("1")
+        log.save(order)
+        order["breakdown"][0]["price"] = 1.0  # the caller's dict, edited after the save
+
+        fetched = log.get("1")
+        fetched["breakdown"][0]["price"] = 2.0  # an edit that is never saved
+        log.load_all()[0]["breakdown"].clear()
+
+        self.assertEqual(log.get("1")["breakdown"][0]["price"], 60.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
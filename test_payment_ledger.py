@@ -0,0 +1,128 @@
+#Checks for the append-only payment ledger and its offset index in Models/PaymentLedger.py
+#Run from the repository root: python -m unittest test_payment_ledger  (or python -m pytest)
+
+import atexit
+import json
+import os
+import tempfile
+import unittest
+
+from Models.PaymentLedger import INDEX_SAVE_MIN, PaymentLedger
+
+
+def payment(payment_id, transaction_id, payer_id, amount=60):
+    return {"payment_id": payment_id, "transaction_id": transaction_id, "payer_id": payer_id,
+            "total_amount": amount, "payment_status": "paid"}
+
+
+class PaymentLedgerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ledger_path = os.path.join(self.tmp.name, "PaymentDB.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self, **kwargs):
+        ledger = PaymentLedger(self.ledger_path, **kwargs)
+        # the temporary directory is gone by exit time
+        atexit.unregister(ledger.save_index)
+        return ledger
+
+    def ids(self, records):
+        return sorted(record["payment_id"] for record in records)
+
+    def test_empty_ledger(self):
+        ledger = self.open()  # no payment written yet, so there is no ledger file
+        self.assertEqual(ledger.load_all(), [])
+        self.assertEqual(ledger.find("transaction_id", "t1"), [])
+        self.assertIsNone(ledger.get("1"))
+
+    def test_lookups_by_transaction_and_payer(self):
+        ledger = self.open()
+        ledger.save_many([payment("1", "t1", "a"), payment("2", "t1", "b"), payment("3", "t2", "a")])
+        self.assertEqual(self.ids(ledger.find("transaction_id", "t1")), ["1", "2"])
+        self.assertEqual(self.ids(ledger.find("payer_id", "a")), ["1", "3"])
+        self.assertEqual(ledger.get("2")["payer_id"], "b")
+
+    def test_save_is_one_append(self):
+        ledger = self.open()
+        ledger.save(payment("1", "t1", "a"))
+        size = os.path.getsize(self.ledger_path)
+        ledger.save(payment("2", "t1", "a"))
+        with open(self.ledger_path, "rb") as f:
+            f.seek(size)
+            self.assertEqual(json.loads(f.read())["payment_id"], "2")
+
+    def test_resaved_payment_leaves_its_old_payer(self):
+        ledger = self.open()
+        ledger.save(payment("1", "t1", "a"))
+        ledger.save(payment("2", "t1", "a"))
+        ledger.save(payment("1", "t1", "b"))  # payer changed
+        self.assertEqual(self.ids(ledger.find("payer_id", "a")), ["2"])
+        self.assertEqual(self.ids(ledger.find("payer_id", "b")), ["1"])
+        self.assertEqual(self.ids(ledger.find("transaction_id", "t1")), ["1", "2"])
+        self.assertEqual(len(ledger.load_all()), 2)
+
+    def test_delete_appends_a_tombstone(self):
+        ledger = self.open()
+        ledger.save_many([payment("1", "t1", "a"), payment("2", "t1", "a")])
+        size = os.path.getsize(self.ledger_path)
+        ledger.delete_many(["1", "unknown"])
+        self.assertGreater(os.path.getsize(self.ledger_path), size)
+        self.assertIsNone(ledger.get("1"))
+        self.assertEqual(self.ids(ledger.find("transaction_id", "t1")), ["2"])
+        self.assertEqual(self.ids(self.open().load_all()), ["2"])
+
+    def test_index_survives_reopen_with_or_without_snapshot(self):
+        ledger = self.open()
+        for i in range(INDEX_SAVE_MIN * 3):
+            ledger.save(payment(str(i), f"t{i % 10}", f"p{i % 4}"))
+        ledger.save(payment("5", "t5", "new payer"))
+        ledger.delete("6")
+        expected = {field: {value: self.ids(ledger.find(field, value)) for value in values}
+                    for field, values in ledger.by_field.items()}
+
+        ledger.save_index()
+        from_snapshot = self.open()
+        os.remove(self.ledger_path + ".idx")
+        rebuilt = self.open()
+        for reopened in (from_snapshot, rebuilt):
+            self.assertEqual(reopened.by_key, ledger.by_key)
+            for field, values in expected.items():
+                for value, ids in values.items():
+                    self.assertEqual(self.ids(reopened.find(field, value)), ids)
+
+    def test_snapshot_is_not_rewritten_on_every_append(self):
+        ledger = self.open()
+        writes = []
+        save_index = ledger.save_index
+
+        def counting_save_index():
+            writes.append(len(ledger.by_key))
+            save_index()
+
+        ledger.save_index = counting_save_index
+        for i in range(1000):
+            ledger.save(payment(str(i), "t", "a"))
+        # snapshots at doubling sizes, not every INDEX_SAVE_MIN appends
+        self.assertLessEqual(len(writes), 6)
+
+    def test_appends_by_another_process_are_picked_up(self):
+        ledger = self.open()
+        ledger.save(payment("1", "t1", "a"))
+        with open(self.ledger_path, "ab") as f:
+            f.write((json.dumps(payment("2", "t1", "b")) + "\n").encode("utf-8"))
+        self.assertEqual(self.ids(ledger.find("transaction_id", "t1")), ["1", "2"])
+
+    def test_legacy_json_file_is_moved_into_the_ledger(self):
+        legacy_path = os.path.join(self.tmp.name, "PaymentDB.json")
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump([payment("1", "t1", "a"), payment("2", "t2", "a")], f)
+        ledger = self.open(legacy_path=legacy_path)
+        self.assertEqual(self.ids(ledger.find("payer_id", "a")), ["1", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#Checks for split payments and batch settlement in Models/Order_Payment_Model.py
+#Run from the repository root: python -m unittest test_payment_model  (or python -m pytest)
+
+import atexit
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import Models.Order_Payment_Model as payment_module
+import Models.Repository as repository_module
+from Models.Order_Payment_Model import OrderModel, PaymentModel
+
+
+class PaymentModelTest(unittest.TestCase):
+
+    def setUp(self):
+        # orders and payments go to a temporary directory, always through the JSON backend
+        self.tmp = tempfile.TemporaryDirectory()
+        patches = [mock.patch.object(payment_module, "ORDER_FILE", os.path.join(self.tmp.name, "OrderDB.json")),
+                   mock.patch.object(payment_module, "PAYMENT_FILE", os.path.join(self.tmp.name, "PaymentDB.json")),
+                   mock.patch.object(repository_module, "STORAGE_BACKEND", "json")]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.order = OrderModel(3)
+        self.order.add_item(101, 45.5, 2)
+        self.order.add_item(102, 60, 1)
+        self.order.add_item(103, 32, 1)
+        self.payments = PaymentModel(self.order)
+        # the temporary directory is gone by exit time
+        atexit.unregister(self.payments.repository.save_index)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def history(self):
+        return self.payments.get_payment_history()
+
+    def paid_flags(self):
+        return {str(item["product_id"]): item["is_paid"] for item in self.order.items}
+
+    def test_split_payment_pays_the_selected_lines(self):
+        payment = self.payments.split_payment(["101"], "a", False, "cash", 100)
+        self.assertEqual(payment["total_amount"], 91)
+        self.assertEqual(self.paid_flags(), {"101": True, "102": False, "103": False})
+        self.assertEqual(self.order.unpaid_total(), 92)
+        self.assertEqual([record["payment_id"] for record in self.history()], [payment["payment_id"]])
+        self.assertEqual(self.order.read_order()["transaction_id"], self.order.transaction_id)
+
+    def test_settle_several_payers_at_once(self):
+        payments = self.payments.settle_payments([
+            {"selected_ids": ["101"], "payer_id": "a", "payment_method": "cash", "amount_paid": 100},
+            {"selected_ids": [102, "103"], "payer_id": "b", "payment_method": "credit_card", "amount_paid": 92},
+        ])
+        self.assertEqual([payment["total_amount"] for payment in payments], [91, 92])
+        self.assertEqual(self.order.unpaid_total(), 0)
+        self.assertEqual(sorted(record["payer_id"] for record in self.history()), ["a", "b"])
+
+    def test_invalid_batch_changes_nothing(self):
+        bad_batches = [
+            # the same item for two payers
+            [{"selected_ids": ["101"], "payer_id": "a", "payment_method": "cash", "amount_paid": 100},
+             {"selected_ids": ["101"], "payer_id": "b", "payment_method": "cash", "amount_paid": 100}],
+            # the second payer does not pay enough
+            [{"selected_ids": ["101"], "payer_id": "a", "payment_method": "cash", "amount_paid": 100},
+             {"selected_ids": ["102"], "payer_id": "b", "payment_method": "cash", "amount_paid": 10}],
+            # nothing payable selected
+            [{"selected_ids": ["999"], "payer_id": "a", "payment_method": "cash", "amount_paid": 100}],
+        ]
+        for splits in bad_batches:
+            with self.assertRaises(ValueError):
+                self.payments.settle_payments(splits)
+            self.assertEqual(self.order.unpaid_total(), 183)
+            self.assertEqual(self.history(), [])
+
+    def test_ids_without_unpaid_lines_are_ignored(self):
+        self.payments.split_payment(["101"], "a", False, "cash", 100)
+        # 101 is paid already and 999 is not in the order; neither counts as claimed twice
+        payments = self.payments.settle_payments([
+            {"selected_ids": ["102", "101", "999"], "payer_id": "b", "payment_method": "cash", "amount_paid": 60},
+            {"selected_ids": ["103", "999"], "payer_id": "c", "payment_method": "cash", "amount_paid": 32},
+        ])
+        self.assertEqual([payment["total_amount"] for payment in payments], [60, 32])
+
+    def test_failed_order_write_rolls_everything_back(self):
+        with mock.patch.object(self.order, "write_order", side_effect=IOError("disk full")):
+            with self.assertRaises(IOError) as raised:
+                self.payments.settle_payments([
+                    {"selected_ids": ["101", "999"], "payer_id": "a", "payment_method": "cash", "amount_paid": 100},
+                    {"selected_ids": ["102"], "payer_id": "b", "payment_method": "cash", "amount_paid": 100},
+                ])
+        self.assertEqual(str(raised.exception), "disk full")  # the original error, not one from the rollback
+        self.assertEqual(self.paid_flags(), {"101": False, "102": False, "103": False})
+        self.assertEqual(self.order.unpaid_total(), 183)
+        self.assertEqual(self.history(), [])
+
+        # a later attempt goes through
+        self.assertEqual(self.payments.split_payment(["101"], "a", False, "cash", 100)["total_amount"], 91)
+
+    def test_failed_payment_write_changes_nothing(self):
+        with mock.patch.object(self.payments.repository, "save_many", side_effect=OSError("disk full")):
+            with self.assertRaises(IOError):
+                self.payments.split_payment(["101"], "a", False, "cash", 100)
+        self.assertEqual(self.order.unpaid_total(), 183)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#Checks for translation lookups, language switching and widget bindings in Controllers/TranslationController.py
+#Widgets are stand-ins with configure(), so no display is needed.
+#Run from the repository root: python -m unittest test_translation_controller  (or python -m pytest)
+
+import gc
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import Controllers.TranslationController as controller_module
+from Controllers.TranslationController import TranslationController
+from Models.TranslationCatalog import ASSETS_DIR
+
+
+class FakeWidget:
+    """Just enough of a Tk widget for bind(): configure() and winfo_exists()"""
+
+    def __init__(self):
+        self.options = {}
+        self.exists = True
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    def winfo_exists(self):
+        return self.exists
+
+
+class TranslationControllerTest(unittest.TestCase):
+
+    def setUp(self):
+        # a copy of the translation files, so compiled catalogs are written there and not into Assets
+        self.tmp = tempfile.TemporaryDirectory()
+        for path in glob.glob(os.path.join(ASSETS_DIR, "*Translation.json")):
+            shutil.copy(path, self.tmp.name)
+        # the language preference in the home directory is neither read nor written
+        patches = [mock.patch.object(TranslationController, "load_language_preference", return_value=None),
+                   mock.patch.object(TranslationController, "_save_language_preference_async")]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.translations = TranslationController(assets_dir=self.tmp.name, preload=False)
+        self.english_welcome = self.translations.get_text("general.welcome")
+        self.swedish_welcome = self.translations._get_catalog("sv").texts["general.welcome"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_text(self):
+        self.assertEqual(self.translations.get_current_language(), "en")
+        self.assertEqual(self.translations.get_text("general.welcome"), self.english_welcome)
+        with mock.patch("builtins.print"):
+            self.assertEqual(self.translations.get_text("no.such.key"), "no.such.key")
+            self.assertEqual(self.translations.get_text("no.such.key", default="Hi {name}", name="Ann"), "Hi Ann")
+        self.assertEqual(self.translations.get_text("dialogs.language_changed", lang_name="Svenska"),
+                         "Language changed to Svenska")
+
+    def test_switching_back_reads_no_file(self):
+        self.translations.preload_languages()
+        with mock.patch.object(controller_module.LanguageCatalog, "load", side_effect=AssertionError("file read")):
+            self.assertTrue(self.translations.set_language("sv"))
+            self.assertTrue(self.translations.set_language("en"))
+        self.assertEqual(self.translations.get_text("general.welcome"), self.english_welcome)
+
+    def test_bind_sets_now_and_on_every_switch(self):
+        widget = FakeWidget()
+        titles = []
+        self.assertEqual(self.translations.bind(widget, "general.welcome"), self.english_welcome)
+        self.translations.bind(widget, "general.welcome", option="title", setter=titles.append, transform=str.upper)
+        self.assertEqual(widget.options["text"], self.english_welcome)
+
+        self.translations.set_language("sv")
+        self.assertEqual(widget.options["text"], self.swedish_welcome)
+        self.assertEqual(titles, [self.english_welcome.upper(), self.swedish_welcome.upper()])
+
+    def test_bind_with_format_arguments(self):
+        widget = FakeWidget()
+        self.translations.bind(widget, "dialogs.language_changed", lang_name="Svenska")
+        self.translations.set_language("sv")
+        self.assertEqual(widget.options["text"], "Språket har ändrats till Svenska")
+
+    def test_binding_again_replaces_and_unbind_stops_updates(self):
+        widget = FakeWidget()
+        self.translations.bind(widget, "general.welcome")
+        self.translations.bind(widget, "general.language")
+        self.translations.set_language("sv")
+        self.assertEqual(widget.options["text"], self.translations.get_text("general.language"))
+
+        self.translations.unbind(widget)
+        self.translations.set_language("en")
+        self.assertEqual(widget.options["text"], self.translations._get_catalog("sv").texts["general.language"])
+
+    def test_destroyed_and_collected_widgets_are_dropped(self):
+        destroyed, collected = FakeWidget(), FakeWidget()
+        self.translations.bind(destroyed, "general.welcome")
+        self.translations.bind(collected, "general.welcome")
+        destroyed.exists = False
+        del collected
+        gc.collect()
+
+        self.translations.set_language("sv")
+        self.assertEqual(len(self.translations._bindings), 0)
+        self.assertEqual(destroyed.options["text"], self.english_welcome)  # not touched after it was destroyed
+
+
+if __name__ == "__main__":
+    unittest.main()